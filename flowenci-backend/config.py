@@ -12,16 +12,86 @@ class Settings(BaseSettings):
     # Supabase SDK Config
     supabase_url: str = "https://your-project-ref.supabase.co"
     supabase_key: str = "your-anon-or-service-role-key"
+    # Async data access (repositories/) — pooled PostgREST connections
+    db_max_connections: int = 50
+    db_max_keepalive_connections: int = 20
+    db_connect_timeout: float = 5.0
+    db_timeout: float = 10.0                # default per-call timeout; repositories may pass their own
+    db_log_queries: bool = False            # print rows and bytes of every read
+    db_audit_projections: bool = False      # track column reads (scripts/audit_projections.py); slows reads
 
     # JWT
     secret_key: str = "change-me-in-production-use-long-random-string"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 24 * 7  # 7 days
+    principal_cache_ttl: float = 60.0           # seconds a looked-up user is trusted without the DB
+    principal_cache_max_items: int = 10000
 
     # OpenAI
     openai_api_key: str = "sk-placeholder"
     openai_model: str = "gpt-4o-mini"
     openai_whisper_model: str = "whisper-1"
+    openai_base_url: str = ""  # empty = api.openai.com; point at a local fake server in tests
+    openai_max_connections: int = 20
+    openai_max_keepalive_connections: int = 10
+    openai_keepalive_expiry: float = 60.0
+    openai_connect_timeout: float = 5.0
+    openai_timeout_transcription: float = 120.0
+    openai_timeout_analysis: float = 30.0
+    openai_timeout_interviewer: float = 20.0
+    openai_timeout_session_feedback: float = 60.0
+
+    # Analysis
+    star_local_confidence_threshold: float = 0.8  # below this the GPT STAR call runs
+    analysis_budget_seconds: float = 45.0       # whole run; LLM stages fall back when it runs out
+    analysis_star_deadline: float = 8.0
+    analysis_coaching_deadline: float = 10.0
+    analysis_upgrade_delay: float = 60.0        # wait before retrying degraded stages in the background
+
+    # Background jobs (SQLite queue shared by the API and worker processes)
+    job_queue_path: str = "data/jobs.sqlite3"
+    job_visibility_timeout: float = 120.0
+    job_max_attempts: int = 3
+    job_retry_backoff: float = 10.0
+    worker_concurrency: int = 2
+
+    # Caches
+    transcription_cache_path: str = "data/transcription_cache.sqlite3"
+    transcription_cache_max_mb: int = 64
+    coaching_cache_path: str = "data/coaching_cache.sqlite3"
+    coaching_cache_max_items: int = 512
+    coaching_cache_max_mb: int = 16
+    coaching_cache_ttl_hours: float = 24 * 7
+    tts_cache_path: str = "data/tts_cache.sqlite3"
+    tts_cache_memory_mb: int = 32
+    tts_cache_max_mb: int = 256
+
+    # Text-to-speech
+    tts_backend: str = "gtts"           # gtts | espeak
+    tts_voice: str = ""                 # backend default when empty ("en" for gtts, "en-us" for espeak)
+    tts_workers: int = 4
+    tts_max_queue: int = 16             # waiting syntheses beyond this are shed (text is sent without audio)
+    espeak_binary: str = "espeak-ng"
+    espeak_speed: int = 165             # words per minute
+
+    # Roleplay sessions
+    session_store: str = "memory"       # memory (single worker) | sqlite (shared by workers on one host)
+    session_store_path: str = "data/sessions.sqlite3"
+    session_ttl_seconds: float = 30 * 60    # idle time before a session expires
+    session_sweep_interval: float = 60.0
+    context_max_tokens: int = 1200          # history tokens sent per interviewer turn (system prompt excluded)
+    context_recent_messages: int = 6        # not summarized yet, sent verbatim while they fit (3 exchanges)
+    context_summary_max_words: int = 150
+    turn_log_batch_size: int = 50           # interview_turns rows per write
+    turn_log_flush_interval: float = 0.5    # seconds a partial batch waits for more turns
+
+    # Roleplay WebSocket
+    ws_send_queue_size: int = 32        # frames buffered per connection before send() waits
+    ws_send_timeout: float = 10.0       # a client that can't drain the queue this long is dropped
+
+    # Question catalog (services/question_catalog.py)
+    question_catalog_poll_interval: float = 60.0    # seconds between checks for question bank changes
+    admin_token: str = ""               # X-Admin-Token for admin endpoints; empty disables them
 
     # App
     frontend_url: str = "http://localhost:5173"
@@ -1,6 +1,8 @@
 """
 Supabase Client setup.
-Uses the official supabase-py SDK.
+Uses the official supabase-py SDK. This client is blocking: it serves the
+job worker threads and scripts. Request handlers use the async repositories
+(see repositories/) instead.
 """
 from supabase import create_client, Client
 from config import get_settings
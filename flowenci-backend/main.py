@@ -1,8 +1,27 @@
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
 from config import get_settings
+from repositories.rest import DataAccessError, DataTimeoutError, get_rest_client, close_rest_client
+from services.openai_clients import get_openai_clients, close_openai_clients
+from services.jobs.queue import get_job_queue
+from services.transcription import get_transcription_cache
+from services.coaching.tip_cache import get_tip_cache
+from services.interviewer.prompts import WRAP_UP_MESSAGE
+from services.interviewer.tts_service import prewarm_tts, tts_cache_stats
+from services.interviewer.tts_backends import get_tts_backend, get_tts_executor
+from services.interviewer.ws_protocol import protocol_stats
+from services.interviewer.session_manager import get_session_store, run_session_sweeper
+from services.interviewer.context_manager import context_stats
+from services.interviewer.prompt_assembly import prompt_cache_stats
+from services.interviewer.opening import opening_stats
+from services.interviewer.turn_log import get_turn_writer
+from services.question_catalog import catalog_stats, run_catalog_refresher
+from utils.jwt import get_principal_cache
 
 # Import routers
 from routes.auth import router as auth_router
@@ -18,7 +37,22 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Starting Flowenci API with Supabase REST Client")
+    get_openai_clients()  # keeps a registry installed by tests via init_openai_clients()
+    # Only phrases spoken verbatim can hit the cache; the opening is GPT-written.
+    # Synthesized in the background, so startup doesn't wait on gTTS.
+    prewarm = asyncio.create_task(prewarm_tts([WRAP_UP_MESSAGE]))
+    sweeper = asyncio.create_task(run_session_sweeper(settings.session_sweep_interval))
+    # Loads the question catalog, then keeps it in step with the questions table
+    catalog_refresher = asyncio.create_task(run_catalog_refresher(settings.question_catalog_poll_interval))
     yield
+    catalog_refresher.cancel()
+    sweeper.cancel()
+    prewarm.cancel()
+    get_tts_executor().shutdown()
+    # Write out turns still queued before the process exits
+    await asyncio.to_thread(get_turn_writer().stop)
+    await close_openai_clients()
+    await close_rest_client()
     print("Shutting down Flowenci API")
 
 
@@ -47,6 +81,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(DataAccessError)
+async def data_access_error(request: Request, exc: DataAccessError):
+    print(f"[DB] {request.method} {request.url.path}: {exc}")
+    if isinstance(exc, DataTimeoutError):
+        return JSONResponse(status_code=503, content={"detail": "Database timed out, please retry."})
+    return JSONResponse(status_code=500, content={"detail": "Database error."})
+
+
 # ─── Routers ─────────────────────────────────────────────────────────────────
 app.include_router(auth_router)
 app.include_router(questions_router)
@@ -69,3 +111,26 @@ def root():
 @app.get("/health", tags=["Health"])
 def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", tags=["Health"])
+def metrics():
+    return {
+        "openai_pool": get_openai_clients().metrics(),
+        "db": get_rest_client().metrics(),
+        "auth_principals": get_principal_cache().stats(),
+        "job_queue": get_job_queue().metrics(),
+        "transcription_cache": get_transcription_cache().stats(),
+        # Coaching runs in the worker; the disk tier counts its lookups across processes
+        # (worker memory-tier hits never reach it)
+        "coaching_cache": get_tip_cache().disk.stats(),
+        "tts_cache": tts_cache_stats(),
+        "tts_executor": {"backend": get_tts_backend().name, **get_tts_executor().metrics()},
+        "roleplay_ws": protocol_stats(),
+        "roleplay_sessions": get_session_store().stats(),
+        "interviewer_context": context_stats(),
+        "interviewer_prompts": prompt_cache_stats.snapshot(),
+        "roleplay_opening": opening_stats(),
+        "roleplay_turn_log": get_turn_writer().metrics(),
+        "question_catalog": catalog_stats(),
+    }
@@ -0,0 +1,18 @@
+"""
+Base class for table repositories.
+"""
+from typing import Optional
+
+from repositories.rest import RestClient, get_rest_client
+
+
+class Repository:
+    table: str
+    timeout: Optional[float] = None     # per-call timeout for this table; None = db_timeout
+
+    def __init__(self, client: Optional[RestClient] = None):
+        self._client = client
+
+    @property
+    def db(self) -> RestClient:
+        return self._client or get_rest_client()
@@ -0,0 +1,74 @@
+"""
+interview_sessions and interview_turns tables.
+"""
+from typing import Dict, List, Optional
+
+from repositories.base import Repository
+from repositories.projection import Projection
+from repositories.rest import eq, or_
+
+TURNS = Projection("interview_turns.conversation", "interview_turns", ["role", "content"])
+
+
+class InterviewSessionsRepository(Repository):
+    table = "interview_sessions"
+
+    async def create(self, row: dict) -> Optional[dict]:
+        rows = await self.db.insert(self.table, row, timeout=self.timeout)
+        return rows[0] if rows else None
+
+    async def get(
+        self, db_session_id: str, projection: Projection, user_id: Optional[str] = None
+    ) -> Optional[dict]:
+        filters = [eq("id", db_session_id)]
+        if user_id is not None:
+            filters.append(eq("user_id", user_id))
+        res = await self.db.select(projection, filters, timeout=self.timeout)
+        return res.data[0] if res.data else None
+
+    async def list_recent(self, user_id: str, projection: Projection, limit: int = 20) -> List[dict]:
+        res = await self.db.select(
+            projection, [eq("user_id", user_id)],
+            order="started_at", desc=True, limit=limit, timeout=self.timeout,
+        )
+        return res.data
+
+    async def update(
+        self, db_session_id: str, values: dict, evaluation_status: Optional[str] = None
+    ) -> Optional[dict]:
+        """Update a session; with evaluation_status, only while it has that status."""
+        filters = [eq("id", db_session_id)]
+        if evaluation_status is not None:
+            filters.append(eq("evaluation_status", evaluation_status))
+        rows = await self.db.update(self.table, values, filters, timeout=self.timeout)
+        return rows[0] if rows else None
+
+    async def claim_evaluation(self, db_session_id: str, user_id: str) -> bool:
+        """
+        Move the session to "evaluating" in one conditional update. False if
+        it already is evaluating or done, so only one caller gets the claim.
+        """
+        rows = await self.db.update(
+            self.table,
+            {"evaluation_status": "evaluating"},
+            [
+                eq("id", db_session_id),
+                eq("user_id", user_id),
+                or_("evaluation_status.is.null", "evaluation_status.eq.failed"),
+            ],
+            timeout=self.timeout,
+        )
+        return bool(rows)
+
+
+class InterviewTurnsRepository(Repository):
+    table = "interview_turns"
+
+    async def list_for_session(self, db_session_id: str) -> List[Dict[str, str]]:
+        """The session's messages in order, as chat messages."""
+        res = await self.db.select(TURNS, [eq("session_id", db_session_id)], order="seq", timeout=self.timeout)
+        return res.data
+
+
+interview_sessions_repo = InterviewSessionsRepository()
+interview_turns_repo = InterviewTurnsRepository()
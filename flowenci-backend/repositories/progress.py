@@ -0,0 +1,19 @@
+"""
+user_progress table (written by services/progress.py in the worker).
+"""
+from typing import Optional
+
+from repositories.base import Repository
+from repositories.projection import Projection
+from repositories.rest import eq
+
+
+class UserProgressRepository(Repository):
+    table = "user_progress"
+
+    async def get(self, user_id: str, projection: Projection) -> Optional[dict]:
+        res = await self.db.select(projection, [eq("user_id", user_id)], timeout=self.timeout)
+        return res.data[0] if res.data else None
+
+
+user_progress_repo = UserProgressRepository()
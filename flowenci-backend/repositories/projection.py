@@ -0,0 +1,106 @@
+"""
+Declared column projections.
+Every read names the columns it needs through a Projection (never "*"),
+declared next to the endpoint or task that reads them. RestClient records
+rows and response bytes per projection for /metrics.
+
+With db_audit_projections on, fetched rows are returned as TrackedRow and
+every column read is recorded, so audit_report() can list columns a
+projection fetches but nothing reads (scripts/audit_projections.py).
+Columns that feed a response model count as read: pydantic reads the dict
+directly, bypassing the tracking.
+"""
+import threading
+from typing import Dict, Iterable, Optional, Sequence, Set, Type
+
+from pydantic import BaseModel
+
+
+class Projection:
+    def __init__(
+        self,
+        name: str,
+        table: str,
+        columns: Sequence[str] = (),
+        model: Optional[Type[BaseModel]] = None,
+    ):
+        """Columns are the explicit ones plus every field of model (the response model the rows feed)."""
+        self.name = name
+        self.table = table
+        self.model_fields = tuple(model.model_fields) if model is not None else ()
+        self.columns = tuple(dict.fromkeys((*columns, *self.model_fields)))
+        if not self.columns or "*" in self.columns:
+            raise ValueError(f"Projection {name} must list its columns")
+
+    @property
+    def select(self) -> str:
+        return ",".join(self.columns)
+
+    def __repr__(self):
+        return f"Projection({self.name}: {self.table}({self.select}))"
+
+
+class _Audit:
+    def __init__(self):
+        self.projections: Dict[str, Projection] = {}
+        self.reads: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def track(self, projection: Projection, rows: Iterable[dict]) -> list:
+        with self._lock:
+            self.projections[projection.name] = projection
+            self.reads.setdefault(projection.name, set()).update(projection.model_fields)
+        return [TrackedRow(row, projection.name) for row in rows]
+
+    def read(self, name: str, column: str):
+        with self._lock:
+            self.reads.setdefault(name, set()).add(column)
+
+    def report(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                name: {
+                    "table": p.table,
+                    "columns": list(p.columns),
+                    "unused": [c for c in p.columns if c not in self.reads.get(name, set())],
+                }
+                for name, p in sorted(self.projections.items())
+            }
+
+
+audit = _Audit()
+
+
+class TrackedRow(dict):
+    """A fetched row that records which columns are read."""
+
+    def __init__(self, row: dict, projection_name: str):
+        super().__init__(row)
+        self._projection_name = projection_name
+
+    def __getitem__(self, key):
+        audit.read(self._projection_name, key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        audit.read(self._projection_name, key)
+        return super().get(key, default)
+
+    # Overriding iteration also moves dict(row) and {**row} off the C fast
+    # path, so copies go through keys() + __getitem__ and count as reads.
+    def __iter__(self):
+        return iter(super().keys())
+
+    def items(self):
+        return [(k, self[k]) for k in super().keys()]
+
+    def values(self):
+        return [self[k] for k in super().keys()]
+
+    def copy(self):
+        return dict(self.items())
+
+
+def audit_report() -> Dict[str, dict]:
+    """Per projection: its table, columns, and the columns never read (audit mode only)."""
+    return audit.report()
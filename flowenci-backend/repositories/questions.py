@@ -0,0 +1,58 @@
+"""
+questions table.
+"""
+from typing import List, Optional, Tuple
+
+from repositories.base import Repository
+from repositories.projection import Projection
+from repositories.rest import Result, eq, ilike
+
+CHANGE_MARKER = Projection("questions.catalog_version", "questions", ["updated_at"])
+
+
+class QuestionsRepository(Repository):
+    table = "questions"
+
+    async def list_active(
+        self,
+        projection: Projection,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        use_star: Optional[bool] = None,
+        search: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Result:
+        """One page of active questions, with the total match count."""
+        filters = [eq("is_active", True)]
+        if category:
+            filters.append(eq("category", category))
+        if difficulty:
+            filters.append(eq("difficulty", difficulty))
+        if use_star is not None:
+            filters.append(eq("use_star", use_star))
+        if search:
+            filters.append(ilike("text", f"*{search}*"))
+        return await self.db.select(
+            projection, filters, limit=limit, offset=offset, count=True, timeout=self.timeout
+        )
+
+    async def list_all(self, projection: Projection, page_size: int = 1000) -> List[dict]:
+        """Every question, active or not, paged by id (PostgREST caps rows per response)."""
+        rows, offset = [], 0
+        while True:
+            res = await self.db.select(projection, order="id", limit=page_size, offset=offset, timeout=self.timeout)
+            rows.extend(res.data)
+            if len(res.data) < page_size:
+                return rows
+            offset += page_size
+
+    async def version(self) -> Tuple[int, Optional[str]]:
+        """(row count, latest updated_at): changes whenever a question is added, edited or deleted."""
+        res = await self.db.select(
+            CHANGE_MARKER, order="updated_at", desc=True, limit=1, count=True, timeout=self.timeout
+        )
+        return res.count or 0, res.data[0]["updated_at"] if res.data else None
+
+
+questions_repo = QuestionsRepository()
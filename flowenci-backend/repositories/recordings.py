@@ -0,0 +1,50 @@
+"""
+recordings and feedbacks tables.
+"""
+from typing import List, Optional, Sequence
+
+from repositories.base import Repository
+from repositories.projection import Projection
+from repositories.rest import eq, in_
+
+
+class RecordingsRepository(Repository):
+    table = "recordings"
+
+    async def create(self, row: dict) -> Optional[dict]:
+        rows = await self.db.insert(self.table, row, timeout=self.timeout)
+        return rows[0] if rows else None
+
+    async def get_for_user(self, recording_id: str, user_id: str, projection: Projection) -> Optional[dict]:
+        res = await self.db.select(
+            projection, [eq("id", recording_id), eq("user_id", user_id)], timeout=self.timeout
+        )
+        return res.data[0] if res.data else None
+
+    async def list_analyzed(
+        self, user_id: str, projection: Projection, question_id: Optional[str] = None
+    ) -> List[dict]:
+        """A user's recordings with finished analysis, oldest first."""
+        filters = [eq("user_id", user_id), eq("analysis_status", "done")]
+        if question_id:
+            filters.append(eq("question_id", question_id))
+        res = await self.db.select(projection, filters, order="created_at", timeout=self.timeout)
+        return res.data
+
+
+class FeedbacksRepository(Repository):
+    table = "feedbacks"
+
+    async def get_for_recording(self, recording_id: str, projection: Projection) -> Optional[dict]:
+        res = await self.db.select(projection, [eq("recording_id", recording_id)], timeout=self.timeout)
+        return res.data[0] if res.data else None
+
+    async def for_recordings(self, recording_ids: Sequence[str], projection: Projection) -> List[dict]:
+        if not recording_ids:
+            return []
+        res = await self.db.select(projection, [in_("recording_id", recording_ids)], timeout=self.timeout)
+        return res.data
+
+
+recordings_repo = RecordingsRepository()
+feedbacks_repo = FeedbacksRepository()
@@ -0,0 +1,295 @@
+"""
+Async PostgREST client for the Supabase database.
+One pooled httpx.AsyncClient per process, used by the repositories instead of
+the blocking supabase-py client, so handlers await the database rather than
+holding the event loop or a threadpool slot. Every call has a timeout
+(db_timeout unless the caller passes its own). Reads take a declared
+Projection (see projection.py); rows and response bytes are counted per
+projection.
+
+The client is bound to the event loop that first uses it. Code running in
+plain threads (job workers) goes through run_sync(), which owns one loop
+per process.
+"""
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import httpx
+
+from config import get_settings
+from repositories.projection import Projection, audit
+
+settings = get_settings()
+
+Filter = Tuple[str, str]    # (column, "op.value") in PostgREST syntax
+
+
+class DataAccessError(Exception):
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class DataTimeoutError(DataAccessError):
+    pass
+
+
+def _literal(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def eq(column: str, value: Any) -> Filter:
+    return column, f"eq.{_literal(value)}"
+
+
+def in_(column: str, values: Iterable[Any]) -> Filter:
+    quoted = ",".join(f'"{_literal(v)}"' for v in values)
+    return column, f"in.({quoted})"
+
+
+def is_(column: str, value: Any) -> Filter:
+    return column, f"is.{_literal(value)}"
+
+
+def ilike(column: str, pattern: str) -> Filter:
+    return column, f"ilike.{pattern}"
+
+
+def or_(*conditions: str) -> Filter:
+    """Conditions in PostgREST syntax, e.g. or_("status.is.null", "status.eq.failed")."""
+    return "or", f"({','.join(conditions)})"
+
+
+@dataclass
+class Result:
+    data: List[dict]
+    count: Optional[int] = None
+
+
+class _TableStats:
+    __slots__ = ("calls", "errors", "timeouts", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.seconds = 0.0
+
+
+class _QueryStats:
+    __slots__ = ("calls", "rows", "bytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.bytes = 0
+
+
+class RestClient:
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        key: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        key = key or settings.supabase_key
+        limits = httpx.Limits(
+            max_connections=settings.db_max_connections,
+            max_keepalive_connections=settings.db_max_keepalive_connections,
+        )
+        self.http = httpx.AsyncClient(
+            base_url=f"{(url or settings.supabase_url).rstrip('/')}/rest/v1",
+            headers={"apikey": key, "Authorization": f"Bearer {key}"},
+            timeout=httpx.Timeout(settings.db_timeout, connect=settings.db_connect_timeout),
+            transport=transport or httpx.AsyncHTTPTransport(limits=limits),
+        )
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._tables = {}
+        self._queries = {}
+        self._lock = threading.Lock()
+
+    async def _request(
+        self,
+        method: str,
+        table: str,
+        params: Sequence[Filter] = (),
+        json: Any = None,
+        prefer: Sequence[str] = (),
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        headers = {"Prefer": ",".join(prefer)} if prefer else {}
+        request_timeout = (
+            httpx.Timeout(timeout, connect=min(timeout, settings.db_connect_timeout))
+            if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        )
+        with self._lock:
+            stats = self._tables.setdefault(table, _TableStats())
+            stats.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        started = time.perf_counter()
+        try:
+            response = await self.http.request(
+                method, f"/{table}", params=list(params), json=json, headers=headers, timeout=request_timeout
+            )
+        except httpx.TimeoutException as e:
+            with self._lock:
+                stats.timeouts += 1
+            raise DataTimeoutError(f"{method} {table} timed out") from e
+        except httpx.HTTPError as e:
+            with self._lock:
+                stats.errors += 1
+            raise DataAccessError(f"{method} {table} failed: {e}") from e
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                stats.seconds += time.perf_counter() - started
+        if response.status_code >= 400:
+            with self._lock:
+                stats.errors += 1
+            raise DataAccessError(f"{method} {table}: {response.text[:500]}", status=response.status_code)
+        return response
+
+    async def select(
+        self,
+        projection: Projection,
+        filters: Sequence[Filter] = (),
+        order: Optional[str] = None,
+        desc: bool = False,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        count: bool = False,
+        timeout: Optional[float] = None,
+    ) -> Result:
+        table = projection.table
+        params = [("select", projection.select), *filters]
+        if order:
+            params.append(("order", f"{order}.{'desc' if desc else 'asc'}"))
+        if limit is not None:
+            params.append(("limit", str(limit)))
+        if offset:
+            params.append(("offset", str(offset)))
+        response = await self._request(
+            "GET", table, params, prefer=["count=exact"] if count else [], timeout=timeout
+        )
+        total = None
+        if count:
+            # Content-Range: 0-49/123 (or */0 when nothing matched)
+            total_part = response.headers.get("content-range", "").rpartition("/")[2]
+            total = int(total_part) if total_part.isdigit() else None
+        rows = response.json()
+        self._record_query(projection, len(rows), len(response.content))
+        if settings.db_audit_projections:
+            rows = audit.track(projection, rows)
+        return Result(rows, total)
+
+    def _record_query(self, projection: Projection, rows: int, size: int):
+        with self._lock:
+            stats = self._queries.setdefault(projection.name, _QueryStats())
+            stats.calls += 1
+            stats.rows += rows
+            stats.bytes += size
+        if settings.db_log_queries:
+            print(f"[DB] {projection.name}: {rows} row(s), {size} bytes")
+
+    async def insert(self, table: str, rows, timeout: Optional[float] = None) -> List[dict]:
+        response = await self._request("POST", table, json=rows, prefer=["return=representation"], timeout=timeout)
+        return response.json()
+
+    async def upsert(self, table: str, rows, on_conflict: str, timeout: Optional[float] = None) -> List[dict]:
+        response = await self._request(
+            "POST", table, [("on_conflict", on_conflict)], json=rows,
+            prefer=["return=representation", "resolution=merge-duplicates"], timeout=timeout,
+        )
+        return response.json()
+
+    async def update(
+        self, table: str, values: dict, filters: Sequence[Filter], timeout: Optional[float] = None
+    ) -> List[dict]:
+        if not filters:
+            raise ValueError("update() without filters would touch every row")
+        response = await self._request(
+            "PATCH", table, filters, json=values, prefer=["return=representation"], timeout=timeout
+        )
+        return response.json()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            tables = {
+                name: {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "timeouts": s.timeouts,
+                    "avg_ms": round(s.seconds / s.calls * 1000, 1) if s.calls else 0.0,
+                }
+                for name, s in self._tables.items()
+            }
+            queries = {
+                name: {
+                    "calls": q.calls,
+                    "rows": q.rows,
+                    "bytes": q.bytes,
+                    "avg_bytes": round(q.bytes / q.calls) if q.calls else 0,
+                }
+                for name, q in self._queries.items()
+            }
+            return {
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "tables": tables,
+                "queries": queries,
+            }
+
+    async def aclose(self):
+        await self.http.aclose()
+
+
+_client: Optional[RestClient] = None
+_client_lock = threading.Lock()
+
+
+def init_rest_client(client: Optional[RestClient] = None) -> RestClient:
+    """Install the process-wide client (a custom one in tests)."""
+    global _client
+    _client = client or RestClient()
+    return _client
+
+
+def get_rest_client() -> RestClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = RestClient()
+    return _client
+
+
+async def close_rest_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def run_sync(coro):
+    """Run a repository coroutine from a plain thread (job workers, scripts) and return its result."""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="db-loop", daemon=True).start()
+                _loop = loop
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
@@ -0,0 +1,32 @@
+"""
+users table.
+"""
+from typing import Optional
+
+from repositories.base import Repository
+from repositories.projection import Projection
+from repositories.rest import eq
+
+
+class UsersRepository(Repository):
+    table = "users"
+    timeout = 5.0   # on the path of every authenticated request; fail fast
+
+    async def get(self, user_id: str, projection: Projection) -> Optional[dict]:
+        res = await self.db.select(projection, [eq("id", user_id)], timeout=self.timeout)
+        return res.data[0] if res.data else None
+
+    async def get_by_email(self, email: str, projection: Projection) -> Optional[dict]:
+        res = await self.db.select(projection, [eq("email", email)], timeout=self.timeout)
+        return res.data[0] if res.data else None
+
+    async def create(self, row: dict) -> Optional[dict]:
+        rows = await self.db.insert(self.table, row, timeout=self.timeout)
+        return rows[0] if rows else None
+
+    async def update(self, user_id: str, values: dict) -> Optional[dict]:
+        rows = await self.db.update(self.table, values, [eq("id", user_id)], timeout=self.timeout)
+        return rows[0] if rows else None
+
+
+users_repo = UsersRepository()
@@ -1,27 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
 import uuid
 from datetime import datetime, timezone
-from supabase import Client
-from database import get_db
+from repositories.projection import Projection
+from repositories.users import users_repo
 from schemas.auth import SignupRequest, LoginRequest, TokenResponse, UserResponse, UpdateProfileRequest
 from utils.password import hash_password, verify_password
-from utils.jwt import create_access_token, get_current_user
+from utils.jwt import create_access_token, get_current_user, invalidate_principal
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
+EMAIL_TAKEN = Projection("auth.signup", "users", ["id"])
+LOGIN = Projection("auth.login", "users", ["hashed_password", "is_active"], model=UserResponse)
+
 
 @router.post("/signup", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-def signup(payload: SignupRequest, db: Client = Depends(get_db)):
+async def signup(payload: SignupRequest):
     # Check if email exists
-    existing = db.table("users").select("id").eq("email", payload.email).execute()
-    if existing.data:
+    existing = await users_repo.get_by_email(payload.email, EMAIL_TAKEN)
+    if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     user_dict = {
         "id": str(uuid.uuid4()),
         "name": payload.name,
         "email": payload.email,
-        "hashed_password": hash_password(payload.password),
+        # bcrypt is deliberately slow; keep it off the event loop
+        "hashed_password": await asyncio.to_thread(hash_password, payload.password),
         "target_companies": payload.target_companies,
         "interview_timeline": payload.interview_timeline,
         "experience_level": payload.experience_level or "student",
@@ -32,23 +37,21 @@ def signup(payload: SignupRequest, db: Client = Depends(get_db)):
     }
     
     # Insert new user
-    res = db.table("users").insert(user_dict).execute()
-    if not res.data:
+    user = await users_repo.create(user_dict)
+    if not user:
         raise HTTPException(status_code=500, detail="Failed to create user")
-        
-    user = res.data[0]
+
     token = create_access_token({"sub": str(user["id"])})
     return TokenResponse(access_token=token, user=UserResponse(**user))
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, db: Client = Depends(get_db)):
-    res = db.table("users").select("*").eq("email", payload.email).execute()
-    if not res.data:
+async def login(payload: LoginRequest):
+    user = await users_repo.get_by_email(payload.email, LOGIN)
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
-        
-    user = res.data[0]
-    if not verify_password(payload.password, user.get("hashed_password", "")):
+
+    if not await asyncio.to_thread(verify_password, payload.password, user.get("hashed_password", "")):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     if not user.get("is_active", True):
         raise HTTPException(status_code=403, detail="Account disabled")
@@ -58,26 +61,26 @@ def login(payload: LoginRequest, db: Client = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: dict = Depends(get_current_user)):
+async def get_me(current_user: dict = Depends(get_current_user)):
     return UserResponse(**current_user)
 
 
 @router.patch("/me", response_model=UserResponse)
-def update_profile(
+async def update_profile(
     payload: UpdateProfileRequest,
     current_user: dict = Depends(get_current_user),
-    db: Client = Depends(get_db),
 ):
     update_data = payload.model_dump(exclude_unset=True)
     if update_data:
         update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-        res = db.table("users").update(update_data).eq("id", current_user["id"]).execute()
-        if res.data:
-            current_user.update(res.data[0])
+        updated = await users_repo.update(current_user["id"], update_data)
+        invalidate_principal(current_user["id"])
+        if updated:
+            current_user.update(updated)
             
     return UserResponse(**current_user)
 
 
 @router.post("/logout")
-def logout():
+async def logout():
     return {"message": "Logged out successfully"}
@@ -1,23 +1,31 @@
 """
 Dashboard routes — progress stats and trends.
 """
+from datetime import datetime, timezone
+
 from fastapi import APIRouter, Depends
-from supabase import Client
-from database import get_db
+from repositories.progress import user_progress_repo
+from repositories.projection import Projection
+from services.progress import current_streak, week_key
 from utils.jwt import get_current_user
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+STATS = Projection("dashboard.stats", "user_progress", [
+    "total_recordings", "total_duration_seconds", "question_ids", "feedback_count", "readiness_sum",
+    "wpm_sum", "filler_sum", "first_readiness", "recent", "weekly", "current_streak", "longest_streak",
+    "last_practice_date", "latest_recording_id", "latest_feedback",
+])
+
 
 @router.get("/stats")
-def get_stats(
+async def get_stats(
     current_user: dict = Depends(get_current_user),
-    db: Client = Depends(get_db),
 ):
-    res_rec = db.table("recordings").select("*").eq("user_id", current_user["id"]).eq("analysis_status", "done").order("created_at").execute()
-    recordings = res_rec.data
+    # One row, maintained by the analysis worker (services/progress.py)
+    progress = await user_progress_repo.get(current_user["id"], STATS)
 
-    if not recordings:
+    if not progress or not progress["total_recordings"]:
         return {
             "total_recordings": 0,
             "questions_practiced": 0,
@@ -29,32 +37,21 @@ def get_stats(
             "next_focus": "Start practicing to track your progress",
         }
 
-    total_duration = sum(r.get("duration_seconds", 0) for r in recordings)
-    unique_questions = len(set(r.get("question_id") for r in recordings if r.get("question_id")))
-
-    # Fetch feedback for all recordings in one go
-    rec_ids = [r["id"] for r in recordings]
-    res_fb = db.table("feedbacks").select("*").in_("recording_id", rec_ids).execute()
-    feedbacks_map = {fb["recording_id"]: fb for fb in res_fb.data}
-    
-    feedbacks = [feedbacks_map.get(r["id"]) for r in recordings if feedbacks_map.get(r["id"])]
+    total_recordings = progress["total_recordings"]
+    feedback_count = progress["feedback_count"]
 
     readiness_score = 0
     is_ready = False
-    if feedbacks:
-        readiness_score = sum(f.get("readiness_score", 0) for f in feedbacks) / len(feedbacks)
+    if feedback_count:
+        readiness_score = progress["readiness_sum"] / feedback_count
         is_ready = readiness_score >= 75
 
-    filler_trend = []
-    readiness_trend = []
-    for i, rec in enumerate(recordings, 1):
-        fb = feedbacks_map.get(rec["id"])
-        if fb:
-            filler_trend.append({"attempt": i, "filler_count": fb.get("filler_word_count", 0)})
-            readiness_trend.append({"attempt": i, "score": fb.get("readiness_score", 0)})
+    scored = [p for p in progress["recent"] if "score" in p]
+    filler_trend = [{"attempt": p["attempt"], "filler_count": p["filler_count"]} for p in scored]
+    readiness_trend = [{"attempt": p["attempt"], "score": p["score"]} for p in scored]
 
     # Generate next focus suggestion
-    last_fb = feedbacks[-1] if feedbacks else None
+    last_fb = progress.get("latest_feedback")
     next_focus = "Keep practicing!"
     if last_fb:
         if last_fb.get("filler_word_count", 0) > 10:
@@ -68,62 +65,62 @@ def get_stats(
         else:
             next_focus = "Great progress! Keep practicing to reach 75+ readiness"
 
-    # Fetch detailed feedback for the latest recording to get skill breakdown
-    latest_rec = recordings[-1]
-    latest_fb = feedbacks_map.get(latest_rec["id"])
-    
+    # Skill breakdown from the latest analyzed recording
     skill_breakdown = []
     last_session = None
-    
-    if latest_fb:
+
+    if last_fb:
         skill_breakdown = [
-            {"skill": "Communication", "value": latest_fb.get("confidence_score", 0), "color": "bg-cyan-500"},
-            {"skill": "Fluency", "value": max(0, 100 - (latest_fb.get("filler_word_count", 0) * 5)), "color": "bg-amber-500"},
-            {"skill": "Grammar Accuracy", "value": latest_fb.get("readiness_score", 0), "color": "bg-teal-500"},
-            {"skill": "Vocabulary Range", "value": min(100, latest_fb.get("total_word_count", 0) / 2), "color": "bg-red-500"},
-            {"skill": "Confidence Score", "value": latest_fb.get("confidence_score", 0), "color": "bg-cyan-400"},
+            {"skill": "Communication", "value": last_fb.get("confidence_score", 0), "color": "bg-cyan-500"},
+            {"skill": "Fluency", "value": max(0, 100 - (last_fb.get("filler_word_count", 0) * 5)), "color": "bg-amber-500"},
+            {"skill": "Grammar Accuracy", "value": last_fb.get("readiness_score", 0), "color": "bg-teal-500"},
+            {"skill": "Vocabulary Range", "value": min(100, last_fb.get("total_word_count", 0) / 2), "color": "bg-red-500"},
+            {"skill": "Confidence Score", "value": last_fb.get("confidence_score", 0), "color": "bg-cyan-400"},
         ]
-        
+
         last_session = {
-            "score": latest_fb.get("readiness_score", 0),
-            "change": f"+{round(readiness_score - feedbacks[0].get('readiness_score', 0), 1)}" if len(feedbacks) > 1 else "0",
-            "strengths": latest_fb.get("coaching_tips", [])[:3] if isinstance(latest_fb.get("coaching_tips"), list) else ["Good progress"],
-            "improvements": latest_fb.get("confidence_flags", [])[:3] if isinstance(latest_fb.get("confidence_flags"), list) else ["Continue practicing"]
+            "score": last_fb.get("readiness_score", 0),
+            "change": f"+{round(readiness_score - (progress.get('first_readiness') or 0), 1)}" if feedback_count > 1 else "0",
+            "strengths": last_fb["coaching_tips"] if last_fb.get("coaching_tips") is not None else ["Good progress"],
+            "improvements": last_fb["confidence_flags"] if last_fb.get("confidence_flags") is not None else ["Continue practicing"]
         }
 
+    this_week = progress["weekly"].get(week_key(datetime.now(timezone.utc).date()), {})
+
     # Mock/Calculate additional fields for enhanced dashboard
-    # In a real app, these might come from a 'user_profiles' or 'user_stats' table
     return {
         "track": "Product Management Track",
         "overall_progress": 67,
         "weekly_change": "+12%",
-        "total_recordings": len(recordings),
-        "questions_practiced": unique_questions,
-        "total_practice_minutes": round(total_duration / 60, 1),
+        "total_recordings": total_recordings,
+        "questions_practiced": len(progress["question_ids"]),
+        "total_practice_minutes": round(progress["total_duration_seconds"] / 60, 1),
         "readiness_score": round(readiness_score, 1),
         "is_interview_ready": is_ready,
-        "filler_trend": filler_trend[-20:],      # last 20 attempts
-        "readiness_trend": readiness_trend[-20:],
+        "filler_trend": filler_trend,      # last 20 attempts
+        "readiness_trend": readiness_trend,
         "next_focus": next_focus,
         "skill_breakdown": skill_breakdown,
         "last_session": last_session,
-        "latest_recording_id": latest_rec["id"],
+        "latest_recording_id": progress.get("latest_recording_id"),
         "today_tasks": [
             {"text": "Complete vocabulary drill (5 mins)", "completed": False},
             {"text": "Practice STAR framework responses", "completed": True},
             {"text": "Review last session feedback", "completed": False}
         ],
         "next_milestone": "Complete 10 mock interviews",
-        "milestone_progress": min(100, (len(recordings) / 10) * 100),
+        "milestone_progress": min(100, (total_recordings / 10) * 100),
         "gamification": {
-            "streak": 7,
+            "streak": current_streak(progress),
+            "longest_streak": progress["longest_streak"],
             "xp": 2847,
             "level": 12,
             "next_level_progress": 73
         },
-        "avg_speaking_speed": round(sum(f.get("words_per_minute", 0) for f in feedbacks) / len(feedbacks), 1) if feedbacks else 0,
-        "avg_filler_words": round(sum(f.get("filler_word_count", 0) for f in feedbacks) / len(feedbacks), 1) if feedbacks else 0,
-        "sessions_this_week": len([r for r in recordings if "2026-02" in r.get("created_at", "")]), # Generic check for this month
+        "avg_speaking_speed": round(progress["wpm_sum"] / feedback_count, 1) if feedback_count else 0,
+        "avg_filler_words": round(progress["filler_sum"] / feedback_count, 1) if feedback_count else 0,
+        "sessions_this_week": this_week.get("recordings", 0),
+        "weekly_activity": progress["weekly"],
         "ai_suggestions": [
             "Focus on behavioral questions",
             "Practice leadership scenarios",
@@ -2,109 +2,47 @@
 Feedback routes.
 Trigger AI analysis + retrieve results + compare attempts.
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from supabase import Client
-from typing import Optional
-from pathlib import Path
-import uuid
-from datetime import datetime, timezone
-
-from database import get_db
+from fastapi import APIRouter, Depends, HTTPException
+
+from repositories.projection import Projection
+from repositories.recordings import recordings_repo, feedbacks_repo
+from services.jobs.queue import get_job_queue
 from utils.jwt import get_current_user
 
 router = APIRouter(prefix="/feedback", tags=["Feedback"])
 
-
-def _run_analysis_task(recording_id: str, db: Client):
-    """Background task: run full AI analysis and save to DB."""
-    res_r = db.table("recordings").select("*").eq("id", recording_id).execute()
-    if not res_r.data:
-        return
-
-    recording = res_r.data[0]
-    
-    db.table("recordings").update({
-        "analysis_status": "processing",
-        "updated_at": datetime.now(timezone.utc).isoformat()
-    }).eq("id", recording_id).execute()
-
-    try:
-        from services.storage import get_audio_file_path, delete_audio_file, get_upload_path
-        from services.analysis.orchestrator import run_full_analysis
-
-        file_path = str(get_audio_file_path(recording["s3_key"]))
-
-        use_star = False
-        question_text = ""
-        if recording.get("question_id"):
-            res_q = db.table("questions").select("*").eq("id", recording["question_id"]).execute()
-            if res_q.data:
-                question = res_q.data[0]
-                use_star = question.get("use_star", False)
-                question_text = question.get("text", "")
-
-        result = run_full_analysis(
-            audio_path=file_path,
-            use_star=use_star,
-            question_text=question_text,
-        )
-
-        db.table("recordings").update({
-            "transcript": result["transcript"],
-            "duration_seconds": result["duration_seconds"],
-            "transcription_status": "done",
-            "analysis_status": "done",
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }).eq("id", recording_id).execute()
-
-        feedback_dict = {
-            "id": str(uuid.uuid4()),
-            "recording_id": recording_id,
-            "filler_word_count": result["filler_word_count"],
-            "filler_words_detail": result["filler_words_detail"],
-            "words_per_minute": result["words_per_minute"],
-            "total_word_count": result["total_word_count"],
-            "pause_count": result["pause_count"],
-            "star_score": result["star_score"],
-            "star_breakdown": result["star_breakdown"],
-            "pronunciation_issues": result["pronunciation_issues"],
-            "confidence_score": result["confidence_score"],
-            "confidence_flags": result["confidence_flags"],
-            "readiness_score": result["readiness_score"],
-            "coaching_tips": result["coaching_tips"],
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
-        db.table("feedbacks").insert(feedback_dict).execute()
-
-        from services.storage import delete_audio_file
-        delete_audio_file(recording["s3_key"])
-
-    except Exception as e:
-        db.table("recordings").update({
-            "analysis_status": "failed",
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        }).eq("id", recording_id).execute()
-        print(f"[ERROR] Analysis failed for recording {recording_id}: {e}")
+ANALYZE_RECORDING = Projection("feedback.analyze.recording", "recordings", ["analysis_status"])
+FEEDBACK_RECORDING = Projection("feedback.get.recording", "recordings", ["analysis_status"])
+FEEDBACK = Projection("feedback.get", "feedbacks", [
+    "id", "filler_word_count", "filler_words_detail", "words_per_minute", "total_word_count",
+    "pause_count", "pace_timeline", "star_score", "star_breakdown", "pronunciation_issues",
+    "confidence_score", "confidence_flags", "readiness_score", "coaching_tips", "degraded", "created_at",
+])
+COMPARE_RECORDINGS = Projection("feedback.compare.recordings", "recordings", ["id", "attempt_number"])
+COMPARE_FEEDBACKS = Projection("feedback.compare.feedbacks", "feedbacks", [
+    "recording_id", "filler_word_count", "words_per_minute", "readiness_score",
+])
 
 
 @router.post("/analyze")
 async def trigger_analysis(
     recording_id: str,
-    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user),
-    db: Client = Depends(get_db),
 ):
-    res_r = db.table("recordings").select("*").eq("id", recording_id).eq("user_id", current_user["id"]).execute()
-    if not res_r.data:
+    recording = await recordings_repo.get_for_user(recording_id, current_user["id"], ANALYZE_RECORDING)
+    if not recording:
         raise HTTPException(404, "Recording not found")
-        
-    recording = res_r.data[0]
-    if recording.get("analysis_status") == "processing":
+
+    queue = get_job_queue()
+    dedupe_key = f"analyze:{recording_id}"
+    # A recording left in "processing" without a live job (e.g. from before the
+    # queue existed) may be re-queued; otherwise it is genuinely in progress.
+    if recording.get("analysis_status") == "processing" and queue.is_active(dedupe_key):
         raise HTTPException(409, "Analysis already in progress")
     if recording.get("analysis_status") == "done":
         raise HTTPException(409, "Analysis already completed")
 
-    background_tasks.add_task(_run_analysis_task, recording_id, db)
+    queue.enqueue("analyze_recording", {"recording_id": recording_id}, dedupe_key=dedupe_key)
 
     return {
         "recording_id": recording_id,
@@ -114,16 +52,13 @@ async def trigger_analysis(
 
 
 @router.get("/{recording_id}")
-def get_feedback(
+async def get_feedback(
     recording_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Client = Depends(get_db),
 ):
-    res_r = db.table("recordings").select("analysis_status").eq("id", recording_id).eq("user_id", current_user["id"]).execute()
-    if not res_r.data:
+    recording = await recordings_repo.get_for_user(recording_id, current_user["id"], FEEDBACK_RECORDING)
+    if not recording:
         raise HTTPException(404, "Recording not found")
-        
-    recording = res_r.data[0]
 
     if recording.get("analysis_status") != "done":
         return {
@@ -132,11 +67,9 @@ def get_feedback(
             "feedback": None,
         }
 
-    res_fb = db.table("feedbacks").select("*").eq("recording_id", recording_id).execute()
-    if not res_fb.data:
+    feedback = await feedbacks_repo.get_for_recording(recording_id, FEEDBACK)
+    if not feedback:
         raise HTTPException(404, "Feedback not found")
-        
-    feedback = res_fb.data[0]
 
     return {
         "recording_id": recording_id,
@@ -148,6 +81,7 @@ def get_feedback(
             "words_per_minute": feedback.get("words_per_minute"),
             "total_word_count": feedback.get("total_word_count"),
             "pause_count": feedback.get("pause_count"),
+            "pace_timeline": feedback.get("pace_timeline"),
             "star_score": feedback.get("star_score"),
             "star_breakdown": feedback.get("star_breakdown"),
             "pronunciation_issues": feedback.get("pronunciation_issues"),
@@ -155,19 +89,18 @@ def get_feedback(
             "confidence_flags": feedback.get("confidence_flags"),
             "readiness_score": feedback.get("readiness_score"),
             "coaching_tips": feedback.get("coaching_tips"),
+            "degraded": feedback.get("degraded") or [],
             "created_at": feedback.get("created_at"),
         },
     }
 
 
 @router.get("/compare/{question_id}")
-def compare_attempts(
+async def compare_attempts(
     question_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Client = Depends(get_db),
 ):
-    res_rec = db.table("recordings").select("*").eq("user_id", current_user["id"]).eq("question_id", question_id).eq("analysis_status", "done").order("created_at").execute()
-    recordings = res_rec.data
+    recordings = await recordings_repo.list_analyzed(current_user["id"], COMPARE_RECORDINGS, question_id)
 
     if len(recordings) < 2:
         raise HTTPException(400, "Need at least 2 completed attempts to compare")
@@ -175,12 +108,11 @@ def compare_attempts(
     first = recordings[0]
     latest = recordings[-1]
 
-    def get_fb(rec_id):
-        res = db.table("feedbacks").select("*").eq("recording_id", rec_id).execute()
-        return res.data[0] if res.data else None
-
-    first_fb = get_fb(first["id"])
-    latest_fb = get_fb(latest["id"])
+    feedbacks = {
+        fb["recording_id"]: fb for fb in await feedbacks_repo.for_recordings([first["id"], latest["id"]], COMPARE_FEEDBACKS)
+    }
+    first_fb = feedbacks.get(first["id"])
+    latest_fb = feedbacks.get(latest["id"])
     if not first_fb or not latest_fb:
         raise HTTPException(404, "Feedback not found for one or both attempts")
 
@@ -3,12 +3,13 @@ Recording upload route.
 Accepts audio file -> saves locally -> creates Recording DB record.
 """
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form
-from supabase import Client
 from typing import Optional
 import uuid
 from datetime import datetime, timezone
 
-from database import get_db
+from repositories.projection import Projection
+from repositories.recordings import recordings_repo
+from services.question_catalog import get_question_catalog
 from services.storage import save_audio_file as save_audio
 from utils.jwt import get_current_user
 
@@ -20,6 +21,10 @@ ALLOWED_AUDIO_TYPES = {
 }
 MAX_FILE_SIZE_MB = 25
 
+GET_RECORDING = Projection("recordings.get", "recordings", [
+    "id", "question_id", "duration_seconds", "attempt_number", "analysis_status", "created_at",
+])
+
 
 @router.post("/upload")
 async def upload_recording(
@@ -27,17 +32,15 @@ async def upload_recording(
     question_id: Optional[str] = Form(None),
     attempt_number: int = Form(1),
     current_user: dict = Depends(get_current_user),
-    db: Client = Depends(get_db),
 ):
     if file.content_type and file.content_type not in ALLOWED_AUDIO_TYPES:
         raise HTTPException(400, f"Unsupported audio format: {file.content_type}")
 
     question = None
     if question_id:
-        res_q = db.table("questions").select("*").eq("id", question_id).execute()
-        if not res_q.data:
+        question = (await get_question_catalog()).get(question_id)
+        if not question:
             raise HTTPException(404, "Question not found")
-        question = res_q.data[0]
 
     storage_result = await save_audio(file, str(current_user["id"]))
 
@@ -52,10 +55,9 @@ async def upload_recording(
         "created_at": datetime.now(timezone.utc).isoformat(),
         "updated_at": datetime.now(timezone.utc).isoformat(),
     }
-    res_r = db.table("recordings").insert(rec_dict).execute()
-    if not res_r.data:
+    recording = await recordings_repo.create(rec_dict)
+    if not recording:
         raise HTTPException(500, "Failed to save recording to database")
-    recording = res_r.data[0]
 
     return {
         "recording_id": str(recording["id"]),
@@ -66,16 +68,13 @@ async def upload_recording(
 
 
 @router.get("/{recording_id}")
-def get_recording(
+async def get_recording(
     recording_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Client = Depends(get_db),
 ):
-    res_r = db.table("recordings").select("*").eq("id", recording_id).eq("user_id", current_user["id"]).execute()
-    if not res_r.data:
+    recording = await recordings_repo.get_for_user(recording_id, current_user["id"], GET_RECORDING)
+    if not recording:
         raise HTTPException(404, "Recording not found")
-    
-    recording = res_r.data[0]
 
     return {
         "id": str(recording["id"]),
@@ -1,25 +1,35 @@
 """
 Roleplay router — WebSocket-based AI interview sessions.
 """
+import asyncio
 import json
 import logging
 import uuid
 from datetime import datetime, timezone
+from typing import Optional, Tuple
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, HTTPException
-from supabase import Client
+from fastapi.responses import JSONResponse
 
-from database import get_db
+from repositories.interviews import interview_sessions_repo
+from repositories.projection import Projection
 from schemas.roleplay import (
     StartSessionRequest, StartSessionResponse,
     WSIncomingMessage, WSOutgoingMessage,
-    SessionFeedbackResponse, SessionListItem,
+    SessionFeedbackResponse, SessionEvaluationStatus, SessionListItem,
 )
-from services.interviewer.session_manager import create_session, get_session, end_session
-from services.interviewer.gpt_interviewer import get_interviewer_response
-from services.interviewer.tts_service import text_to_speech_base64
-from services.interviewer.session_evaluator import evaluate_and_save_session
+from services.interviewer.session_manager import create_session, get_session, save_session, end_session
+from services.interviewer.gpt_interviewer import get_interviewer_response, stream_interviewer_response
+from services.interviewer.tts_service import text_to_speech
+from services.interviewer.ws_protocol import RoleplayConnection, negotiate_protocol
+from services.interviewer.streaming import stream_spoken_reply
+from services.interviewer.prompts import WRAP_UP_MESSAGE
+from services.interviewer.context_manager import build_context, schedule_summary
+from services.interviewer.opening import start_opening, take_opening_watching, cancel_opening
+from services.interviewer.turn_log import get_turn_writer, log_new_turns
+from services.interviewer.session_evaluator import release_evaluation
+from services.jobs.queue import get_job_queue
 from utils.jwt import get_current_user
 
 router = APIRouter(prefix="/roleplay", tags=["AI Interviewer"])
@@ -28,12 +38,17 @@ logger = logging.getLogger(__name__)
 VALID_COMPANIES = {"amazon", "google", "startup", "infosys", "generic"}
 VALID_INTERVIEW_TYPES = {"behavioral", "technical", "mixed"}
 
+END_SESSION = Projection("roleplay.end", "interview_sessions", ["session_feedback", "status"])
+SESSION_FEEDBACK = Projection("roleplay.feedback", "interview_sessions", [
+    "id", "session_feedback", "evaluation_status", "overall_score", "total_turns", "duration_seconds", "started_at",
+])
+LIST_SESSIONS = Projection("roleplay.list_sessions", "interview_sessions", model=SessionListItem)
+
 
 @router.post("/start", response_model=StartSessionResponse)
 async def start_session(
     payload: StartSessionRequest,
     current_user: dict = Depends(get_current_user),
-    db: Client = Depends(get_db),
 ):
     company_key = payload.company_key.lower()
     if company_key not in VALID_COMPANIES:
@@ -53,18 +68,22 @@ async def start_session(
         "total_turns": 0,
         "started_at": datetime.now(timezone.utc).isoformat()
     }
-    res_s = db.table("interview_sessions").insert(db_session_dict).execute()
-    db_session = res_s.data[0]
+    db_session = await interview_sessions_repo.create(db_session_dict)
+    if not db_session:
+        raise HTTPException(500, "Failed to create session")
 
-    active = create_session(
+    active = await asyncio.to_thread(
+        create_session,
         user_id=str(current_user["id"]),
         company_key=company_key,
         interview_type=payload.interview_type,
         role=payload.role,
         experience_level=current_user.get("experience_level", "student"),
         max_turns=payload.max_turns,
+        db_session_id=str(db_session["id"]),
     )
-    active.db_session_id = str(db_session["id"])
+    # Usually finished by the time the client connects the WebSocket
+    start_opening(active)
 
     return StartSessionResponse(
         session_id=active.session_id,
@@ -73,55 +92,126 @@ async def start_session(
     )
 
 
+async def _send_interviewer_turn(
+    conn: RoleplayConnection, active, msg_type: str, stream: bool,
+    prepared: Optional[Tuple[str, Optional[bytes]]] = None,
+):
+    """
+    Generate the interviewer's next message and send it to the client.
+    In streaming mode the text and per-sentence audio are sent as they are
+    produced, followed by the usual message frame without audio. A prepared
+    (text, audio) pair is sent as is; missing audio is synthesized.
+    """
+    # Frames carry the turn count after this message, except the opening (turn 0)
+    turn = active.current_turn + 1 if active.current_turn else 0
+    context = dict(
+        conversation_history=build_context(active),
+        company_key=active.company_key,
+        interview_type=active.interview_type,
+        role=active.role,
+        experience_level=active.experience_level,
+        current_turn=active.current_turn,
+        max_turns=active.max_turns,
+    )
+
+    if prepared is not None:
+        text, audio = prepared
+        stream = False
+        if audio is None:
+            audio = await text_to_speech(text)
+    elif stream:
+        reply = await stream_spoken_reply(
+            stream_interviewer_response(**context), conn.send, turn
+        )
+        logger.info(
+            f"Session {active.session_id} turn {turn}: first token {reply.first_token_ms} ms, "
+            f"first audio {reply.first_audio_ms} ms, done {reply.total_ms} ms "
+            f"({reply.sentences} sentences)"
+        )
+        text, audio = reply.text, None
+    else:
+        text = await get_interviewer_response(**context)
+        audio = await text_to_speech(text)
+
+    active.add_assistant_message(text)
+    await _commit_turn(active)
+    await conn.send({
+        "type": msg_type,
+        "content": text,
+        "turn": turn,
+        "max_turns": active.max_turns,
+        "is_last": False,
+        "streamed": stream,
+    }, audio=audio)
+
+
+async def _commit_turn(active):
+    # Session store for the live state, turn log (write-behind) for the record
+    await asyncio.to_thread(save_session, active)
+    log_new_turns(active)
+
+
+def _save_if_live(active):
+    # A background update must not bring back a session that has already ended
+    if get_session(active.session_id) is not None:
+        save_session(active)
+
+
+def _save_if_live_later(active):
+    # Called from a task's done callback, on the event loop: the store work goes to a thread
+    asyncio.get_running_loop().run_in_executor(None, _save_if_live, active)
+
+
+async def _receive_text(websocket: WebSocket, early: list) -> str:
+    # Messages received while the opening was generated come first
+    message = early.pop(0) if early else await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    return message["text"]
+
+
 @router.websocket("/session/{session_id}")
 async def interview_websocket(
     websocket: WebSocket,
     session_id: str,
-    db: Client = Depends(get_db),
+    stream: bool = False,
 ):
-    await websocket.accept()
-    active = get_session(session_id)
+    """
+    Interview session. With ?stream=true the interviewer's replies arrive as
+    "question_delta" text frames and "audio_chunk" frames per sentence before
+    the final question / follow_up frame. Clients offering the "flowenci.v2"
+    subprotocol get audio as binary frames (see ws_protocol).
+    """
+    subprotocol = negotiate_protocol(websocket)
+    await websocket.accept(subprotocol=subprotocol)
+    conn = RoleplayConnection(websocket, subprotocol)
+    conn.start()
+    active = await asyncio.to_thread(get_session, session_id)
 
     if not active:
-        await websocket.send_json({
+        await conn.send({
             "type": "error",
             "content": "Session not found or expired.",
         })
+        await conn.aclose()
         await websocket.close(code=4004)
         return
 
+    summary_task = None
     try:
-        opening_text = await get_interviewer_response(
-            conversation_history=active.conversation_history,
-            company_key=active.company_key,
-            interview_type=active.interview_type,
-            role=active.role,
-            experience_level=active.experience_level,
-            current_turn=active.current_turn,
-            max_turns=active.max_turns,
-        )
-        active.add_assistant_message(opening_text)
-        audio_b64 = await text_to_speech_base64(opening_text)
-
-        await websocket.send_json({
-            "type": "question",
-            "content": opening_text,
-            "audio_b64": audio_b64,
-            "turn": 0,
-            "max_turns": active.max_turns,
-            "is_last": False,
-        })
+        opening, early = await take_opening_watching(active, websocket)
+        await _send_interviewer_turn(conn, active, "question", stream, prepared=opening)
 
         while True:
-            raw = await websocket.receive_text()
+            raw = await _receive_text(websocket, early)
             try:
                 msg = WSIncomingMessage(**json.loads(raw))
             except Exception:
-                await websocket.send_json({"type": "error", "content": "Invalid message format."})
+                await conn.send({"type": "error", "content": "Invalid message format."})
                 continue
 
             if msg.type == "ping":
-                await websocket.send_json({"type": "pong", "content": ""})
+                await conn.send({"type": "pong", "content": ""})
                 continue
 
             if msg.type == "end_session":
@@ -130,131 +220,139 @@ async def interview_websocket(
 
             if msg.type == "answer":
                 if not msg.content.strip():
-                    await websocket.send_json({"type": "error", "content": "Please provide your answer."})
+                    await conn.send({"type": "error", "content": "Please provide your answer."})
                     continue
 
                 active.add_user_message(msg.content)
+                await _commit_turn(active)
                 is_last = active.is_session_over()
 
                 if is_last:
-                    wrap_up = (
-                        "Thank you so much for your time! You've done really well. "
-                        "Our team will be in touch soon. Do you have any questions for me?"
-                    )
+                    wrap_up = WRAP_UP_MESSAGE
                     active.add_assistant_message(wrap_up)
-                    audio_b64 = await text_to_speech_base64(wrap_up)
-                    await websocket.send_json({
+                    await _commit_turn(active)
+                    audio = await text_to_speech(wrap_up)
+                    await conn.send({
                         "type": "session_end",
                         "content": wrap_up,
-                        "audio_b64": audio_b64,
                         "turn": active.current_turn,
                         "max_turns": active.max_turns,
                         "is_last": True,
-                    })
+                    }, audio=audio)
                     break
 
-                ai_response = await get_interviewer_response(
-                    conversation_history=active.conversation_history,
-                    company_key=active.company_key,
-                    interview_type=active.interview_type,
-                    role=active.role,
-                    experience_level=active.experience_level,
-                    current_turn=active.current_turn,
-                    max_turns=active.max_turns,
-                )
-                active.add_assistant_message(ai_response)
-                audio_b64 = await text_to_speech_base64(ai_response)
-
-                msg_type = "follow_up" if active.current_turn > 1 else "question"
-                await websocket.send_json({
-                    "type": msg_type,
-                    "content": ai_response,
-                    "audio_b64": audio_b64,
-                    "turn": active.current_turn,
-                    "max_turns": active.max_turns,
-                    "is_last": False,
-                })
+                # current_turn is counted before the reply is added
+                msg_type = "follow_up" if active.current_turn >= 1 else "question"
+                await _send_interviewer_turn(conn, active, msg_type, stream)
+                # Fold older exchanges into the summary while the candidate answers
+                if summary_task is None or summary_task.done():
+                    summary_task = schedule_summary(active, on_done=_save_if_live_later)
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected: {session_id}")
     except Exception as e:
         logger.error(f"WebSocket error in {session_id}: {e}")
         try:
-            await websocket.send_json({"type": "error", "content": "An error occurred."})
+            await conn.send({"type": "error", "content": "An error occurred."})
         except Exception:
             pass
     finally:
-        ended = end_session(session_id)
-        if ended and ended.current_turn > 0:
-            try:
-                db_record_res = db.table("interview_sessions").select("*").eq("id", ended.db_session_id).execute()
-                if db_record_res.data:
-                    update_data = {
-                        "conversation_history": ended.conversation_history,
-                        "total_turns": ended.current_turn,
-                        "status": "completed" if ended.is_complete else "abandoned"
-                    }
-                    if ended.is_complete:
-                        update_data["ended_at"] = datetime.now(timezone.utc).isoformat()
-                    db.table("interview_sessions").update(update_data).eq("id", ended.db_session_id).execute()
-            except Exception as e:
-                logger.error(f"Failed to save session: {e}")
-
-
-@router.post("/session/{db_session_id}/end", response_model=SessionFeedbackResponse)
+        cancel_opening(session_id)
+        if summary_task is not None:
+            summary_task.cancel()
+        await conn.aclose()
+        # This connection's copy is the latest; the stored one only needs removing
+        try:
+            await asyncio.to_thread(end_session, session_id)
+        except Exception as e:
+            logger.error(f"Failed to end session {session_id}: {e}")
+        ended = active
+        if ended.current_turn > 0:
+            logger.info(f"Session {session_id} ended after {ended.current_turn} turns; "
+                        f"bounded context saved {ended.context_tokens_saved} prompt tokens")
+        # Turns are already in interview_turns; the session row only keeps the summary.
+        # Written after the flush even with no turns: the evaluation job waits for it.
+        update_data = {
+            "total_turns": ended.current_turn,
+            "status": "completed" if ended.is_complete else "abandoned"
+        }
+        if ended.is_complete:
+            update_data["ended_at"] = datetime.now(timezone.utc).isoformat()
+        try:
+            await asyncio.to_thread(get_turn_writer().flush)
+            await interview_sessions_repo.update(ended.db_session_id, update_data)
+        except Exception as e:
+            logger.error(f"Failed to save session: {e}")
+
+
+@router.post("/session/{db_session_id}/end", response_model=SessionEvaluationStatus, status_code=202)
 async def end_and_evaluate(
     db_session_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Client = Depends(get_db),
 ):
-    res_s = db.table("interview_sessions").select("*").eq("id", db_session_id).eq("user_id", current_user["id"]).execute()
-    if not res_s.data:
+    """
+    Queue the end-of-session evaluation and return at once. Poll
+    GET /roleplay/session/{db_session_id}/feedback for the result.
+    """
+    db_record = await interview_sessions_repo.get(db_session_id, END_SESSION, current_user["id"])
+    if not db_record:
         raise HTTPException(404, "Session not found")
-        
-    db_record = res_s.data[0]
 
-    if db_record.get("status") == "active" or not db_record.get("session_feedback"):
-        from services.interviewer.gpt_interviewer import generate_session_feedback
-        feedback = await generate_session_feedback(
-            conversation_history=db_record.get("conversation_history") or [],
-            company_key=db_record.get("company") or "generic",
+    if db_record.get("session_feedback") and db_record.get("status") != "active":
+        return SessionEvaluationStatus(
+            db_session_id=db_session_id, status="done", message="Feedback is ready."
         )
-        update_data = {
-            "session_feedback": feedback,
-            "overall_score": feedback.get("overall_score", 50),
-            "status": "completed",
-            "ended_at": datetime.now(timezone.utc).isoformat()
-        }
-        res_u = db.table("interview_sessions").update(update_data).eq("id", db_session_id).execute()
-        db_record = res_u.data[0]
 
-    return _build_feedback_response(db_record)
+    # Only the request that moves the session to "evaluating" queues the job
+    if await interview_sessions_repo.claim_evaluation(db_session_id, current_user["id"]):
+        try:
+            # Turns this process still has queued go out first; the job waits
+            # for the rest (a WebSocket on another worker) to be written
+            await asyncio.to_thread(get_turn_writer().flush)
+            get_job_queue().enqueue(
+                "evaluate_session", {"db_session_id": db_session_id}, dedupe_key=f"evaluate:{db_session_id}"
+            )
+        except Exception:
+            await release_evaluation(db_session_id, None)
+            raise
+
+    return SessionEvaluationStatus(
+        db_session_id=db_session_id,
+        status="evaluating",
+        message="Evaluation started. Poll GET /roleplay/session/{db_session_id}/feedback for results.",
+    )
 
 
 @router.get("/session/{db_session_id}/feedback", response_model=SessionFeedbackResponse)
-def get_session_feedback(
+async def get_session_feedback(
     db_session_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Client = Depends(get_db),
 ):
-    res_s = db.table("interview_sessions").select("*").eq("id", db_session_id).eq("user_id", current_user["id"]).execute()
-    if not res_s.data:
+    db_record = await interview_sessions_repo.get(db_session_id, SESSION_FEEDBACK, current_user["id"])
+    if not db_record:
         raise HTTPException(404, "Session not found")
-    
-    db_record = res_s.data[0]
+
     if not db_record.get("session_feedback"):
+        evaluation_status = db_record.get("evaluation_status")
+        if evaluation_status == "evaluating":
+            return JSONResponse(status_code=202, content={
+                "db_session_id": db_session_id,
+                "status": "evaluating",
+                "evaluation_status": "evaluating",
+                "feedback": None,
+            })
+        if evaluation_status == "failed":
+            raise HTTPException(409, "Evaluation failed. End the session again to retry.")
         raise HTTPException(404, "Feedback not yet generated.")
         
     return _build_feedback_response(db_record)
 
 
 @router.get("/sessions", response_model=list[SessionListItem])
-def list_sessions(
+async def list_sessions(
     current_user: dict = Depends(get_current_user),
-    db: Client = Depends(get_db),
 ):
-    res_s = db.table("interview_sessions").select("*").eq("user_id", current_user["id"]).order("started_at", desc=True).limit(20).execute()
-    return res_s.data
+    return await interview_sessions_repo.list_recent(current_user["id"], LIST_SESSIONS, limit=20)
 
 
 def _build_feedback_response(db_record: dict) -> SessionFeedbackResponse:
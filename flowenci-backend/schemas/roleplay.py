@@ -23,12 +23,15 @@ class WSIncomingMessage(BaseModel):
 
 
 class WSOutgoingMessage(BaseModel):
-    type: str
+    type: str       # "question" | "follow_up" | "session_end" | "question_delta" | "audio_chunk" | "pong" | "error"
     content: str
-    audio_b64: Optional[str] = None
+    audio_b64: Optional[str] = None    # protocol v1 only
+    audio: Optional[dict] = None       # protocol v2: {codec, size, sequence} of the binary frame that follows
     turn: Optional[int] = None
     max_turns: Optional[int] = None
     is_last: bool = False
+    sequence: Optional[int] = None     # audio_chunk order within a turn
+    streamed: bool = False             # text and audio were already sent as deltas / chunks
 
 
 class TopWin(BaseModel):
@@ -41,6 +44,12 @@ class TopImprovement(BaseModel):
     suggestion: str
 
 
+class SessionEvaluationStatus(BaseModel):
+    db_session_id: str
+    status: str     # "evaluating" | "done"
+    message: str
+
+
 class SessionFeedbackResponse(BaseModel):
     db_session_id: str
     overall_score: float
@@ -52,6 +61,7 @@ class SessionFeedbackResponse(BaseModel):
     total_turns: int
     duration_seconds: float
     created_at: datetime
+    evaluation_status: str = "done"
 
     model_config = {"from_attributes": True}
 
@@ -0,0 +1,174 @@
+"""
+Check that every endpoint reads all the columns its projections fetch.
+
+Usage: python scripts/audit_projections.py [--verbose]
+
+Runs the read endpoints against an in-memory stand-in for PostgREST with
+db_audit_projections on, then lists each projection's columns that nothing
+read. Exits 1 if any projection fetches an unused column, so it can gate CI.
+Rows are shaped to take each endpoint down its fullest paths (analysis done,
+feedback generated or still evaluating, two attempts to compare).
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import date
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ["DB_AUDIT_PROJECTIONS"] = "true"
+
+import httpx
+
+from repositories.projection import audit_report
+from repositories.rest import RestClient, get_rest_client, init_rest_client
+from utils.password import hash_password
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+PASSWORD = "audit-password"
+NOW = "2026-01-05T10:00:00+00:00"
+
+FEEDBACK = {
+    "filler_words_detail": {"um": 2}, "total_word_count": 120, "pause_count": 3,
+    "pace_timeline": [], "star_score": 70, "star_breakdown": {"situation": 80},
+    "pronunciation_issues": [], "confidence_score": 65, "confidence_flags": ["hedging"],
+    "coaching_tips": ["Pause instead of filling"], "degraded": [], "created_at": NOW,
+}
+
+TABLES = {
+    "users": [{
+        "id": USER_ID, "name": "Audit", "email": "audit@example.com",
+        "hashed_password": hash_password(PASSWORD), "experience_level": "student",
+        "target_companies": "google", "interview_timeline": "1 month", "is_active": True,
+        "is_paid": False, "created_at": NOW, "updated_at": NOW,
+    }],
+    "questions": [{
+        "id": "q1", "text": "Tell me about a conflict.", "category": "behavioral", "difficulty": "medium",
+        "use_star": True, "guidance": "Use STAR", "target_duration_min": 60, "target_duration_max": 120,
+        "tags": ["conflict"], "is_active": True, "created_at": NOW, "updated_at": NOW,
+    }],
+    "recordings": [
+        {
+            "id": rid, "user_id": USER_ID, "question_id": "q1", "s3_key": f"{rid}.webm", "duration_seconds": 90,
+            "attempt_number": n, "transcript": "...", "transcription_status": "done", "analysis_status": "done",
+            "progress_counted": True, "created_at": NOW, "updated_at": NOW,
+        }
+        for n, rid in enumerate(["r1", "r2"], start=1)
+    ],
+    "feedbacks": [
+        {"id": "f1", "recording_id": "r1", "filler_word_count": 9, "words_per_minute": 170, "readiness_score": 55, **FEEDBACK},
+        {"id": "f2", "recording_id": "r2", "filler_word_count": 4, "words_per_minute": 140, "readiness_score": 68, **FEEDBACK},
+    ],
+    "user_progress": [{
+        "user_id": USER_ID, "version": 2, "total_recordings": 2, "total_duration_seconds": 180.0,
+        "question_ids": ["q1"], "feedback_count": 2, "readiness_sum": 123.0, "wpm_sum": 310.0, "filler_sum": 13,
+        "first_recording_id": "r1", "first_readiness": 55,
+        "recent": [
+            {"recording_id": "r1", "attempt": 1, "filler_count": 9, "score": 55},
+            {"recording_id": "r2", "attempt": 2, "filler_count": 4, "score": 68},
+        ],
+        "weekly": {"2026-W02": {"recordings": 2, "minutes": 3.0}}, "current_streak": 1, "longest_streak": 1,
+        "last_practice_date": date.today().isoformat(), "latest_recording_id": "r2",
+        "latest_feedback": {
+            "readiness_score": 68, "confidence_score": 65, "filler_word_count": 4, "words_per_minute": 140,
+            "total_word_count": 120, "coaching_tips": ["Pause"], "confidence_flags": ["hedging"],
+        },
+        "updated_at": NOW,
+    }],
+    "interview_sessions": [{
+        "id": "s1", "user_id": USER_ID, "company": "google", "interview_type": "behavioral",
+        "status": "completed", "evaluation_status": "done", "total_turns": 6, "duration_seconds": 600,
+        "overall_score": 72, "conversation_history": [],
+        "session_feedback": {
+            "summary": "Solid", "top_wins": [{"point": "Clear", "example": "..."}],
+            "top_improvements": [{"point": "Metrics", "suggestion": "..."}],
+            "delivery_notes": "Good pace", "interview_ready": True,
+        },
+        "started_at": NOW, "ended_at": NOW,
+    }, {
+        "id": "s2", "user_id": USER_ID, "company": "generic", "interview_type": "mixed",
+        "status": "completed", "evaluation_status": "evaluating", "total_turns": 4, "duration_seconds": 300,
+        "overall_score": None, "conversation_history": [], "session_feedback": None,
+        "started_at": NOW, "ended_at": NOW,
+    }],
+    "interview_turns": [],
+}
+
+# (method, path, request kwargs)
+REQUESTS = [
+    ("POST", "/auth/login", {"json": {"email": "audit@example.com", "password": PASSWORD}}),
+    ("GET", "/auth/me", {}),
+    ("GET", "/questions", {}),
+    ("GET", "/questions/categories", {}),
+    ("GET", "/questions/q1", {}),
+    ("GET", "/dashboard/stats", {}),
+    ("GET", "/recordings/r1", {}),
+    ("POST", "/feedback/analyze?recording_id=r1", {}),
+    ("GET", "/feedback/r1", {}),
+    ("GET", "/feedback/compare/q1", {}),
+    ("GET", "/roleplay/sessions", {}),
+    ("POST", "/roleplay/session/s1/end", {}),
+    ("GET", "/roleplay/session/s1/feedback", {}),
+    ("GET", "/roleplay/session/s2/feedback", {}),
+]
+
+
+def _matches(row: dict, params) -> bool:
+    """eq and in filters only; enough to route each lookup to its row."""
+    for column, value in params:
+        if column not in row:
+            continue
+        op, _, operand = value.partition(".")
+        actual = json.dumps(row[column]).strip('"')
+        if op == "eq" and actual != operand:
+            return False
+        if op == "in" and actual not in [v.strip('"') for v in operand[1:-1].split(",")]:
+            return False
+    return True
+
+
+async def fake_postgrest(request: httpx.Request) -> httpx.Response:
+    table = request.url.path.rsplit("/", 1)[1]
+    params = list(request.url.params.multi_items())
+    if request.method != "GET":
+        return httpx.Response(200, json=[])
+    columns = dict(params)["select"].split(",")
+    rows = [{c: row.get(c) for c in columns} for row in TABLES[table] if _matches(row, params)]
+    return httpx.Response(200, json=rows, headers={"content-range": f"0-{len(rows) - 1}/{len(rows)}"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="list every projection, not only the failing ones")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    import main as app_module
+    from utils.jwt import create_access_token
+
+    init_rest_client(RestClient("http://audit", "audit-key", transport=httpx.MockTransport(fake_postgrest)))
+    client = TestClient(app_module.app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': USER_ID})}"}
+    for method, path, kwargs in REQUESTS:
+        response = client.request(method, path, headers=headers, **kwargs)
+        print(f"{method:>5} {path} -> {response.status_code}")
+
+    queries = get_rest_client().metrics()["queries"]
+    failing = 0
+    print()
+    for name, entry in audit_report().items():
+        stats = queries.get(name, {})
+        if entry["unused"]:
+            failing += 1
+            print(f"FAIL {name} ({entry['table']}): never reads {', '.join(entry['unused'])}")
+        elif args.verbose:
+            print(f"  ok {name} ({entry['table']}): {len(entry['columns'])} column(s), "
+                  f"{stats.get('avg_bytes', 0)} bytes/query")
+    print(f"\n{len(audit_report())} projection(s) audited, {failing} fetching unused columns")
+    sys.exit(1 if failing else 0)
+
+
+if __name__ == "__main__":
+    main()
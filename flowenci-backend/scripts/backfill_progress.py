@@ -0,0 +1,74 @@
+"""
+Rebuild user_progress rows from analyzed recordings and their feedback.
+
+Usage: python scripts/backfill_progress.py [--user USER_ID ...] [--dry-run]
+
+Without --user every user with an analyzed recording is rebuilt. Safe to run
+while workers are processing: a row that changed while its recordings were
+being read is rebuilt again (see services/progress.rebuild_and_save).
+"""
+import argparse
+import os
+import sys
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import supabase as db
+from services.progress import rebuild_and_save
+
+RECORDING_COLUMNS = "id, user_id, question_id, duration_seconds, created_at"
+FEEDBACK_COLUMNS = (
+    "recording_id, readiness_score, confidence_score, filler_word_count, words_per_minute, "
+    "total_word_count, coaching_tips, confidence_flags"
+)
+PAGE = 1000
+
+
+def analyzed_recordings(user_id=None):
+    """Analyzed recordings, oldest first, a page at a time."""
+    offset = 0
+    while True:
+        req = db.table("recordings").select(RECORDING_COLUMNS).eq("analysis_status", "done")
+        if user_id:
+            req = req.eq("user_id", user_id)
+        rows = req.order("created_at").range(offset, offset + PAGE - 1).execute().data
+        yield from rows
+        if len(rows) < PAGE:
+            return
+        offset += PAGE
+
+
+def feedbacks_for(recording_ids):
+    feedbacks = {}
+    for i in range(0, len(recording_ids), 200):
+        chunk = recording_ids[i:i + 200]
+        for fb in db.table("feedbacks").select(FEEDBACK_COLUMNS).in_("recording_id", chunk).execute().data:
+            feedbacks[str(fb["recording_id"])] = fb
+    return feedbacks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--user", nargs="+", help="only these user ids")
+    parser.add_argument("--dry-run", action="store_true", help="print the aggregates instead of saving them")
+    args = parser.parse_args()
+
+    user_ids = args.user or sorted({str(r["user_id"]) for r in analyzed_recordings()})
+
+    def loader(user_id):
+        def load():
+            recordings = list(analyzed_recordings(user_id))
+            return recordings, feedbacks_for([str(r["id"]) for r in recordings])
+        return load
+
+    for user_id in user_ids:
+        progress = rebuild_and_save(user_id, loader(user_id), dry_run=args.dry_run)
+        summary = (f"{user_id}: {progress['total_recordings']} recordings, "
+                   f"streak {progress['current_streak']} (longest {progress['longest_streak']})")
+        print(f"[dry run] {summary}" if args.dry_run else summary)
+    print(f"Rebuilt progress for {len(user_ids)} user(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Benchmark concurrent database read throughput: blocking supabase-py calls on a threadpool vs the async repositories.
+
+Usage: python scripts/bench_db.py [--requests 500] [--concurrency 100] [--fake-latency-ms 30]
+
+The "sync" mode is how the routes used to run: FastAPI hands each sync
+handler to a worker thread (40 by default), so concurrent requests queue
+for threads. The "async" mode awaits the pooled repositories on one event
+loop. With --fake-latency-ms both talk to a local stand-in for PostgREST
+that answers after the given delay; otherwise they query the configured
+Supabase project (questions table, read-only).
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import get_settings
+from repositories.projection import Projection
+from repositories.questions import QuestionsRepository
+from services.question_catalog import QUESTION_FIELDS
+from repositories.rest import RestClient
+
+settings = get_settings()
+
+LIST_QUESTIONS = Projection("bench.list_questions", "questions", QUESTION_FIELDS)
+FAKE_ROWS = [{"id": str(i), "text": f"Question {i}", "category": "behavioral", "is_active": True} for i in range(20)]
+
+
+def _serve_fake_postgrest(latency: float, ports):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+        def do_GET(self):
+            time.sleep(latency)
+            body = json.dumps(FAKE_ROWS).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Range", f"0-{len(FAKE_ROWS) - 1}/{len(FAKE_ROWS)}")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        request_queue_size = 1024   # the default backlog of 5 turns bursts into connect retries
+        daemon_threads = True
+
+    server = Server(("127.0.0.1", 0), Handler)
+    ports.put(server.server_port)
+    server.serve_forever()
+
+
+def start_fake_postgrest(latency: float) -> str:
+    """Run the stand-in server in its own process so it doesn't share the GIL with the client."""
+    ports = multiprocessing.Queue()
+    multiprocessing.Process(target=_serve_fake_postgrest, args=(latency, ports), daemon=True).start()
+    return f"http://127.0.0.1:{ports.get(timeout=10)}"
+
+
+async def run_sync_mode(url: str, key: str, requests: int, concurrency: int, threads: int):
+    from supabase import create_client
+
+    db = create_client(url, key)
+    pool = ThreadPoolExecutor(max_workers=threads)
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    def query():
+        started = time.perf_counter()
+        db.table("questions").select(LIST_QUESTIONS.select, count="exact").eq("is_active", True).range(0, 49).execute()
+        return time.perf_counter() - started
+
+    async def one():
+        async with semaphore:
+            queued = time.perf_counter()
+            await loop.run_in_executor(pool, query)
+            return time.perf_counter() - queued
+
+    try:
+        return await asyncio.gather(*(one() for _ in range(requests)))
+    finally:
+        pool.shutdown()
+
+
+async def run_async_mode(url: str, key: str, requests: int, concurrency: int):
+    client = RestClient(url, key)
+    repo = QuestionsRepository(client)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await repo.list_active(LIST_QUESTIONS, limit=50)
+            return time.perf_counter() - started
+
+    try:
+        return await asyncio.gather(*(one() for _ in range(requests)))
+    finally:
+        await client.aclose()
+
+
+def report(mode: str, latencies, elapsed: float):
+    ms = sorted(x * 1000 for x in latencies)
+    p95 = ms[int(len(ms) * 0.95) - 1] if len(ms) >= 20 else ms[-1]
+    print(f"{mode:>6} {len(ms) / elapsed:>9.1f} {statistics.median(ms):>8.1f} {p95:>8.1f} {elapsed:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100, help="requests in flight at once")
+    parser.add_argument("--threads", type=int, default=40, help="threadpool size for the sync mode")
+    parser.add_argument("--fake-latency-ms", type=float, default=None)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    args = parser.parse_args()
+
+    if args.fake_latency_ms is not None:
+        url, key = start_fake_postgrest(args.fake_latency_ms / 1000), "fake-key"
+        # supabase-py appends /rest/v1; the fake server answers any path
+    else:
+        url, key = settings.supabase_url, settings.supabase_key
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent, against {url}")
+    print(f"{'mode':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'total s':>8}")
+    for mode in args.modes:
+        started = time.perf_counter()
+        if mode == "sync":
+            latencies = asyncio.run(run_sync_mode(url, key, args.requests, args.concurrency, args.threads))
+        else:
+            latencies = asyncio.run(run_async_mode(url, key, args.requests, args.concurrency))
+        report(mode, latencies, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
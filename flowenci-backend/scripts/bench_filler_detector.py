@@ -0,0 +1,56 @@
+"""
+Benchmark the compiled filler matcher against the old per-filler regex scan.
+
+Usage: python scripts/bench_filler_detector.py
+"""
+import os
+import random
+import re
+import sys
+import timeit
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.analysis.filler_detector import FILLER_WORDS, detect_fillers, detect_fillers_batch
+
+VOCAB = (
+    "i implemented the project with my team and we delivered the result on time "
+    "um uh like basically you know actually i mean so i think kind of just right"
+).split()
+
+
+def legacy_detect_fillers(transcript: str) -> dict:
+    """The previous implementation: one regex per filler word."""
+    text_lower = transcript.lower()
+    detail = {}
+    for filler in FILLER_WORDS:
+        pattern = r'\b' + re.escape(filler) + r'\b'
+        matches = re.findall(pattern, text_lower)
+        if matches:
+            detail[filler] = len(matches)
+    return {"total_count": sum(detail.values()), "detail": detail}
+
+
+def make_transcript(n_words: int, seed: int = 42) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(VOCAB) for _ in range(n_words))
+
+
+def main():
+    print(f"{'words':>7} {'legacy ms':>10} {'trie ms':>10} {'speedup':>8}  counts match")
+    for n_words in (100, 1_000, 10_000):
+        text = make_transcript(n_words)
+        runs = max(5, 20_000 // n_words)
+        legacy = min(timeit.repeat(lambda: legacy_detect_fillers(text), number=runs, repeat=3)) / runs
+        trie = min(timeit.repeat(lambda: detect_fillers(text), number=runs, repeat=3)) / runs
+        same = legacy_detect_fillers(text)["detail"] == detect_fillers(text)["detail"]
+        print(f"{n_words:>7} {legacy * 1000:>10.3f} {trie * 1000:>10.3f} {legacy / trie:>7.1f}x  {same}")
+
+    batch = [make_transcript(1_000, seed) for seed in range(100)]
+    t = min(timeit.repeat(lambda: detect_fillers_batch(batch), number=1, repeat=3))
+    print(f"batch of {len(batch)} x 1k words: {t * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark synthesis latency per character for each TTS backend.
+
+Usage: python scripts/bench_tts.py [--backends gtts espeak] [--runs 3]
+Backends that aren't installed are skipped. gtts needs network access.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.interviewer.prompts import OPENING_QUESTIONS, WRAP_UP_MESSAGE
+from services.interviewer.tts_backends import BACKENDS
+
+SENTENCES = [
+    "Great, thank you.",
+    "Could you walk me through how you handled that deadline?",
+    OPENING_QUESTIONS["technical"],
+    WRAP_UP_MESSAGE,
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=sorted(BACKENDS), choices=sorted(BACKENDS))
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'backend':>8} {'chars':>6} {'p50 ms':>8} {'ms/char':>8} {'bytes':>8}")
+    for name in args.backends:
+        backend = BACKENDS[name]()
+        if not backend.available():
+            print(f"{name:>8}  not available, skipped")
+            continue
+        try:
+            backend.synthesize("Warm up.")
+        except Exception as e:
+            print(f"{name:>8}  failed: {e}")
+            continue
+        per_char = []
+        for text in SENTENCES:
+            timings = []
+            size = 0
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                size = len(backend.synthesize(text))
+                timings.append(time.perf_counter() - started)
+            p50 = statistics.median(timings) * 1000
+            per_char.append(p50 / len(text))
+            print(f"{name:>8} {len(text):>6} {p50:>8.1f} {p50 / len(text):>8.2f} {size:>8}")
+        print(f"{name:>8}  mean {statistics.mean(per_char):.2f} ms/char ({backend.format})")
+
+
+if __name__ == "__main__":
+    main()
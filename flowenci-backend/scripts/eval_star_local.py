@@ -0,0 +1,91 @@
+"""
+Offline evaluation of the local STAR analyzer.
+
+Compares the local analyzer against the labelled samples in star_samples.json
+(and, with --gpt, against the GPT analyzer) and reports per-component
+agreement, how often the GPT call would be skipped, and latency.
+
+Usage: python scripts/eval_star_local.py [--gpt] [--samples path.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import get_settings
+from services.analysis.star_local import COMPONENTS, analyze_star_local
+
+settings = get_settings()
+
+
+def component_agreement(missing_a, missing_b) -> int:
+    """Number of STAR components (0-4) both sides classify the same way."""
+    a, b = set(missing_a), set(missing_b)
+    return sum((c in a) == (c in b) for c in COMPONENTS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", default=str(Path(__file__).parent / "star_samples.json"))
+    parser.add_argument("--gpt", action="store_true", help="also call the GPT analyzer (needs OPENAI_API_KEY)")
+    args = parser.parse_args()
+
+    with open(args.samples, "r", encoding="utf-8") as f:
+        samples = json.load(f)
+
+    threshold = settings.star_local_confidence_threshold
+    rows = []
+    for sample in samples:
+        started = time.perf_counter()
+        local = analyze_star_local(sample["text"])
+        local_ms = (time.perf_counter() - started) * 1000
+        row = {
+            "id": sample["id"],
+            "local": local,
+            "local_ms": local_ms,
+            "label_agree": component_agreement(local["missing"], sample["expected_missing"]),
+            "exact": set(local["missing"]) == set(sample["expected_missing"]),
+        }
+        if args.gpt:
+            from services.analysis.star_analyzer import analyze_star_gpt
+            started = time.perf_counter()
+            gpt = analyze_star_gpt(sample["text"])
+            row["gpt_ms"] = (time.perf_counter() - started) * 1000
+            row["gpt_agree"] = component_agreement(local["missing"], gpt.get("missing", []))
+            row["gpt_score_diff"] = abs(local["star_score"] - (gpt.get("star_score") or 0))
+        rows.append(row)
+
+    header = f"{'sample':<26} {'score':>5} {'conf':>5} {'gate':>5} {'label':>6} {'local ms':>9}"
+    if args.gpt:
+        header += f" {'gpt':>5} {'|d score|':>9} {'gpt ms':>8}"
+    print(header)
+    for r in rows:
+        gate = "local" if r["local"]["confidence"] >= threshold else "gpt"
+        line = (f"{r['id']:<26} {r['local']['star_score']:>5} {r['local']['confidence']:>5} "
+                f"{gate:>5} {r['label_agree']:>4}/4 {r['local_ms']:>9.2f}")
+        if args.gpt:
+            line += f" {r['gpt_agree']:>3}/4 {r['gpt_score_diff']:>9} {r['gpt_ms']:>8.0f}"
+        print(line)
+
+    n = len(rows)
+    skipped = sum(r["local"]["confidence"] >= threshold for r in rows)
+    confident = [r for r in rows if r["local"]["confidence"] >= threshold]
+    print()
+    print(f"Component agreement with labels: {sum(r['label_agree'] for r in rows) / (4 * n):.0%}")
+    print(f"Exact missing-set match:         {sum(r['exact'] for r in rows) / n:.0%}")
+    if confident:
+        print(f"  ... on samples gated locally:  {sum(r['exact'] for r in confident) / len(confident):.0%}")
+    print(f"GPT calls skipped at threshold {threshold}: {skipped}/{n}")
+    print(f"Mean local latency: {sum(r['local_ms'] for r in rows) / n:.2f} ms")
+    if args.gpt:
+        print(f"Component agreement with GPT:    {sum(r['gpt_agree'] for r in rows) / (4 * n):.0%}")
+        print(f"Mean GPT latency: {sum(r['gpt_ms'] for r in rows) / n:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 """
 Filler word detector.
-Uses regex to detect common English filler words.
+Compiles the filler lexicon into a token trie once and finds every single- and
+multi-word filler in one pass over the transcript.
 """
 import re
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
 
 FILLER_WORDS = [
     "um", "uh", "uhh", "umm", "like", "basically", "literally",
@@ -12,23 +14,106 @@ FILLER_WORDS = [
     "absolutely", "you see", "i think", "i feel like", "and stuff",
 ]
 
+# Extra fillers per locale, matched in the same pass as FILLER_WORDS.
+LOCALE_LEXICONS = {
+    "hinglish": [
+        "matlab", "na", "haan", "acha", "achha", "toh", "yaar",
+        "basically na", "kya bolte", "kya kehte hain",
+    ],
+}
 
-def detect_fillers(transcript: str) -> Dict:
+# Words are runs of word characters, keeping inner apostrophes ("don't").
+TOKEN_PATTERN = re.compile(r"\w+(?:'\w+)*")
+
+_END = object()
+
+
+def tokenize(text: str) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """Lowercase tokens plus their (start, end) character offsets in text."""
+    tokens, offsets = [], []
+    for m in TOKEN_PATTERN.finditer(text.lower()):
+        tokens.append(m.group())
+        offsets.append(m.span())
+    return tokens, offsets
+
+
+class FillerMatcher:
+    """Token trie over a filler lexicon. Build once, scan many transcripts."""
+
+    def __init__(self, lexicon: Iterable[str]):
+        self.root: Dict = {}
+        self.fillers: List[str] = []
+        for phrase in lexicon:
+            words = TOKEN_PATTERN.findall(phrase.lower())
+            if not words:
+                continue
+            key = " ".join(words)
+            node = self.root
+            for w in words:
+                node = node.setdefault(w, {})
+            if _END not in node:
+                node[_END] = key
+                self.fillers.append(key)
+
+    def scan(self, tokens: List[str], offsets: List[Tuple[int, int]]) -> Dict:
+        """
+        Find every filler starting at every token, including overlapping ones
+        ("so basically" also counts "basically"), in a single left-to-right pass.
+        """
+        detail: Dict[str, int] = {}
+        matches = []
+        root = self.root
+        n = len(tokens)
+        for i in range(n):
+            node = root.get(tokens[i])
+            j = i
+            while node is not None:
+                filler = node.get(_END)
+                if filler is not None:
+                    detail[filler] = detail.get(filler, 0) + 1
+                    matches.append({
+                        "filler": filler,
+                        "start": offsets[i][0],
+                        "end": offsets[j][1],
+                        "word_index": i,
+                        "word_count": j - i + 1,
+                    })
+                j += 1
+                if j >= n:
+                    break
+                node = node.get(tokens[j])
+
+        return {"total_count": sum(detail.values()), "detail": detail, "matches": matches}
+
+    def detect(self, transcript: str) -> Dict:
+        return self.scan(*tokenize(transcript))
+
+
+@lru_cache(maxsize=16)
+def get_matcher(locales: Tuple[str, ...] = ()) -> FillerMatcher:
+    """Compiled matcher for the base lexicon plus the given locale lexicons."""
+    lexicon = list(FILLER_WORDS)
+    for locale in locales:
+        lexicon.extend(LOCALE_LEXICONS.get(locale, []))
+    return FillerMatcher(lexicon)
+
+
+def detect_fillers(transcript, locales: Tuple[str, ...] = ()) -> Dict:
     """
-    Detect filler words in transcript text.
-    Returns total count and breakdown per filler word.
+    Detect filler words in transcript text or an AnalyzedTranscript.
+    Returns total count, breakdown per filler word, and per-match character
+    and word offsets.
     """
-    text_lower = transcript.lower()
-    detail = {}
+    matcher = get_matcher(tuple(locales))
+    if isinstance(transcript, str):
+        return matcher.detect(transcript)
+    return matcher.scan(transcript.tokens, transcript.offsets)
 
-    for filler in FILLER_WORDS:
-        pattern = r'\b' + re.escape(filler) + r'\b'
-        matches = re.findall(pattern, text_lower)
-        if matches:
-            detail[filler] = len(matches)
 
-    total = sum(detail.values())
-    return {"total_count": total, "detail": detail}
+def detect_fillers_batch(transcripts: List[str], locales: Tuple[str, ...] = ()) -> List[Dict]:
+    """Score a list of transcripts with one shared compiled matcher."""
+    matcher = get_matcher(tuple(locales))
+    return [matcher.detect(t) for t in transcripts]
 
 
 def filler_rate_per_minute(filler_count: int, duration_seconds: float) -> float:
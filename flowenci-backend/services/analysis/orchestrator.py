@@ -1,78 +1,172 @@
 """
 Main analysis orchestrator.
-Calls all sub-analyzers and assembles the full feedback object.
+Wires all sub-analyzers into a stage graph and assembles the full feedback
+object. Stages run as soon as their inputs are ready, so the STAR call and the
+local metrics overlap, and coaching doesn't wait for confidence scoring.
+The LLM stages run against a latency budget and fall back to the local
+engines; the result lists them under "degraded".
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from config import get_settings
+
 from services.transcription import transcribe_audio
+from services.analysis.transcript import from_transcription
 from services.analysis.filler_detector import detect_fillers
-from services.analysis.pace_analyzer import calculate_wpm, evaluate_pace, detect_pauses
+from services.analysis.pace_analyzer import calculate_wpm
+from services.analysis.timing import timing_profile_batch
 from services.analysis.star_analyzer import analyze_star
 from services.analysis.confidence_scorer import score_confidence
+from services.analysis.pipeline import Stage, run_stages
 from services.coaching.tip_mapper import generate_coaching_tips
 
+settings = get_settings()
 
-def run_full_analysis(
-    audio_path: str,
-    use_star: bool = False,
-    question_text: str = "",
-) -> dict:
-    # 1. Transcription
-    transcription = transcribe_audio(audio_path)
-    transcript = transcription["text"]
-    duration = transcription.get("duration") or 0
-    words = transcription.get("words", [])
-
-    # 2. Filler detection
-    filler_result = detect_fillers(transcript)
-    filler_count = filler_result["total_count"]
-    filler_detail = filler_result["detail"]
-
-    # 3. Pace analysis
-    wpm = calculate_wpm(transcript, duration)
-    pace_eval = evaluate_pace(wpm)
-    pauses = detect_pauses(words, pause_threshold=2.0)
-    pause_count = len(pauses)
-    total_words = len(transcript.split())
-
-    # 4. STAR analysis
-    star_result = analyze_star(transcript, use_star=use_star)
-    star_score = star_result.get("star_score")
-    star_breakdown = star_result.get("breakdown", {})
-    star_missing = star_result.get("missing", [])
-
-    # 5. Confidence + readiness score
-    conf_result = score_confidence(
+
+def _transcribe(audio_path):
+    return {"transcription": transcribe_audio(audio_path)}
+
+
+def _tokenize(transcription):
+    analyzed = from_transcription(transcription)
+    return {"analyzed": analyzed, "duration": analyzed.duration}
+
+
+def _fillers(analyzed):
+    result = detect_fillers(analyzed)
+    return {"filler_count": result["total_count"], "filler_detail": result["detail"]}
+
+
+def _pace(analyzed, duration):
+    timing = timing_profile_batch(
+        [(analyzed.word_starts, analyzed.word_ends)], [duration], pause_threshold=2.0
+    )[0]
+    return {
+        "wpm": calculate_wpm(analyzed, duration),
+        "pause_count": timing["pause_count"],
+        "total_words": analyzed.word_count,
+        "timing": timing,
+    }
+
+
+def _star(analyzed, use_star, allow_gpt=True):
+    result = analyze_star(analyzed, use_star=use_star, allow_gpt=allow_gpt)
+    return {
+        "star_score": result.get("star_score"),
+        "star_breakdown": result.get("breakdown", {}),
+        "star_missing": result.get("missing", []),
+    }
+
+
+def _star_local(analyzed, use_star):
+    return _star(analyzed, use_star, allow_gpt=False)
+
+
+def _confidence(filler_count, duration, pause_count, wpm, star_score):
+    return {"confidence": score_confidence(
         filler_count=filler_count,
         duration_seconds=duration,
         pause_count=pause_count,
         wpm=wpm,
         star_score=star_score,
-    )
+    )}
 
-    # 6. Coaching tips
-    coaching_tips = generate_coaching_tips(
+
+def _coaching(filler_count, filler_detail, wpm, pause_count, star_breakdown, star_missing, duration,
+              allow_gpt=True):
+    return {"coaching_tips": generate_coaching_tips(
         filler_count=filler_count,
         filler_detail=filler_detail,
         wpm=wpm,
         pause_count=pause_count,
         star_breakdown=star_breakdown,
         star_missing=star_missing,
-        confidence_flags=conf_result["flags"],
         duration_seconds=duration,
+        allow_gpt=allow_gpt,
+    )}
+
+
+def _coaching_local(**kwargs):
+    return _coaching(**kwargs, allow_gpt=False)
+
+
+ANALYSIS_STAGES = [
+    Stage("transcribe", _transcribe, ("audio_path",), ("transcription",), blocking=True),
+    Stage("tokenize", _tokenize, ("transcription",), ("analyzed", "duration")),
+    Stage("fillers", _fillers, ("analyzed",), ("filler_count", "filler_detail")),
+    Stage("pace", _pace, ("analyzed", "duration"), ("wpm", "pause_count", "total_words", "timing")),
+    Stage(
+        "star", _star, ("analyzed", "use_star"), ("star_score", "star_breakdown", "star_missing"),
+        blocking=True, deadline=settings.analysis_star_deadline, fallback=_star_local,
+    ),
+    Stage("confidence", _confidence, ("filler_count", "duration", "pause_count", "wpm", "star_score"), ("confidence",)),
+    Stage(
+        "coaching", _coaching,
+        ("filler_count", "filler_detail", "wpm", "pause_count", "star_breakdown", "star_missing", "duration"),
+        ("coaching_tips",),
+        blocking=True, deadline=settings.analysis_coaching_deadline, fallback=_coaching_local,
+    ),
+]
+
+
+async def run_full_analysis_async(
+    audio_path: str,
+    use_star: bool = False,
+    question_text: str = "",
+) -> dict:
+    v, stage_timings, degraded = await run_stages(
+        ANALYSIS_STAGES,
+        {"audio_path": audio_path, "use_star": use_star, "question_text": question_text},
+        budget=settings.analysis_budget_seconds,
     )
+    timing = v["timing"]
+    conf_result = v["confidence"]
 
     return {
-        "transcript": transcript,
-        "duration_seconds": duration,
-        "filler_word_count": filler_count,
-        "filler_words_detail": filler_detail,
-        "words_per_minute": wpm,
-        "total_word_count": total_words,
-        "pause_count": pause_count,
-        "star_score": star_score,
-        "star_breakdown": star_breakdown,
+        "transcript": v["analyzed"].text,
+        "duration_seconds": v["duration"],
+        "filler_word_count": v["filler_count"],
+        "filler_words_detail": v["filler_detail"],
+        "words_per_minute": v["wpm"],
+        "total_word_count": v["total_words"],
+        "pause_count": v["pause_count"],
+        "pace_timeline": {
+            "longest_pause": timing["longest_pause"],
+            "mean_gap": timing["mean_gap"],
+            "pause_histogram": timing["pause_histogram"],
+            "wpm_curve": timing["wpm_curve"],
+        },
+        "star_score": v["star_score"],
+        "star_breakdown": v["star_breakdown"],
         "pronunciation_issues": [],
         "confidence_score": conf_result["confidence_score"],
         "confidence_flags": conf_result["flags"],
         "readiness_score": conf_result["readiness_score"],
-        "coaching_tips": coaching_tips,
+        "coaching_tips": v["coaching_tips"],
+        "stage_timings": stage_timings,
+        "degraded": degraded,
     }
+
+
+def run_full_analysis(
+    audio_path: str,
+    use_star: bool = False,
+    question_text: str = "",
+) -> dict:
+    """
+    Synchronous entry point for background tasks running outside an event loop.
+    Not asyncio.run: that waits for the default executor on the way out, so a
+    stage that missed its deadline would still hold the job until its call
+    finished. Here the executor is let go without waiting; the late call ends
+    in its thread and its result is dropped.
+    """
+    loop = asyncio.new_event_loop()
+    executor = ThreadPoolExecutor(thread_name_prefix="analysis")
+    loop.set_default_executor(executor)
+    try:
+        return loop.run_until_complete(run_full_analysis_async(audio_path, use_star, question_text))
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        executor.shutdown(wait=False)
+        loop.close()
@@ -3,12 +3,19 @@ Pace analyzer: words per minute, pace evaluation, and pause detection.
 """
 from typing import List, Dict
 
+import numpy as np
 
-def calculate_wpm(transcript: str, duration_seconds: float) -> float:
-    """Calculate words per minute."""
+from services.analysis.timing import word_arrays, word_gaps
+
+
+def calculate_wpm(transcript, duration_seconds: float) -> float:
+    """Calculate words per minute from text or an AnalyzedTranscript."""
     if duration_seconds <= 0:
         return 0.0
-    word_count = len(transcript.split())
+    if isinstance(transcript, str):
+        word_count = len(transcript.split())
+    else:
+        word_count = transcript.word_count
     return round((word_count / duration_seconds) * 60, 1)
 
 
@@ -26,19 +33,19 @@ def evaluate_pace(wpm: float) -> str:
         return "very_fast"
 
 
-def detect_pauses(words: List[Dict], pause_threshold: float = 2.0) -> List[Dict]:
+def detect_pauses(words, pause_threshold: float = 2.0) -> List[Dict]:
     """
     Detect significant pauses between words using word-level timestamps.
+    Accepts the Whisper word list or an AnalyzedTranscript.
     Returns list of pauses with duration info.
     """
-    pauses = []
-    for i in range(1, len(words)):
-        prev_end = words[i - 1].get("end", 0)
-        curr_start = words[i].get("start", 0)
-        gap = curr_start - prev_end
-        if gap >= pause_threshold:
-            pauses.append({
-                "before_word": words[i].get("word", ""),
-                "duration": round(gap, 2),
-            })
-    return pauses
+    if isinstance(words, list):
+        starts, ends = word_arrays(words)
+    else:
+        starts, ends, words = words.word_starts, words.word_ends, words.words
+
+    gaps = word_gaps(starts, ends)
+    return [
+        {"before_word": words[i + 1].get("word", ""), "duration": round(float(gaps[i]), 2)}
+        for i in np.flatnonzero(gaps >= pause_threshold)
+    ]
@@ -0,0 +1,118 @@
+"""
+Async stage graph for the analysis pipeline.
+Each stage declares the values it reads and writes; a stage starts as soon as
+all of its inputs exist, so independent stages run concurrently.
+A stage with a fallback may also have a deadline: if it misses the deadline
+(or the remaining analysis budget) or fails, the fallback's result is used and
+the stage is reported as degraded.
+"""
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[..., Any]          # called with inputs as kwargs, returns {output: value}
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    blocking: bool = False          # sync network / disk work: run in a worker thread
+    deadline: Optional[float] = None    # seconds; only enforced when there is a fallback
+    fallback: Optional[Callable[..., Any]] = None   # cheap local replacement, same inputs and outputs
+
+
+async def _call(fn: Callable[..., Any], args: Dict[str, Any], blocking: bool):
+    if blocking:
+        return await asyncio.to_thread(fn, **args)
+    result = fn(**args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def _check_graph(stages: List[Stage], initial: Dict[str, Any]):
+    produced = set(initial)
+    for stage in stages:
+        for key in stage.outputs:
+            if key in produced:
+                raise ValueError(f"Value '{key}' is produced more than once")
+            produced.add(key)
+    for stage in stages:
+        missing = [k for k in stage.inputs if k not in produced]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' needs {missing}, which no stage produces")
+
+
+async def run_stages(
+    stages: List[Stage],
+    initial: Dict[str, Any],
+    budget: Optional[float] = None,
+) -> Tuple[Dict[str, Any], Dict[str, float], List[str]]:
+    """
+    Run the stage graph. Returns all produced values, each stage's wall time
+    in milliseconds, and the names of stages that fell back.
+
+    budget caps the whole run in seconds: a stage with a fallback gets at most
+    the time left in the budget, even if its own deadline is longer. Stages
+    without a fallback are never cut short. The first stage error is
+    re-raised once every stage has settled.
+    """
+    _check_graph(stages, initial)
+    loop = asyncio.get_running_loop()
+    budget_ends = loop.time() + budget if budget is not None else None
+    values: Dict[str, asyncio.Future] = {}
+    for key, value in initial.items():
+        values[key] = loop.create_future()
+        values[key].set_result(value)
+    for stage in stages:
+        for key in stage.outputs:
+            values[key] = loop.create_future()
+
+    timings: Dict[str, float] = {}
+    degraded: List[str] = []
+
+    def time_allowed(stage: Stage) -> Optional[float]:
+        if stage.fallback is None:
+            return None
+        limits = [stage.deadline] if stage.deadline is not None else []
+        if budget_ends is not None:
+            limits.append(budget_ends - loop.time())
+        return max(0.0, min(limits)) if limits else None
+
+    async def run(stage: Stage):
+        try:
+            args = {k: await values[k] for k in stage.inputs}
+            started = time.perf_counter()
+            timeout = time_allowed(stage)
+            try:
+                # A timed-out blocking call keeps running in its thread until
+                # the SDK timeout; only its result is thrown away.
+                result = await asyncio.wait_for(_call(stage.fn, args, stage.blocking), timeout)
+            except Exception as e:
+                if stage.fallback is None:
+                    raise
+                reason = "deadline of %.1fs missed" % timeout if isinstance(e, asyncio.TimeoutError) else repr(e)
+                print(f"[Pipeline] Stage '{stage.name}' degraded to local fallback: {reason}")
+                degraded.append(stage.name)
+                result = await _call(stage.fallback, args, stage.blocking)
+            timings[stage.name] = round((time.perf_counter() - started) * 1000, 1)
+            outputs = {key: result[key] for key in stage.outputs}
+        except BaseException as e:
+            for key in stage.outputs:
+                values[key].set_exception(e)
+            raise
+        for key, value in outputs.items():
+            values[key].set_result(value)
+
+    results = await asyncio.gather(*(run(s) for s in stages), return_exceptions=True)
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        for f in values.values():
+            f.exception()  # mark as retrieved so asyncio doesn't warn about them
+        # Dependents fail with the same error; surface the original one
+        raise errors[0]
+
+    return {k: f.result() for k, f in values.items()}, timings, degraded
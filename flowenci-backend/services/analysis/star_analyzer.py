@@ -1,12 +1,20 @@
 """
-STAR structure analyzer using GPT-4o-mini.
+STAR structure analyzer.
+A local rule-based pass runs first; GPT-4o-mini is only called when the local
+result is not confident enough.
 """
 import json
 from typing import Optional
 from config import get_settings
+from services.openai_clients import get_openai_clients
+from services.analysis.star_local import analyze_star_local
 
 settings = get_settings()
 
+# Reading "missing" back from a stored breakdown: GPT scores weak components
+# anywhere in 0-25, the local scorer only 0 (missing) or 17 and up.
+WEAK_BELOW = 10
+
 STAR_PROMPT = """You are evaluating whether a job interview answer follows the STAR structure 
 (Situation, Task, Action, Result).
 
@@ -28,29 +36,41 @@ Return ONLY valid JSON:
 }}"""
 
 
-def analyze_star(transcript: str, use_star: bool = True) -> dict:
+def analyze_star(transcript, use_star: bool = True, force_gpt: bool = False, allow_gpt: bool = True) -> dict:
     """
-    Analyze STAR structure in transcript.
+    Analyze STAR structure in transcript text or an AnalyzedTranscript.
     If use_star is False, returns None scores (not a behavioral question).
+    allow_gpt=False always returns the local result. GPT errors are raised;
+    the analysis pipeline falls back to the local result for them.
     """
-    if not use_star or len(transcript.split()) < 20:
-        return {"star_score": None, "breakdown": {}, "missing": []}
+    if isinstance(transcript, str):
+        word_count = len(transcript.split())
+    else:
+        word_count, transcript = transcript.word_count, transcript.text
 
-    try:
-        from openai import OpenAI
-        client = OpenAI(api_key=settings.openai_api_key)
-
-        response = client.chat.completions.create(
-            model=settings.openai_model,
-            messages=[
-                {"role": "user", "content": STAR_PROMPT.format(transcript=transcript[:2000])}
-            ],
-            temperature=0.2,
-            max_tokens=400,
-        )
-        raw = response.choices[0].message.content.strip()
-        clean = raw.replace("```json", "").replace("```", "").strip()
-        return json.loads(clean)
-    except Exception as e:
-        print(f"[STAR] Analysis error: {e}")
+    if not use_star or word_count < 20:
         return {"star_score": None, "breakdown": {}, "missing": []}
+
+    local = analyze_star_local(transcript)
+    if not allow_gpt or (not force_gpt and local["confidence"] >= settings.star_local_confidence_threshold):
+        return local
+
+    result = analyze_star_gpt(transcript)
+    result["source"] = "gpt"
+    return result
+
+
+def analyze_star_gpt(transcript: str) -> dict:
+    client = get_openai_clients().sync_for("star")
+
+    response = client.chat.completions.create(
+        model=settings.openai_model,
+        messages=[
+            {"role": "user", "content": STAR_PROMPT.format(transcript=transcript[:2000])}
+        ],
+        temperature=0.2,
+        max_tokens=400,
+    )
+    raw = response.choices[0].message.content.strip()
+    clean = raw.replace("```json", "").replace("```", "").strip()
+    return json.loads(clean)
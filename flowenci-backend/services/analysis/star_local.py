@@ -0,0 +1,103 @@
+"""
+Local rule-based STAR analyzer.
+Scores Situation / Task / Action / Result from cue phrases, first-person
+past-tense verbs and numbers, in the same shape as the GPT analyzer, plus a
+confidence value used to decide whether the GPT call is still needed.
+"""
+import re
+from typing import Dict, List
+
+COMPONENTS = ("situation", "task", "action", "result")
+
+CUES = {
+    "situation": [
+        "the situation was", "back in", "when i was", "during my", "at my previous",
+        "in my internship", "in my last", "in my final year", "last year", "in college",
+        "we were facing", "there was a", "the context", "our team was", "i was working",
+        "we were working", "at the time", "once when", "in my previous",
+    ],
+    "task": [
+        "my task", "my role", "i was responsible", "i was asked", "i needed to",
+        "i had to", "the goal was", "my responsibility", "the challenge was",
+        "we needed to", "the objective", "i was assigned", "my job was", "i was in charge",
+        "the problem was", "our goal",
+    ],
+    "action": [
+        "so i", "first i", "then i", "i decided", "i took", "i started", "i set up",
+        "i reached out", "i worked with", "i spoke", "i talked", "i proposed",
+        "i organized", "i led", "i broke", "i made sure", "next i", "after that i",
+    ],
+    "result": [
+        "as a result", "resulted in", "in the end", "finally", "we achieved",
+        "the outcome", "which led to", "i learned", "we delivered", "it helped",
+        "was successful", "we won", "got selected", "was appreciated", "on time",
+    ],
+}
+
+RESULT_VERBS = ("reduced", "increased", "improved", "saved", "cut", "grew", "boosted", "doubled")
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_FIRST_PERSON_PAST = re.compile(r"\b(?:i|we)\s+(?:\w+ly\s+)?(\w+ed|built|wrote|led|made|took|ran|set|found|spoke|taught|brought)\b")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\s*(?:%|percent|x\b|times\b|hours\b|days\b|weeks\b|users\b|lakh|crore|k\b)?")
+
+
+def _count_cues(text: str, cues: List[str]) -> int:
+    return sum(text.count(c) for c in cues)
+
+
+def analyze_star_local(transcript: str) -> Dict:
+    text = " " + re.sub(r"\s+", " ", transcript.lower()) + " "
+    sentences = [s for s in _SENTENCE_SPLIT.split(text.strip()) if s]
+    n = max(len(sentences), 1)
+    first_third = " ".join(sentences[: max(1, n // 3)])
+    last_third = " ".join(sentences[-max(1, n // 3):])
+
+    hits = {c: _count_cues(text, CUES[c]) for c in COMPONENTS}
+
+    # Actions: first-person past-tense verbs anywhere in the answer
+    hits["action"] += len(_FIRST_PERSON_PAST.findall(text)) // 2
+
+    # Results: measurable outcomes, weighted towards the end of the answer
+    numbers_late = len(_NUMBER.findall(last_third))
+    hits["result"] += numbers_late + sum(last_third.count(v) for v in RESULT_VERBS)
+
+    # Setting the scene usually happens early
+    hits["situation"] += _count_cues(first_third, CUES["situation"])
+
+    # A component with no cue scores 0 and is missing; one cue is already
+    # worth 17, so there is no separate "weak" level.
+    breakdown = {}
+    for c in COMPONENTS:
+        h = hits[c]
+        breakdown[c] = 0 if h == 0 else min(25, 13 + 4 * h)
+
+    missing = [c for c in COMPONENTS if hits[c] == 0]
+    star_score = sum(breakdown.values())
+
+    # Confidence: each component is clear-cut when it has several cues or
+    # none at all in a long enough answer; single weak hits are ambiguous.
+    words = len(text.split())
+    clarity = []
+    for c in COMPONENTS:
+        h = hits[c]
+        if h >= 2:
+            clarity.append(1.0)
+        elif h == 0:
+            clarity.append(0.9 if words >= 80 else 0.6)
+        else:
+            clarity.append(0.5)
+    confidence = round(sum(clarity) / len(clarity) * min(1.0, words / 60), 2)
+
+    if missing:
+        notes = "Missing: " + ", ".join(missing) + "."
+    else:
+        notes = "All four STAR components are present."
+
+    return {
+        "star_score": star_score,
+        "breakdown": breakdown,
+        "missing": missing,
+        "notes": notes,
+        "confidence": confidence,
+        "source": "local",
+    }
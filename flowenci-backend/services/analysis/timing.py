@@ -0,0 +1,121 @@
+"""
+Timing engine: vectorized pause and speaking-rate analysis from Whisper
+word timestamps. Works on one recording or a batch of recordings at once.
+"""
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Upper edges (seconds) of the pause-length histogram buckets; the last
+# bucket is open-ended.
+PAUSE_BIN_EDGES = (0.5, 1.0, 2.0, 3.0, 5.0)
+
+
+def word_arrays(words: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """Unpack a Whisper word list into start and end time arrays."""
+    starts = np.fromiter((w.get("start", 0) or 0 for w in words), dtype=np.float64, count=len(words))
+    ends = np.fromiter((w.get("end", 0) or 0 for w in words), dtype=np.float64, count=len(words))
+    return starts, ends
+
+
+def word_gaps(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Silence before each word after the first (len(starts) - 1 values)."""
+    if len(starts) < 2:
+        return np.empty(0)
+    return np.clip(starts[1:] - ends[:-1], 0, None)
+
+
+def wpm_curve(starts: np.ndarray, window: float = 10.0, step: float = 5.0, duration: float = 0) -> List[Dict]:
+    """
+    Sliding-window speaking rate. Each point counts the words starting inside
+    [t, t + window) and scales to words per minute.
+    """
+    if len(starts) == 0:
+        return []
+    total = max(float(duration or 0), float(starts[-1]))
+    window_starts = np.arange(0, max(total - window, 0) + step, step)
+    counts = (
+        np.searchsorted(starts, window_starts + window, side="left")
+        - np.searchsorted(starts, window_starts, side="left")
+    )
+    # The final window can run past the end of the answer
+    span = np.clip(np.minimum(window, total - window_starts), 1.0, None)
+    wpm = counts * 60.0 / span
+    return [{"t": round(float(t), 1), "wpm": round(float(v), 1)} for t, v in zip(window_starts, wpm)]
+
+
+def _histogram_labels(edges: Sequence[float]) -> List[str]:
+    lows = (0, *edges)
+    labels = [f"{lo:g}-{hi:g}s" for lo, hi in zip(lows, edges)]
+    labels.append(f"{edges[-1]:g}s+")
+    return labels
+
+
+def timing_profile_batch(
+    arrays: List[Tuple[np.ndarray, np.ndarray]],
+    durations: Sequence[float] = (),
+    pause_threshold: float = 2.0,
+    window: float = 10.0,
+    step: float = 5.0,
+    bin_edges: Sequence[float] = PAUSE_BIN_EDGES,
+) -> List[Dict]:
+    """
+    Timing profile for a batch of (starts, ends) arrays. All timings are packed
+    into one array so gaps, pause counts, longest pauses and histograms are
+    computed with a handful of vectorized operations for the whole batch.
+    """
+    n = len(arrays)
+    if n == 0:
+        return []
+
+    lengths = np.fromiter((len(s) for s, _ in arrays), dtype=np.int64, count=n)
+    total_words = int(lengths.sum())
+    starts = np.concatenate([s for s, _ in arrays]) if total_words else np.empty(0)
+    ends = np.concatenate([e for _, e in arrays]) if total_words else np.empty(0)
+    bounds = np.concatenate(([0], np.cumsum(lengths)))
+
+    # Gap i is the silence before word i + 1; drop gaps that span two recordings
+    gaps = word_gaps(starts, ends)
+    gap_owner = np.repeat(np.arange(n), lengths)[1:]
+    same = np.ones(len(gaps), dtype=bool)
+    inner = bounds[1:-1]
+    same[inner[(inner > 0) & (inner < total_words)] - 1] = False
+    gaps, gap_owner = gaps[same], gap_owner[same]
+
+    is_pause = gaps >= pause_threshold
+    pause_counts = np.bincount(gap_owner[is_pause], minlength=n)
+    gap_counts = np.bincount(gap_owner, minlength=n)
+    gap_sums = np.bincount(gap_owner, weights=gaps, minlength=n)
+    longest = np.zeros(n)
+    np.maximum.at(longest, gap_owner, gaps)
+
+    n_bins = len(bin_edges) + 1
+    bin_idx = np.searchsorted(np.asarray(bin_edges), gaps, side="right")
+    hist = np.bincount(gap_owner * n_bins + bin_idx, minlength=n * n_bins).reshape(n, n_bins)
+    labels = _histogram_labels(bin_edges)
+
+    results = []
+    for i in range(n):
+        lo, hi = bounds[i], bounds[i + 1]
+        duration = durations[i] if i < len(durations) else 0
+        results.append({
+            "word_count": int(lengths[i]),
+            "pause_count": int(pause_counts[i]),
+            "longest_pause": round(float(longest[i]), 2),
+            "mean_gap": round(float(gap_sums[i] / gap_counts[i]), 2) if gap_counts[i] else 0.0,
+            "pause_histogram": [
+                {"range": label, "count": int(c)} for label, c in zip(labels, hist[i])
+            ],
+            "wpm_curve": wpm_curve(starts[lo:hi], window=window, step=step, duration=duration),
+        })
+    return results
+
+
+def analyze_timing_batch(recordings: List[List[Dict]], durations: Sequence[float] = (), **kwargs) -> List[Dict]:
+    """Timing profiles for a batch of Whisper word lists (e.g. bulk re-analysis)."""
+    return timing_profile_batch([word_arrays(ws) for ws in recordings], durations, **kwargs)
+
+
+def analyze_timing(words: List[Dict], duration: float = 0, **kwargs) -> Dict:
+    """Timing profile for a single recording."""
+    return analyze_timing_batch([words], [duration], **kwargs)[0]
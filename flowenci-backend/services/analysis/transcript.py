@@ -0,0 +1,57 @@
+"""
+Analyzed transcript — one tokenization pass shared by every analyzer.
+Built once from the Whisper result so filler, pace, word-count and STAR
+stages all see the same token boundaries.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.analysis.filler_detector import tokenize
+from services.analysis.timing import word_arrays
+
+
+@dataclass
+class AnalyzedTranscript:
+    text: str
+    duration: float
+    tokens: List[str]                     # lowercased, normalized words
+    offsets: List[Tuple[int, int]]        # (start, end) char offsets into text
+    words: List[Dict] = field(default_factory=list)   # Whisper word timestamps
+    word_starts: np.ndarray = field(default_factory=lambda: np.empty(0))
+    word_ends: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+
+def build_transcript(
+    text: str,
+    duration: Optional[float] = 0,
+    words: Optional[List[Dict]] = None,
+) -> AnalyzedTranscript:
+    """Tokenize the Whisper text once and unpack word timings into arrays."""
+    text = text or ""
+    words = words or []
+    tokens, offsets = tokenize(text)
+    word_starts, word_ends = word_arrays(words)
+    return AnalyzedTranscript(
+        text=text,
+        duration=duration or 0,
+        tokens=tokens,
+        offsets=offsets,
+        words=words,
+        word_starts=word_starts,
+        word_ends=word_ends,
+    )
+
+
+def from_transcription(transcription: dict) -> AnalyzedTranscript:
+    """Build from the dict returned by services.transcription.transcribe_audio."""
+    return build_transcript(
+        transcription["text"],
+        transcription.get("duration"),
+        transcription.get("words"),
+    )
@@ -0,0 +1,158 @@
+"""
+Coaching tip cache.
+Tips are keyed on a canonical, bucketed form of the issue list (filler count
+bands, WPM bands, missing STAR components, ...) so recordings with similar
+issues share one GPT response. GPT is only shown placeholders and bands, never
+the exact numbers, so its reply is a template that holds for the whole bucket
+and is filled in with each recording's numbers.
+"""
+import hashlib
+import json
+from bisect import bisect_right
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, List, Optional
+
+from config import get_settings
+from utils.cache import DiskCache, LRUCache, TieredCache, resolve_data_path
+
+settings = get_settings()
+
+KEY_VERSION = "v2"
+
+FILLER_BANDS = (8, 11, 16, 26)
+WPM_BANDS = (90, 100, 110, 160, 170, 180, 190)
+PAUSE_BANDS = (4, 6, 10)
+DURATION_BANDS = (20, 30)
+
+
+@lru_cache()
+def get_tip_cache() -> TieredCache:
+    ttl = settings.coaching_cache_ttl_hours * 3600
+    return TieredCache(
+        LRUCache(max_items=settings.coaching_cache_max_items, ttl=ttl),
+        DiskCache(
+            resolve_data_path(settings.coaching_cache_path),
+            max_bytes=settings.coaching_cache_max_mb * 1024 * 1024,
+            ttl=ttl,
+            shared_counters=True,   # coaching runs in the worker; the API reports these
+        ),
+        dumps=lambda tips: json.dumps(tips).encode("utf-8"),
+        loads=json.loads,
+    )
+
+
+def issues_cache_key(issues: List[Dict]) -> str:
+    """Canonical key: issue types and severities with their values bucketed."""
+    parts = []
+    for issue in issues:
+        data = issue.get("data", {})
+        kind = issue["type"]
+        if kind == "filler_words":
+            bucket = [bisect_right(FILLER_BANDS, data["total"]), data["top_filler"]]
+        elif kind == "pace":
+            bucket = [bisect_right(WPM_BANDS, data["wpm"])]
+        elif kind == "pauses":
+            bucket = [bisect_right(PAUSE_BANDS, data["pause_count"])]
+        elif kind == "star_structure":
+            bucket = sorted(data["missing_components"])
+        elif kind == "too_short":
+            bucket = [bisect_right(DURATION_BANDS, data["duration_seconds"])]
+        else:
+            bucket = [json.dumps(data, sort_keys=True)]
+        parts.append([kind, issue.get("severity"), bucket])
+    digest = hashlib.sha256(json.dumps(sorted(parts)).encode("utf-8")).hexdigest()[:32]
+    return f"{KEY_VERSION}:{digest}"
+
+
+def _band(bands, value) -> str:
+    """The band a value falls in, as text, e.g. "11-15" or "26 or more"."""
+    i = bisect_right(bands, value)
+    if i == 0:
+        return f"below {bands[0]}"
+    if i == len(bands):
+        return f"{bands[-1]} or more"
+    return f"{bands[i - 1]}-{bands[i] - 1}"
+
+
+def template_values(issues: List[Dict]) -> Dict[str, str]:
+    """This recording's numbers, by the placeholder name the tips use for them."""
+    values = {}
+    for issue in issues:
+        data = issue.get("data", {})
+        if issue["type"] == "filler_words":
+            values["filler_total"] = str(data["total"])
+            values["filler_rate"] = str(data["rate_per_minute"])
+        elif issue["type"] == "pace":
+            values["wpm"] = str(round(data["wpm"]))
+        elif issue["type"] == "pauses":
+            values["pause_count"] = str(data["pause_count"])
+        elif issue["type"] == "too_short":
+            values["duration"] = str(round(data["duration_seconds"]))
+    return values
+
+
+def prompt_issues(issues: List[Dict]) -> List[Dict]:
+    """
+    The issues as GPT sees them: exact numbers are replaced with placeholders
+    and the band used in the cache key, so the reply can't quote or derive
+    anything from one recording's numbers and holds for the whole bucket.
+    """
+    out = []
+    for issue in issues:
+        data = dict(issue.get("data", {}))
+        kind = issue["type"]
+        if kind == "filler_words":
+            data.update(total="{filler_total}", rate_per_minute="{filler_rate}",
+                        total_range=_band(FILLER_BANDS, data["total"]))
+        elif kind == "pace":
+            data.update(wpm="{wpm}", wpm_range=_band(WPM_BANDS, data["wpm"]))
+        elif kind == "pauses":
+            data.update(pause_count="{pause_count}", pause_count_range=_band(PAUSE_BANDS, data["pause_count"]))
+        elif kind == "too_short":
+            data.update(duration_seconds="{duration}", duration_range=_band(DURATION_BANDS, data["duration_seconds"]))
+        out.append({**issue, "data": data})
+    return out
+
+
+def _map_strings(obj, fn):
+    if isinstance(obj, str):
+        return fn(obj)
+    if isinstance(obj, list):
+        return [_map_strings(v, fn) for v in obj]
+    if isinstance(obj, dict):
+        return {k: _map_strings(v, fn) for k, v in obj.items()}
+    return obj
+
+
+def _fields(text: str) -> Optional[List[str]]:
+    try:
+        return [name for _, name, _, _ in Formatter().parse(text) if name is not None]
+    except ValueError:
+        return None
+
+
+def to_template(tips: list, values: Dict[str, str]) -> Optional[list]:
+    """
+    The GPT reply as a reusable template, or None when it can't be reused:
+    a placeholder it doesn't know, stray braces, or a placeholder for an issue
+    this recording doesn't have.
+    """
+    ok = True
+
+    def check(text: str) -> str:
+        nonlocal ok
+        fields = _fields(text)
+        if fields is None or any(name not in values for name in fields):
+            ok = False
+        return text
+
+    _map_strings(tips, check)
+    return tips if ok else None
+
+
+def render(template: list, values: Dict[str, str]) -> Optional[list]:
+    try:
+        return _map_strings(template, lambda text: text.format_map(values))
+    except (KeyError, ValueError, IndexError):
+        return None
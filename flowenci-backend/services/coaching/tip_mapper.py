@@ -2,8 +2,12 @@
 Coaching tip mapper using GPT-4o-mini.
 """
 import json
-import openai
+from typing import Optional
 from config import get_settings
+from services.openai_clients import get_openai_clients
+from services.coaching.tip_cache import (
+    get_tip_cache, issues_cache_key, template_values, prompt_issues, to_template, render,
+)
 
 settings = get_settings()
 
@@ -13,7 +17,7 @@ speak confidently in English job interviews. You give specific, actionable, non-
 For each issue, respond with exactly this JSON structure:
 {
   "metric": "Short metric name (e.g. Filler Words)",
-  "value": "What was measured (e.g. You said 'um' 12 times)",
+  "value": "What was measured (e.g. You said 'um' {filler_total} times)",
   "why_it_matters": "1-2 sentences on interviewer impact",
   "root_cause": "1 sentence on why this typically happens",
   "technique": "Exact 2-3 step technique to fix it",
@@ -28,12 +32,20 @@ def generate_coaching_tips(
     pause_count: int,
     star_breakdown: dict,
     star_missing: list,
-    confidence_flags: list,
     duration_seconds: float,
+    confidence_flags: Optional[list] = None,
+    allow_gpt: bool = True,
 ) -> list:
+    """
+    Top coaching tips for a recording. Cached tips are used first; then GPT,
+    whose errors are raised so the analysis pipeline can fall back. With
+    allow_gpt=False the tips come from the local rules in _fallback_tips.
+    """
+    # confidence_flags is accepted for compatibility but does not affect the
+    # issues, so the pipeline can start coaching before confidence scoring.
     issues = _build_issues_summary(
         filler_count, filler_detail, wpm, pause_count,
-        star_breakdown, star_missing, confidence_flags, duration_seconds
+        star_breakdown, star_missing, confidence_flags or [], duration_seconds
     )
 
     if not issues:
@@ -46,33 +58,52 @@ def generate_coaching_tips(
             "target": "Maintain this quality consistently.",
         }]
 
+    # Similar issue combinations reuse one cached GPT answer, re-filled with
+    # this recording's numbers.
+    cache = get_tip_cache()
+    cache_key = issues_cache_key(issues)
+    values = template_values(issues)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        tips = render(cached, values)
+        if tips is not None:
+            return tips
+
+    if not allow_gpt:
+        return _fallback_tips(issues)
+
     prompt = f"""Based on these interview delivery issues, generate the TOP 3 most impactful coaching tips.
 
 Issues detected:
-{json.dumps(issues, indent=2)}
+{json.dumps(prompt_issues(issues), indent=2)}
+
+Measured numbers are given as placeholders such as {{wpm}}, with the range they fall in.
+Write the placeholders into your text exactly as given, braces included, wherever you quote
+a measurement. Base targets on the ranges, never on the placeholders. Use no other braces.
 
 Return a JSON array of exactly 3 tip objects. Return ONLY a valid JSON array, no other text."""
 
-    try:
-        client = openai.OpenAI(api_key=settings.openai_api_key)
-        response = client.chat.completions.create(
-            model=settings.openai_model,
-            messages=[
-                {"role": "system", "content": COACHING_SYSTEM_PROMPT},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-            max_tokens=800,
-        )
-        raw = response.choices[0].message.content.strip()
-        if raw.startswith("```"):
-            raw = raw.split("```")[1]
-            if raw.startswith("json"):
-                raw = raw[4:]
-        tips = json.loads(raw)
-        return tips[:3]
-    except Exception as e:
-        return _fallback_tips(filler_count, wpm, pause_count)
+    client = get_openai_clients().sync_for("coaching")
+    response = client.chat.completions.create(
+        model=settings.openai_model,
+        messages=[
+            {"role": "system", "content": COACHING_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.3,
+        max_tokens=800,
+    )
+    raw = response.choices[0].message.content.strip()
+    if raw.startswith("```"):
+        raw = raw.split("```")[1]
+        if raw.startswith("json"):
+            raw = raw[4:]
+    template = to_template(json.loads(raw)[:3], values)
+    tips = render(template, values) if template is not None else None
+    if tips is None:
+        raise ValueError("Coaching reply has placeholders that can't be filled in")
+    cache.set(cache_key, template)
+    return tips
 
 
 def _build_issues_summary(filler_count, filler_detail, wpm, pause_count,
@@ -113,26 +144,82 @@ def _build_issues_summary(filler_count, filler_detail, wpm, pause_count,
     return issues
 
 
-def _fallback_tips(filler_count, wpm, pause_count):
+STAR_COMPONENT_HINTS = {
+    "situation": "one sentence on where you were and what was going on",
+    "task": "what you specifically were responsible for",
+    "action": "the 2-3 steps you personally took, using \"I\", not \"we\"",
+    "result": "a measurable outcome (a number, a date, a decision) and what you learned",
+}
+
+
+def _fallback_tips(issues):
+    """Rule-based tips for the issues, most severe first. Used when GPT is slow or down."""
     tips = []
-    if filler_count > 5:
-        tips.append({
-            "metric": "Filler Words",
-            "value": f"You used {filler_count} filler words",
-            "why_it_matters": "Fillers make you sound unprepared and reduce credibility.",
-            "root_cause": "You're filling thinking time with sounds instead of silent pauses.",
-            "technique": "Replace every filler with a 1-second silent pause. Practice 3x before re-recording.",
-            "target": f"Under {max(2, filler_count // 3)} filler words next attempt.",
-        })
-    if wpm and wpm > 160:
-        tips.append({
-            "metric": "Speaking Pace",
-            "value": f"You spoke at {round(wpm)} WPM — too fast",
-            "why_it_matters": "Fast speech signals nervousness and is hard to follow.",
-            "root_cause": "Nerves cause rushing. Deep breathing helps.",
-            "technique": "Take one deep breath before starting. Pause after each sentence.",
-            "target": "120–150 WPM next attempt.",
-        })
+    ordered = sorted(issues, key=lambda i: 0 if i.get("severity") == "high" else 1)
+    for issue in ordered:
+        data = issue.get("data", {})
+        kind = issue["type"]
+        if kind == "filler_words":
+            total = data["total"]
+            tips.append({
+                "metric": "Filler Words",
+                "value": f"You used {total} filler words, mostly '{data['top_filler']}' "
+                         f"({data['rate_per_minute']} per minute)",
+                "why_it_matters": "Fillers make you sound unprepared and reduce credibility.",
+                "root_cause": "You're filling thinking time with sounds instead of silent pauses.",
+                "technique": "Replace every filler with a 1-second silent pause. Practice 3x before re-recording.",
+                "target": f"Under {max(2, total // 3)} filler words next attempt.",
+            })
+        elif kind == "pace" and data["wpm"] > 160:
+            tips.append({
+                "metric": "Speaking Pace",
+                "value": f"You spoke at {round(data['wpm'])} WPM — too fast",
+                "why_it_matters": "Fast speech signals nervousness and is hard to follow.",
+                "root_cause": "Nerves cause rushing. Deep breathing helps.",
+                "technique": "Take one deep breath before starting. Pause after each sentence.",
+                "target": "120–150 WPM next attempt.",
+            })
+        elif kind == "pace":
+            tips.append({
+                "metric": "Speaking Pace",
+                "value": f"You spoke at {round(data['wpm'])} WPM — a little slow",
+                "why_it_matters": "Slow delivery can sound hesitant and loses the interviewer's attention.",
+                "root_cause": "Usually searching for words mid-sentence rather than knowing the next point.",
+                "technique": "Note 3 keywords for your answer. Say each point in one breath, then pause.",
+                "target": "120–150 WPM next attempt.",
+            })
+        elif kind == "pauses":
+            tips.append({
+                "metric": "Long Pauses",
+                "value": f"You paused for more than 2 seconds {data['pause_count']} times",
+                "why_it_matters": "Long silences mid-answer read as losing your train of thought.",
+                "root_cause": "The answer's structure isn't fixed before you start speaking.",
+                "technique": "Outline the answer as 3 points before starting. If you get stuck, "
+                             "summarise the last point to buy time.",
+                "target": f"At most {max(1, data['pause_count'] // 2)} long pauses next attempt.",
+            })
+        elif kind == "star_structure":
+            missing = data["missing_components"]
+            tips.append({
+                "metric": "STAR Structure",
+                "value": "Missing or weak: " + ", ".join(c.capitalize() for c in missing),
+                "why_it_matters": "Interviewers score behavioural answers on a clear situation, "
+                                  "your actions and the result.",
+                "root_cause": "The story jumps straight to the details without a frame.",
+                "technique": " ".join(
+                    f"{c.capitalize()}: {STAR_COMPONENT_HINTS[c]}." for c in missing if c in STAR_COMPONENT_HINTS
+                ) or "Walk through Situation, Task, Action and Result in that order.",
+                "target": "Cover all four STAR parts next attempt.",
+            })
+        elif kind == "too_short":
+            tips.append({
+                "metric": "Answer Length",
+                "value": f"Your answer lasted {round(data['duration_seconds'])} seconds",
+                "why_it_matters": "Very short answers leave the interviewer without evidence of your skills.",
+                "root_cause": "Stopping after the headline instead of giving an example.",
+                "technique": "After your main point, add one concrete example and what it led to.",
+                "target": "60–90 seconds next attempt.",
+            })
     if not tips:
         tips.append({
             "metric": "Overall Delivery",
@@ -0,0 +1,160 @@
+"""
+Bounded conversation context for the interviewer.
+The last few messages go to the model verbatim; everything older is folded
+into a running summary, refreshed in the background while the candidate is
+answering. The history sent per turn stays under context_max_tokens, so
+prompt size no longer grows with the length of the session.
+"""
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from config import get_settings
+from services.openai_clients import get_openai_clients
+
+settings = get_settings()
+
+MIN_VERBATIM = 2    # the question being answered and the answer
+
+SUMMARY_PROMPT = """You are keeping notes for an interviewer during a job interview.
+Update the running summary with the new exchanges below. Keep every question already asked,
+the candidate's key claims, examples, numbers and any weak or evasive answers.
+Be concise: at most {max_words} words. Return only the updated summary.
+
+Current summary:
+{summary}
+
+New exchanges:
+{exchanges}"""
+
+
+@lru_cache()
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except ImportError:
+        # tiktoken not installed — fall back to a character estimate
+        return None
+    except Exception as e:
+        print(f"[Context] tiktoken unavailable, estimating tokens: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    enc = _encoding()
+    if enc is None:
+        return len(text) // 4 + 1
+    return len(enc.encode(text))
+
+
+def message_tokens(messages: List[Dict[str, str]]) -> int:
+    # ~4 tokens of per-message overhead in the chat format
+    return sum(count_tokens(m["content"]) + 4 for m in messages)
+
+
+class _ContextStats:
+    def __init__(self):
+        self.turns = 0
+        self.tokens_sent = 0
+        self.tokens_saved = 0
+        self.summaries = 0
+        self.summary_failures = 0
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        with self._lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "turns": self.turns,
+                "history_tokens_sent": self.tokens_sent,
+                "history_tokens_saved": self.tokens_saved,
+                "summaries": self.summaries,
+                "summary_failures": self.summary_failures,
+            }
+
+
+_stats = _ContextStats()
+
+
+def context_stats() -> dict:
+    return _stats.snapshot()
+
+
+def _summary_message(summary: str) -> Dict[str, str]:
+    return {"role": "system", "content": f"Summary of the interview so far:\n{summary}"}
+
+
+def build_context(active) -> List[Dict[str, str]]:
+    """
+    History to send for the next interviewer turn: the summary (if any), then
+    the messages not yet summarized, oldest dropped first to fit the budget.
+    Only the latest question and answer are kept regardless of the budget.
+    Records the tokens saved against sending the full history on the session.
+    """
+    history = active.conversation_history
+    verbatim = history[active.summarized_upto:]
+    head = [_summary_message(active.summary)] if active.summary else []
+
+    while len(verbatim) > MIN_VERBATIM and message_tokens(head + verbatim) > settings.context_max_tokens:
+        verbatim = verbatim[1:]
+
+    context = head + verbatim
+    sent = message_tokens(context)
+    saved = max(0, message_tokens(history) - sent)
+    active.context_tokens_saved += saved
+    _stats.add(turns=1, tokens_sent=sent, tokens_saved=saved)
+    return context
+
+
+def needs_summary(active) -> bool:
+    """True when messages older than the verbatim window are not in the summary yet."""
+    return len(active.conversation_history) - settings.context_recent_messages > active.summarized_upto
+
+
+async def refresh_summary(active):
+    """Fold messages older than the verbatim window into active.summary."""
+    upto = len(active.conversation_history) - settings.context_recent_messages
+    if upto <= active.summarized_upto:
+        return
+    new_messages = active.conversation_history[active.summarized_upto:upto]
+    exchanges = "\n".join(
+        f"{'Interviewer' if m['role'] == 'assistant' else 'Candidate'}: {m['content']}" for m in new_messages
+    )
+    client = get_openai_clients().async_for("summary")
+    try:
+        response = await client.chat.completions.create(
+            model=settings.openai_model,
+            messages=[{"role": "user", "content": SUMMARY_PROMPT.format(
+                max_words=settings.context_summary_max_words,
+                summary=active.summary or "(none yet)",
+                exchanges=exchanges,
+            )}],
+            max_tokens=settings.context_summary_max_words * 2,
+            temperature=0.2,
+        )
+    except Exception as e:
+        # The unsummarized messages are still sent verbatim (within budget)
+        _stats.add(summary_failures=1)
+        print(f"[Context] Summary update failed for {active.session_id}: {e}")
+        return
+    # Both fields change together, after the await, so a turn built in the
+    # meantime sees either the old or the new summary consistently.
+    active.summary = response.choices[0].message.content.strip()
+    active.summarized_upto = upto
+    _stats.add(summaries=1)
+
+
+def schedule_summary(active, on_done=None) -> Optional[asyncio.Task]:
+    """Start refresh_summary in the background if it has anything to fold in."""
+    if not needs_summary(active):
+        return None
+    task = asyncio.create_task(refresh_summary(active))
+    if on_done is not None:
+        task.add_done_callback(lambda t: t.cancelled() or on_done(active))
+    return task
@@ -2,29 +2,15 @@
 Core GPT-4o-mini interviewer service.
 """
 import json
-from typing import List, Dict, Any
-from openai import AsyncOpenAI
+from typing import List, Dict, Any, AsyncIterator
 from config import get_settings
-from services.interviewer.prompts import (
-    SYSTEM_PROMPT_BASE, PERSONAS, OPENING_QUESTIONS, SESSION_END_PROMPT
-)
+from services.openai_clients import get_openai_clients
+from services.interviewer.prompts import PERSONAS, SESSION_END_PROMPT
+from services.interviewer.prompt_assembly import assemble_messages, prompt_cache_stats
 
 settings = get_settings()
 
 
-def build_system_prompt(company_key, interview_type, role, experience_level, current_turn, max_turns):
-    persona = PERSONAS.get(company_key.lower(), PERSONAS["generic"])
-    return SYSTEM_PROMPT_BASE.format(
-        interview_type=interview_type,
-        role=role,
-        company=persona["company"],
-        persona_description=persona["persona_description"],
-        experience_level=experience_level,
-        current_turn=current_turn,
-        max_turns=max_turns,
-    )
-
-
 async def get_interviewer_response(
     conversation_history: List[Dict[str, str]],
     company_key: str,
@@ -34,40 +20,57 @@ async def get_interviewer_response(
     current_turn: int,
     max_turns: int = 8,
 ) -> str:
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
-    system_prompt = build_system_prompt(
-        company_key=company_key,
-        interview_type=interview_type,
-        role=role,
-        experience_level=experience_level,
-        current_turn=current_turn,
-        max_turns=max_turns,
+    client = get_openai_clients().async_for("interviewer")
+    messages = assemble_messages(
+        conversation_history, company_key, interview_type, role, experience_level, current_turn, max_turns
     )
 
-    messages = [{"role": "system", "content": system_prompt}]
-    messages.extend(conversation_history)
-
-    if current_turn == 1 and not conversation_history:
-        opening = OPENING_QUESTIONS.get(interview_type, OPENING_QUESTIONS["behavioral"])
-        messages.append({
-            "role": "system",
-            "content": f"Start the interview now. Your first question should be around: '{opening}'"
-        })
-
     response = await client.chat.completions.create(
         model=settings.openai_model,
         messages=messages,
         max_tokens=300,
         temperature=0.7,
     )
+    prompt_cache_stats.record(response.usage)
     return response.choices[0].message.content.strip()
 
 
-async def generate_session_feedback(
+async def stream_interviewer_response(
+    conversation_history: List[Dict[str, str]],
+    company_key: str,
+    interview_type: str,
+    role: str,
+    experience_level: str,
+    current_turn: int,
+    max_turns: int = 8,
+) -> AsyncIterator[str]:
+    """Same reply as get_interviewer_response, yielded as text deltas while it is generated."""
+    client = get_openai_clients().async_for("interviewer")
+    messages = assemble_messages(
+        conversation_history, company_key, interview_type, role, experience_level, current_turn, max_turns
+    )
+
+    stream = await client.chat.completions.create(
+        model=settings.openai_model,
+        messages=messages,
+        max_tokens=300,
+        temperature=0.7,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+        if chunk.usage is not None:   # final chunk, no choices
+            prompt_cache_stats.record(chunk.usage)
+
+
+def generate_session_feedback(
     conversation_history: List[Dict[str, str]],
     company_key: str,
 ) -> Dict[str, Any]:
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    """Holistic end-of-session feedback. Blocking; runs in the job worker."""
+    client = get_openai_clients().sync_for("session_feedback")
     persona = PERSONAS.get(company_key.lower(), PERSONAS["generic"])
 
     messages = [
@@ -82,7 +85,7 @@ async def generate_session_feedback(
         {"role": "user", "content": SESSION_END_PROMPT}
     ]
 
-    response = await client.chat.completions.create(
+    response = client.chat.completions.create(
         model=settings.openai_model,
         messages=messages,
         max_tokens=800,
@@ -0,0 +1,170 @@
+"""
+Opening question pre-generation.
+/roleplay/start kicks off the first question and its audio in the background,
+so by the time the client connects the WebSocket it is usually ready. The
+task lives in the process that handled /start; the text is also written to
+the stored session (and the audio to the shared TTS cache) so a connection
+landing on another worker can still use it.
+"""
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from config import get_settings
+from services.interviewer.gpt_interviewer import get_interviewer_response
+from services.interviewer.session_manager import ActiveSession, get_session, save_session
+from services.interviewer.tts_service import text_to_speech
+
+settings = get_settings()
+
+_openings: Dict[str, asyncio.Task] = {}
+
+
+class _OpeningStats:
+    def __init__(self):
+        self.started = 0
+        self.ready_on_connect = 0      # finished before the client connected
+        self.awaited = 0               # still running at connect; the client waited for the rest
+        self.missed = 0                # no task in this process (other worker, failed, or cancelled)
+        self.cancelled = 0
+        self.connect_gap_seconds = 0.0
+        self.connects = 0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        with self._lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started": self.started,
+                "ready_on_connect": self.ready_on_connect,
+                "awaited": self.awaited,
+                "missed": self.missed,
+                "cancelled": self.cancelled,
+                "avg_connect_gap_ms": round(self.connect_gap_seconds / self.connects * 1000, 1) if self.connects else 0.0,
+                "avg_wait_ms": round(self.wait_seconds / self.awaited * 1000, 1) if self.awaited else 0.0,
+            }
+
+
+_stats = _OpeningStats()
+
+
+def opening_stats() -> dict:
+    return _stats.snapshot()
+
+
+async def _generate(active: ActiveSession) -> Tuple[str, bytes]:
+    text = await get_interviewer_response(
+        conversation_history=[],
+        company_key=active.company_key,
+        interview_type=active.interview_type,
+        role=active.role,
+        experience_level=active.experience_level,
+        current_turn=0,
+        max_turns=active.max_turns,
+    )
+    audio = await text_to_speech(text)
+    # Record it on the stored session unless a connection has already moved on
+    stored = await asyncio.to_thread(get_session, active.session_id)
+    if stored is not None and stored.current_turn == 0:
+        stored.opening_text = text
+        await asyncio.to_thread(save_session, stored)
+    return text, audio
+
+
+def start_opening(active: ActiveSession) -> asyncio.Task:
+    task = asyncio.create_task(_generate(active))
+    _openings[active.session_id] = task
+    _stats.add(started=1)
+    # Never-connected sessions: stop the work and forget the result once the session would have expired
+    asyncio.get_running_loop().call_later(settings.session_ttl_seconds, _expire, active.session_id, task)
+    return task
+
+
+def _expire(session_id: str, task: asyncio.Task):
+    if _openings.get(session_id) is task:
+        cancel_opening(session_id)
+
+
+async def take_opening(active: ActiveSession) -> Optional[Tuple[str, Optional[bytes]]]:
+    """
+    The pre-generated (text, audio) for a session that just connected, or
+    None if there is none and the handler should generate the opening itself.
+    The task stays registered so cancel_opening() can stop it if the client
+    goes away while waiting; the handler calls it when the connection ends.
+    Also records the idle gap between /start and the connection.
+    """
+    _stats.add(connects=1, connect_gap_seconds=max(0.0, time.time() - active.created_at))
+    task = _openings.get(active.session_id)
+    if task is None:
+        if active.opening_text:
+            _stats.add(ready_on_connect=1)
+            return active.opening_text, None   # audio comes from the TTS cache
+        _stats.add(missed=1)
+        return None
+
+    try:
+        if task.done():
+            result = task.result()
+            _stats.add(ready_on_connect=1)
+            return result
+        started = time.perf_counter()
+        # Shielded: if this handler is cancelled, cancel_opening() decides about the task
+        result = await asyncio.shield(task)
+        _stats.add(awaited=1, wait_seconds=time.perf_counter() - started)
+        return result
+    except asyncio.CancelledError:
+        if task.cancelled():
+            _stats.add(missed=1)
+            return None
+        raise
+    except Exception as e:
+        print(f"[Opening] Pre-generation failed for {active.session_id}: {e}")
+        _stats.add(missed=1)
+        return None
+
+
+async def take_opening_watching(
+    active: ActiveSession, websocket: WebSocket,
+) -> Tuple[Optional[Tuple[str, Optional[bytes]]], List[dict]]:
+    """
+    take_opening() while still reading the socket. Starlette doesn't cancel a
+    handler when the peer goes away, so without this a client that leaves
+    during generation is only noticed once GPT and TTS have finished. A
+    disconnect cancels the opening and raises WebSocketDisconnect; any other
+    messages that arrive meanwhile are returned for the handler to process.
+    """
+    early: List[dict] = []
+    taking = asyncio.ensure_future(take_opening(active))
+    try:
+        while True:
+            receiving = asyncio.ensure_future(websocket.receive())
+            done, _ = await asyncio.wait({taking, receiving}, return_when=asyncio.FIRST_COMPLETED)
+            if receiving in done:
+                message = receiving.result()
+                if message["type"] == "websocket.disconnect":
+                    cancel_opening(active.session_id)
+                    raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+                early.append(message)
+            else:
+                receiving.cancel()
+            if taking in done:
+                return taking.result(), early
+    finally:
+        if not taking.done():
+            taking.cancel()
+
+
+def cancel_opening(session_id: str):
+    """Drop a session's pre-generation, stopping it if it is still running (client went away)."""
+    task = _openings.pop(session_id, None)
+    if task is not None and not task.done():
+        task.cancel()
+        _stats.add(cancelled=1)
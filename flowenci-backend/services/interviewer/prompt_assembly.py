@@ -0,0 +1,85 @@
+"""
+Prompt assembly for the interviewer.
+Requests are laid out as [static persona prefix] [conversation] [turn context]
+so the leading tokens are byte-identical across turns and sessions of the same
+persona, and provider-side prompt caching can reuse them. Cached-token counts
+reported by the API are recorded to check that it does.
+"""
+import threading
+from functools import lru_cache
+from typing import Dict, List
+
+from services.interviewer.prompts import (
+    SYSTEM_PROMPT_STATIC, TURN_CONTEXT_TEMPLATE, OPENING_INSTRUCTION, PERSONAS, OPENING_QUESTIONS
+)
+
+
+@lru_cache(maxsize=512)
+def static_prefix(company_key: str, interview_type: str, role: str, experience_level: str) -> str:
+    persona = PERSONAS.get(company_key.lower(), PERSONAS["generic"])
+    return SYSTEM_PROMPT_STATIC.format(
+        interview_type=interview_type,
+        role=role,
+        company=persona["company"],
+        persona_description=persona["persona_description"],
+        experience_level=experience_level,
+    )
+
+
+def turn_context(interview_type: str, current_turn: int, max_turns: int, opening: bool) -> str:
+    context = TURN_CONTEXT_TEMPLATE.format(current_turn=current_turn, max_turns=max_turns)
+    if opening:
+        question = OPENING_QUESTIONS.get(interview_type, OPENING_QUESTIONS["behavioral"])
+        context += "\n\n" + OPENING_INSTRUCTION.format(opening=question)
+    return context
+
+
+def assemble_messages(
+    conversation_history: List[Dict[str, str]],
+    company_key: str,
+    interview_type: str,
+    role: str,
+    experience_level: str,
+    current_turn: int,
+    max_turns: int,
+) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": static_prefix(company_key, interview_type, role, experience_level)},
+        *conversation_history,
+        {"role": "system", "content": turn_context(
+            interview_type, current_turn, max_turns, opening=not conversation_history
+        )},
+    ]
+
+
+class _PromptCacheStats:
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, usage):
+        """Add a response's usage (CompletionUsage, or None when the API sent none)."""
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = (getattr(details, "cached_tokens", None) or 0) if details else 0
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += usage.prompt_tokens or 0
+            self.cached_tokens += cached
+
+    def snapshot(self) -> dict:
+        info = static_prefix.cache_info()
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "cached_ratio": round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0,
+                "prefixes": {"hits": info.hits, "misses": info.misses, "size": info.currsize},
+            }
+
+
+prompt_cache_stats = _PromptCacheStats()
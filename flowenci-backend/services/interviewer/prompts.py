@@ -1,4 +1,7 @@
-SYSTEM_PROMPT_BASE = """You are an experienced interviewer conducting a {interview_type} interview for a {role} position at {company}.
+# Static per persona: identical on every turn of every session with the same
+# company, type, role and level, so providers can cache it as a prompt prefix.
+# Anything that changes between turns belongs in TURN_CONTEXT_TEMPLATE.
+SYSTEM_PROMPT_STATIC = """You are an experienced interviewer conducting a {interview_type} interview for a {role} position at {company}.
 
 Your personality: {persona_description}
 
@@ -6,18 +9,23 @@ STRICT RULES:
 1. Ask ONE question at a time. Never stack multiple questions.
 2. Ask natural follow-up questions if the answer is vague or incomplete.
 3. Keep your responses SHORT — max 2-3 sentences before asking your question.
-4. After {max_turns} exchanges, wrap up the interview professionally.
+4. After the number of exchanges given in the interview context, wrap up the interview professionally.
 5. Never give feedback during the interview.
 6. Speak in a conversational, natural tone.
 
-CURRENT INTERVIEW CONTEXT:
+INTERVIEW SETUP:
 - Interview type: {interview_type}
 - Company: {company}
 - Role: {role}
 - Candidate level: {experience_level}
-- Turn number: {current_turn} of {max_turns}
 """
 
+# Sent as the last message of each request, after the conversation
+TURN_CONTEXT_TEMPLATE = """CURRENT INTERVIEW CONTEXT:
+- Turn number: {current_turn} of {max_turns}"""
+
+OPENING_INSTRUCTION = "Start the interview now. Your first question should be around: '{opening}'"
+
 PERSONAS = {
     "amazon": {
         "company": "Amazon",
@@ -66,6 +74,11 @@ OPENING_QUESTIONS = {
     "mixed": "Let's start with you — tell me about yourself and your technical background.",
 }
 
+WRAP_UP_MESSAGE = (
+    "Thank you so much for your time! You've done really well. "
+    "Our team will be in touch soon. Do you have any questions for me?"
+)
+
 SESSION_END_PROMPT = """
 The interview has concluded. Provide a comprehensive evaluation.
 
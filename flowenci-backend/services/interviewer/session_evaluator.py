@@ -1,23 +1,95 @@
 """
 Session evaluator — generates and saves end-of-session feedback.
+Runs as an "evaluate_session" job. /roleplay/session/{id}/end claims the
+session by moving evaluation_status to "evaluating" in a single conditional
+update (InterviewSessionsRepository.claim_evaluation), so each session is
+evaluated at most once at a time.
+The last turns may still be on their way to interview_turns when /end is
+called (the WebSocket flushes them as it closes, possibly in another
+process), so the job waits for the turn log to catch up before grading.
 """
-from services.interviewer.gpt_interviewer import generate_session_feedback
+import asyncio
 from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from repositories.interviews import interview_sessions_repo, interview_turns_repo
+from repositories.projection import Projection
+from services.interviewer.gpt_interviewer import generate_session_feedback
 
+HISTORY = Projection("session_evaluator.history", "interview_sessions", ["conversation_history"])
+EVALUATION = Projection(
+    "session_evaluator.session", "interview_sessions",
+    ["evaluation_status", "company", "ended_at", "status", "total_turns"],
+)
 
-async def evaluate_and_save_session(active_session, db, db_record):
-    """Generate holistic session feedback and persist to DB."""
-    feedback = await generate_session_feedback(
-        conversation_history=active_session.conversation_history,
-        company_key=active_session.company_key,
-    )
+TURNS_SETTLE_SECONDS = 5.0
+TURNS_POLL_SECONDS = 0.5
+
+
+class TurnsPending(Exception):
+    """The session's WebSocket hasn't closed, or its last turns aren't in interview_turns yet."""
+
+
+def _turns_settled(db_record: dict, conversation: List[Dict[str, str]]) -> bool:
+    # The WebSocket writes status and total_turns only after flushing its turns
+    if db_record.get("status") == "active":
+        return False
+    asked = sum(1 for message in conversation if message.get("role") == "assistant")
+    return asked >= (db_record.get("total_turns") or 0)
 
-    db_record.session_feedback = feedback
-    db_record.overall_score = feedback.get("overall_score", 50)
-    db_record.status = "completed"
-    db_record.ended_at = datetime.now(timezone.utc)
-    db_record.total_turns = active_session.current_turn
-    db_record.conversation_history = active_session.conversation_history
-    db.commit()
 
-    return feedback
+async def load_conversation(db_session_id: str) -> List[Dict[str, str]]:
+    """
+    Full conversation of a session, rebuilt from its turns. Sessions recorded
+    before the turn log fall back to interview_sessions.conversation_history.
+    """
+    turns = await interview_turns_repo.list_for_session(db_session_id)
+    if turns:
+        return turns
+    session_row = await interview_sessions_repo.get(db_session_id, HISTORY) or {}
+    return session_row.get("conversation_history") or []
+
+
+async def release_evaluation(db_session_id: str, status: Optional[str] = "failed"):
+    """Take the session out of "evaluating" (None makes it claimable as never evaluated)."""
+    await interview_sessions_repo.update(db_session_id, {"evaluation_status": status}, evaluation_status="evaluating")
+
+
+async def evaluate_and_save_session(db_session_id: str, wait_for_turns: bool = True) -> bool:
+    """
+    Generate holistic session feedback and persist it. Safe to re-run: a
+    session that is no longer "evaluating" (finished by an earlier attempt)
+    is left alone. Returns True if feedback was saved.
+
+    With wait_for_turns, raises TurnsPending if the turn log is still behind
+    after TURNS_SETTLE_SECONDS; without it, grades whatever has been written.
+    """
+    loop = asyncio.get_running_loop()
+    settle_by = loop.time() + TURNS_SETTLE_SECONDS
+    while True:
+        db_record = await interview_sessions_repo.get(db_session_id, EVALUATION)
+        if not db_record or db_record.get("evaluation_status") != "evaluating":
+            return False
+        conversation = await load_conversation(db_session_id)
+        if not wait_for_turns or _turns_settled(db_record, conversation):
+            break
+        if loop.time() >= settle_by:
+            raise TurnsPending(f"Session {db_session_id} still has turns being written")
+        await asyncio.sleep(TURNS_POLL_SECONDS)
+
+    feedback = await asyncio.to_thread(
+        generate_session_feedback,
+        conversation_history=conversation,
+        company_key=db_record.get("company") or "generic",
+    )
+
+    update_data = {
+        "session_feedback": feedback,
+        "overall_score": feedback.get("overall_score", 50),
+        "evaluation_status": "done",
+        "status": "completed",
+    }
+    if not db_record.get("ended_at"):
+        update_data["ended_at"] = datetime.now(timezone.utc).isoformat()
+    saved = await interview_sessions_repo.update(db_session_id, update_data, evaluation_status="evaluating")
+    return saved is not None
@@ -1,9 +1,26 @@
 """
-Session manager — in-memory active interview sessions.
+Session manager — active interview sessions.
+Sessions live in a SessionStore: in-process ("memory", single worker) or a
+SQLite file in WAL mode ("sqlite") shared by every worker process on the
+host, so /roleplay/start and the WebSocket may land on different workers.
+Sessions idle for longer than session_ttl_seconds expire.
 """
+import asyncio
+import json
+import sqlite3
+import threading
+import time
 import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
 from typing import Optional, Dict, List
-from dataclasses import dataclass, field
+
+from config import get_settings
+from utils.cache import resolve_data_path
+
+settings = get_settings()
 
 
 @dataclass
@@ -19,6 +36,13 @@ class ActiveSession:
     conversation_history: List[Dict] = field(default_factory=list)
     is_complete: bool = False
     db_session_id: str = ""
+    # Bounded context (see context_manager): history before summarized_upto is folded into summary
+    summary: str = ""
+    summarized_upto: int = 0
+    context_tokens_saved: int = 0
+    created_at: float = field(default_factory=time.time)
+    opening_text: str = ""      # pre-generated first question, see opening.py
+    turns_logged: int = 0       # messages already queued to interview_turns, see turn_log.py
 
     def add_assistant_message(self, content: str):
         self.conversation_history.append({"role": "assistant", "content": content})
@@ -30,9 +54,203 @@ class ActiveSession:
     def is_session_over(self) -> bool:
         return self.current_turn >= self.max_turns
 
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: str) -> "ActiveSession":
+        return cls(**json.loads(data))
+
+
+class SessionStore(ABC):
+    """
+    Keyed by session_id. Every put() or get() counts as activity for the TTL.
+    Calls may block (the sqlite backend waits on file locks); async code runs
+    them with asyncio.to_thread.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.created = 0
+        self.ended = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def put(self, session: ActiveSession):
+        ...
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[ActiveSession]:
+        ...
+
+    @abstractmethod
+    def pop(self, session_id: str) -> Optional[ActiveSession]:
+        ...
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """Drop expired sessions; returns how many were dropped."""
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "ttl_seconds": self.ttl,
+            "created": self.created,
+            "ended": self.ended,
+            "expired": self.expired,
+        }
+
+
+class InMemorySessionStore(SessionStore):
+    backend = "memory"
+
+    def __init__(self, ttl: float):
+        super().__init__(ttl)
+        self._sessions: Dict[str, ActiveSession] = {}
+        self._last_seen: Dict[str, float] = {}
+
+    def put(self, session: ActiveSession):
+        with self._lock:
+            if session.session_id not in self._sessions:
+                self.created += 1
+            self._sessions[session.session_id] = session
+            self._last_seen[session.session_id] = time.monotonic()
+
+    def get(self, session_id: str) -> Optional[ActiveSession]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if time.monotonic() - self._last_seen[session_id] > self.ttl:
+                self._drop(session_id)
+                self.expired += 1
+                return None
+            self._last_seen[session_id] = time.monotonic()
+            return session
+
+    def pop(self, session_id: str) -> Optional[ActiveSession]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                self._drop(session_id)
+                self.ended += 1
+            return session
 
-# In-memory store: session_id -> ActiveSession
-_active_sessions: Dict[str, ActiveSession] = {}
+    def _drop(self, session_id: str):
+        self._sessions.pop(session_id, None)
+        self._last_seen.pop(session_id, None)
+
+    def sweep(self) -> int:
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            stale = [sid for sid, seen in self._last_seen.items() if seen < cutoff]
+            for sid in stale:
+                self._drop(sid)
+            self.expired += len(stale)
+        return len(stale)
+
+    def stats(self) -> dict:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {
+            **super().stats(),
+            "live": len(sessions),
+            # Serialized size; the Python objects themselves are a few times larger
+            "bytes": sum(len(s.to_json()) for s in sessions),
+        }
+
+
+class SQLiteSessionStore(SessionStore):
+    backend = "sqlite"
+
+    def __init__(self, path, ttl: float):
+        super().__init__(ttl)
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def put(self, session: ActiveSession):
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE sessions SET data = ?, updated_at = ? WHERE id = ?",
+                (session.to_json(), time.time(), session.session_id),
+            )
+            if cur.rowcount == 0:
+                conn.execute(
+                    "INSERT INTO sessions (id, data, updated_at) VALUES (?, ?, ?)",
+                    (session.session_id, session.to_json(), time.time()),
+                )
+                self._count("created")
+
+    def get(self, session_id: str) -> Optional[ActiveSession]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT data, updated_at FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                if conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount:
+                    self._count("expired")
+                return None
+            conn.execute("UPDATE sessions SET updated_at = ? WHERE id = ?", (now, session_id))
+        return ActiveSession.from_json(row[0])
+
+    def pop(self, session_id: str) -> Optional[ActiveSession]:
+        # SELECT then DELETE in one write transaction (DELETE ... RETURNING needs SQLite 3.35)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+                if row is not None:
+                    conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        self._count("ended")
+        return ActiveSession.from_json(row[0])
+
+    def sweep(self) -> int:
+        with self._connect() as conn:
+            n = conn.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl,)).rowcount
+        self._count("expired", n)
+        return n
+
+    def stats(self) -> dict:
+        # created/ended/expired count this process only; live and bytes are shared
+        with self._connect() as conn:
+            live, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM sessions").fetchone()
+        return {**super().stats(), "live": live, "bytes": size}
+
+
+@lru_cache()
+def get_session_store() -> SessionStore:
+    if settings.session_store == "sqlite":
+        return SQLiteSessionStore(resolve_data_path(settings.session_store_path), settings.session_ttl_seconds)
+    if settings.session_store == "memory":
+        return InMemorySessionStore(settings.session_ttl_seconds)
+    raise ValueError(f"Unknown session_store '{settings.session_store}'. Choose from: memory, sqlite")
 
 
 def create_session(
@@ -42,6 +260,7 @@ def create_session(
     role: str,
     experience_level: str,
     max_turns: int,
+    db_session_id: str = "",
 ) -> ActiveSession:
     session_id = str(uuid.uuid4())
     session = ActiveSession(
@@ -52,14 +271,32 @@ def create_session(
         role=role,
         experience_level=experience_level or "student",
         max_turns=max_turns,
+        db_session_id=db_session_id,
     )
-    _active_sessions[session_id] = session
+    get_session_store().put(session)
     return session
 
 
 def get_session(session_id: str) -> Optional[ActiveSession]:
-    return _active_sessions.get(session_id)
+    return get_session_store().get(session_id)
+
+
+def save_session(session: ActiveSession):
+    """Write back changes to a session (and refresh its TTL)."""
+    get_session_store().put(session)
 
 
 def end_session(session_id: str) -> Optional[ActiveSession]:
-    return _active_sessions.pop(session_id, None)
+    return get_session_store().pop(session_id)
+
+
+async def run_session_sweeper(interval: float):
+    """Expire idle sessions every interval seconds, including never-connected ones."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            expired = await asyncio.to_thread(get_session_store().sweep)
+            if expired:
+                print(f"[Sessions] Expired {expired} idle session(s)")
+        except Exception as e:
+            print(f"[Sessions] Sweep failed: {e}")
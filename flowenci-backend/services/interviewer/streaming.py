@@ -0,0 +1,125 @@
+"""
+Streaming interviewer replies.
+Text deltas are forwarded as they arrive; each finished sentence is sent to
+TTS straight away, and its audio goes out as soon as it (and every sentence
+before it) is ready, so playback starts while the reply is still generating.
+"""
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from services.interviewer.tts_service import text_to_speech
+
+# End of sentence: punctuation, optional closing quotes/brackets, then whitespace
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s+")
+
+
+class SentenceChunker:
+    """
+    Splits streamed text into sentences. Very short sentences ("Great.") are
+    held back and joined with the next one, so TTS isn't called on fragments.
+    """
+
+    def __init__(self, min_chars: int = 20):
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def feed(self, delta: str) -> List[str]:
+        self.buffer += delta
+        sentences = []
+        start = 0
+        for m in _SENTENCE_END.finditer(self.buffer):
+            if m.end() - start >= self.min_chars:
+                sentences.append(self.buffer[start:m.end()].strip())
+                start = m.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        rest = self.buffer.strip()
+        self.buffer = ""
+        return [rest] if rest else []
+
+
+@dataclass
+class StreamedReply:
+    text: str
+    first_token_ms: Optional[float]
+    first_audio_ms: Optional[float]
+    total_ms: float
+    sentences: int
+
+
+async def stream_spoken_reply(
+    deltas: AsyncIterator[str],
+    send: Callable[..., Awaitable[None]],
+    turn: int,
+) -> StreamedReply:
+    """
+    Forward a streamed reply as "question_delta" frames and per-sentence
+    "audio_chunk" frames (in sentence order), and return the full text with
+    its latency measurements. send(message, audio=None) is
+    RoleplayConnection.send.
+    """
+    started = time.perf_counter()
+    first_token_ms = None
+    first_audio_ms = None
+    parts = []
+    chunker = SentenceChunker()
+    pending: asyncio.Queue = asyncio.Queue()   # TTS tasks in sentence order; None ends the stream
+
+    def elapsed_ms() -> float:
+        return round((time.perf_counter() - started) * 1000, 1)
+
+    def speak(sentence: str):
+        pending.put_nowait((sentence, asyncio.create_task(text_to_speech(sentence))))
+
+    async def send_audio():
+        nonlocal first_audio_ms
+        sequence = 0
+        while True:
+            item = await pending.get()
+            if item is None:
+                return sequence
+            sentence, task = item
+            audio = await task
+            if first_audio_ms is None and audio:
+                first_audio_ms = elapsed_ms()
+            await send({
+                "type": "audio_chunk",
+                "content": sentence,
+                "turn": turn,
+                "sequence": sequence,
+            }, audio=audio)
+            sequence += 1
+
+    audio_sender = asyncio.create_task(send_audio())
+    try:
+        async for delta in deltas:
+            if first_token_ms is None:
+                first_token_ms = elapsed_ms()
+            parts.append(delta)
+            await send({"type": "question_delta", "content": delta, "turn": turn})
+            for sentence in chunker.feed(delta):
+                speak(sentence)
+        for sentence in chunker.flush():
+            speak(sentence)
+        pending.put_nowait(None)
+        sentences = await audio_sender
+    except BaseException:
+        audio_sender.cancel()
+        while not pending.empty():
+            item = pending.get_nowait()
+            if item is not None:
+                item[1].cancel()
+        raise
+
+    return StreamedReply(
+        text="".join(parts).strip(),
+        first_token_ms=first_token_ms,
+        first_audio_ms=first_audio_ms,
+        total_ms=elapsed_ms(),
+        sentences=sentences,
+    )
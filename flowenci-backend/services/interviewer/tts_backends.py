@@ -0,0 +1,173 @@
+"""
+TTS backends and the bounded executor they run on.
+gtts:   Google Translate TTS over the network, MP3. Needs the gTTS package.
+espeak: espeak-ng on the local CPU, WAV. Needs the espeak-ng binary; no
+        network round trip, so it's the low-latency / offline option.
+"""
+import io
+import shutil
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict
+
+from config import get_settings
+
+settings = get_settings()
+
+
+class TTSOverloaded(Exception):
+    """More synthesis requests are waiting than settings.tts_max_queue allows."""
+
+
+class TTSBackend(ABC):
+    name = "base"
+    format = "mp3"
+
+    def __init__(self, voice: str = ""):
+        self.voice = voice
+
+    @property
+    def cache_id(self) -> str:
+        """Identifies the voice in cache keys: audio from different backends or voices never mixes."""
+        return f"{self.name}-{self.voice}"
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def synthesize(self, text: str) -> bytes:
+        """Blocking synthesis of text to audio bytes in self.format."""
+
+
+class GTTSBackend(TTSBackend):
+    name = "gtts"
+    format = "mp3"
+
+    def __init__(self, voice: str = ""):
+        super().__init__(voice or "en")
+
+    def available(self) -> bool:
+        try:
+            import gtts  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    def synthesize(self, text: str) -> bytes:
+        from gtts import gTTS
+        tts = gTTS(text=text, lang=self.voice, slow=False)
+        buf = io.BytesIO()
+        tts.write_to_fp(buf)
+        return buf.getvalue()
+
+
+class EspeakBackend(TTSBackend):
+    name = "espeak"
+    format = "wav"
+
+    def __init__(self, voice: str = "", binary: str = "espeak-ng", speed: int = 165):
+        super().__init__(voice or "en-us")
+        self.binary = binary
+        self.speed = speed
+
+    def available(self) -> bool:
+        return shutil.which(self.binary) is not None
+
+    def synthesize(self, text: str) -> bytes:
+        result = subprocess.run(
+            [self.binary, "-v", self.voice, "-s", str(self.speed), "--stdout"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            timeout=30,
+            check=True,
+        )
+        return result.stdout
+
+
+BACKENDS: Dict[str, Callable[[], TTSBackend]] = {
+    "gtts": lambda: GTTSBackend(settings.tts_voice),
+    "espeak": lambda: EspeakBackend(settings.tts_voice, settings.espeak_binary, settings.espeak_speed),
+}
+
+
+@lru_cache()
+def get_tts_backend() -> TTSBackend:
+    if settings.tts_backend not in BACKENDS:
+        raise ValueError(f"Unknown tts_backend '{settings.tts_backend}'. Choose from: {sorted(BACKENDS)}")
+    return BACKENDS[settings.tts_backend]()
+
+
+class TTSExecutor:
+    """
+    Fixed-size thread pool for synthesis. Requests beyond max_queue waiting
+    jobs are rejected with TTSOverloaded instead of piling up latency.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts")
+        self._lock = threading.Lock()
+        self.pending = 0          # submitted and not finished (running + queued)
+        self.max_pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.shed = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def submit(self, fn: Callable[[str], bytes], text: str) -> Future:
+        with self._lock:
+            if self.pending - self.workers >= self.max_queue:
+                self.shed += 1
+                raise TTSOverloaded(f"{self.pending} synthesis jobs pending")
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+        submitted = time.perf_counter()
+        return self._pool.submit(self._run, fn, text, submitted)
+
+    def _run(self, fn, text, submitted):
+        started = time.perf_counter()
+        ok = False
+        try:
+            audio = fn(text)
+            ok = True
+            return audio
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.pending -= 1
+                self.wait_seconds += started - submitted
+                self.busy_seconds += finished - started
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def metrics(self) -> dict:
+        with self._lock:
+            done = self.completed + self.failed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": min(self.pending, self.workers),
+                "queued": max(0, self.pending - self.workers),
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "shed": self.shed,
+                "avg_wait_ms": round(self.wait_seconds / done * 1000, 1) if done else 0.0,
+                "avg_synthesis_ms": round(self.busy_seconds / done * 1000, 1) if done else 0.0,
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache()
+def get_tts_executor() -> TTSExecutor:
+    return TTSExecutor(settings.tts_workers, settings.tts_max_queue)
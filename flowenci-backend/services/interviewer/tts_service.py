@@ -1,34 +1,149 @@
 """
-TTS service using gTTS (Google Text-to-Speech) — free, no API key needed.
-Returns base64-encoded MP3.
+TTS service. Synthesis runs on the configured backend (gTTS by default, see
+tts_backends) in a bounded thread pool; returns audio bytes or base64.
+Synthesized audio is cached by normalized text, voice and format, in memory
+and on disk, so repeated utterances are never synthesized twice.
 """
-import io
 import base64
 import asyncio
-from functools import partial
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
 
+from config import get_settings
+from services.interviewer.tts_backends import TTSOverloaded, get_tts_backend, get_tts_executor
+from utils.cache import DiskCache, LRUCache, TieredCache, resolve_data_path
 
-async def text_to_speech_base64(text: str) -> str:
-    """Convert text to speech, return base64 encoded audio."""
+settings = get_settings()
+
+
+class TTSCacheStats:
+    def __init__(self):
+        self.synthesized = 0
+        self.synthesis_seconds = 0.0
+        self.reused = 0
+        self.reused_bytes = 0
+        self._lock = threading.Lock()
+
+    def record_synthesis(self, seconds: float):
+        with self._lock:
+            self.synthesized += 1
+            self.synthesis_seconds += seconds
+
+    def record_reuse(self, size: int):
+        with self._lock:
+            self.reused += 1
+            self.reused_bytes += size
+
+
+_stats = TTSCacheStats()
+_in_flight: Dict[str, asyncio.Task] = {}
+
+
+@lru_cache()
+def get_tts_cache() -> TieredCache:
+    return TieredCache(
+        LRUCache(max_bytes=settings.tts_cache_memory_mb * 1024 * 1024),
+        DiskCache(resolve_data_path(settings.tts_cache_path), max_bytes=settings.tts_cache_max_mb * 1024 * 1024),
+    )
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def tts_cache_key(text: str, voice: Optional[str] = None, fmt: Optional[str] = None) -> str:
+    backend = get_tts_backend()
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{voice or backend.cache_id}:{fmt or backend.format}:{digest}"
+
+
+def audio_format() -> str:
+    """Container format of the audio text_to_speech returns ("mp3", "wav")."""
+    return get_tts_backend().format
+
+
+def tts_cache_stats() -> dict:
+    stats = get_tts_cache().stats()
+    avg = _stats.synthesis_seconds / _stats.synthesized if _stats.synthesized else 0.0
+    stats.update({
+        "synthesized": _stats.synthesized,
+        "avg_synthesis_ms": round(avg * 1000, 1),
+        # Audio reused (cache hit or shared in-flight synthesis) instead of synthesized again
+        "reused": _stats.reused,
+        "bytes_saved": _stats.reused_bytes,
+        "synthesis_ms_saved": round(_stats.reused * avg * 1000, 1),
+    })
+    return stats
+
+
+async def text_to_speech(text: str) -> bytes:
+    """Convert text to speech, return audio bytes in audio_format() (empty on failure or overload)."""
+    text = normalize_text(text)
+    if not text:
+        return b""
+    key = tts_cache_key(text)
+    loop = asyncio.get_running_loop()
+
+    audio = await loop.run_in_executor(None, get_tts_cache().get, key)
+    if audio is not None:
+        _stats.record_reuse(len(audio))
+        return audio
+
+    return await _synthesize_cached(key, text)
+
+
+async def _synthesize_cached(key: str, text: str) -> bytes:
+    # Identical utterances requested at the same time share one synthesis. It
+    # runs as its own task, so a caller cancelled mid-wait (its client left)
+    # doesn't cancel it for the others.
+    task = _in_flight.get(key)
+    if task is not None:
+        audio = await asyncio.shield(task)
+        _stats.record_reuse(len(audio))
+        return audio
+    task = asyncio.create_task(_synthesize(key, text))
+    _in_flight[key] = task
+    task.add_done_callback(lambda t: _in_flight.pop(key, None) if _in_flight.get(key) is t else None)
+    return await asyncio.shield(task)
+
+
+async def _synthesize(key: str, text: str) -> bytes:
+    loop = asyncio.get_running_loop()
+    backend = get_tts_backend()
+    if not backend.available():
+        # e.g. gTTS not installed — the text goes out without audio
+        return b""
     try:
-        from gtts import gTTS
-        loop = asyncio.get_event_loop()
-        # Run blocking gTTS in thread pool to not block event loop
-        tts_func = partial(_synthesize, text)
-        audio_b64 = await loop.run_in_executor(None, tts_func)
-        return audio_b64
-    except ImportError:
-        # gTTS not installed — return empty
-        return ""
+        started = time.perf_counter()
+        # Blocking synthesis runs in the TTS pool, not on the event loop
+        audio = await asyncio.wrap_future(get_tts_executor().submit(backend.synthesize, text))
+        _stats.record_synthesis(time.perf_counter() - started)
+        await loop.run_in_executor(None, get_tts_cache().set, key, audio)
+    except TTSOverloaded as e:
+        # Shed load: the text still goes out, just without audio
+        print(f"[TTS] Overloaded, skipping audio: {e}")
+        audio = b""
     except Exception as e:
         print(f"[TTS] Error: {e}")
-        return ""
+        audio = b""
+    return audio
+
+
+async def text_to_speech_base64(text: str) -> str:
+    """Convert text to speech, return base64 encoded audio."""
+    audio = await text_to_speech(text)
+    return base64.b64encode(audio).decode("utf-8") if audio else ""
 
 
-def _synthesize(text: str) -> str:
-    from gtts import gTTS
-    tts = gTTS(text=text, lang="en", slow=False)
-    buf = io.BytesIO()
-    tts.write_to_fp(buf)
-    buf.seek(0)
-    return base64.b64encode(buf.read()).decode("utf-8")
+async def prewarm_tts(phrases: Iterable[str]):
+    """Synthesize fixed phrases ahead of time so their first use is a cache hit."""
+    for phrase in phrases:
+        text = normalize_text(phrase)
+        key = tts_cache_key(text)
+        if not await asyncio.to_thread(get_tts_cache().disk.contains, key):
+            await _synthesize_cached(key, text)
@@ -0,0 +1,130 @@
+"""
+Append-only interview turn log.
+Each conversation message becomes one interview_turns row (session, seq,
+role, content), written as it happens by a write-behind thread that batches
+rows into a single upsert. The async WebSocket handler only enqueues, and
+(session_id, seq) is unique, so a retried batch can't duplicate turns.
+Reads go through repositories.interviews.
+"""
+import queue
+import threading
+import time
+from functools import lru_cache
+from typing import List, Optional
+
+from config import get_settings
+from database import supabase as db
+
+settings = get_settings()
+
+
+class TurnWriter:
+    def __init__(self, batch_size: int = 50, flush_interval: float = 0.5, max_attempts: int = 5):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self._queue: "queue.Queue[dict]" = queue.Queue()
+        self._idle = threading.Condition()
+        self._in_progress = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="turn-writer", daemon=True)
+            self._thread.start()
+
+    def append(self, session_id: str, seq: int, role: str, content: str):
+        with self._idle:
+            self._in_progress += 1
+        self._queue.put({
+            "session_id": session_id,
+            "seq": seq,
+            "role": role,
+            "content": content,
+        })
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until everything appended so far is written (or given up on)."""
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._in_progress:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 10.0):
+        self.flush(timeout)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            # Gather whatever else arrives within the flush interval
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._write(batch)
+            with self._idle:
+                self._in_progress -= len(batch)
+                self._idle.notify_all()
+
+    def _write(self, batch: List[dict]):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                db.table("interview_turns").upsert(batch, on_conflict="session_id,seq").execute()
+                self.written += len(batch)
+                self.batches += 1
+                return
+            except Exception as e:
+                self.failures += 1
+                print(f"[Turns] Writing {len(batch)} turn(s) failed (attempt {attempt}): {e}")
+                if attempt < self.max_attempts:
+                    time.sleep(min(2 ** attempt * 0.25, 5.0))
+        self.dropped += len(batch)
+
+    def metrics(self) -> dict:
+        return {
+            "pending": self._in_progress,
+            "written": self.written,
+            "batches": self.batches,
+            "avg_batch": round(self.written / self.batches, 1) if self.batches else 0.0,
+            "failures": self.failures,
+            "dropped": self.dropped,
+        }
+
+
+@lru_cache()
+def get_turn_writer() -> TurnWriter:
+    writer = TurnWriter(
+        batch_size=settings.turn_log_batch_size,
+        flush_interval=settings.turn_log_flush_interval,
+    )
+    writer.start()
+    return writer
+
+
+def log_new_turns(active):
+    """Queue the session's messages that haven't been logged yet."""
+    if not active.db_session_id:
+        return
+    writer = get_turn_writer()
+    history = active.conversation_history
+    for seq in range(active.turns_logged, len(history)):
+        writer.append(active.db_session_id, seq, history[seq]["role"], history[seq]["content"])
+    active.turns_logged = len(history)
+
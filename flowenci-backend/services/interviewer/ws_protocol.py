@@ -0,0 +1,184 @@
+"""
+Roleplay WebSocket protocol.
+v1 (default): JSON frames, audio inline as base64 in "audio_b64".
+v2 (subprotocol "flowenci.v2"): compact JSON frames for text and control,
+audio as binary frames: a 6-byte header (version, codec, turn, sequence;
+network byte order) followed by the raw audio bytes.
+
+Frames go through a bounded per-connection queue drained by one writer task,
+so a slow client pushes back on the handler instead of buffering without
+limit, and is disconnected if it stays stuck.
+"""
+import asyncio
+import base64
+import json
+import struct
+import threading
+from typing import Optional
+
+from fastapi import WebSocket
+
+from config import get_settings
+from services.interviewer.tts_service import audio_format
+
+settings = get_settings()
+
+PROTOCOL_V2 = "flowenci.v2"
+
+AUDIO_HEADER = struct.Struct("!BBHH")   # version, codec, turn, sequence
+AUDIO_FRAME_VERSION = 2
+CODECS = {"mp3": 1, "wav": 2, "ogg": 3}
+CODEC_NAMES = {v: k for k, v in CODECS.items()}
+
+
+class SlowClientError(Exception):
+    """The client stopped reading and its send queue stayed full."""
+
+
+def encode_audio_frame(audio: bytes, turn: int, sequence: int, codec: str = "mp3") -> bytes:
+    return AUDIO_HEADER.pack(AUDIO_FRAME_VERSION, CODECS[codec], turn & 0xFFFF, sequence & 0xFFFF) + audio
+
+
+def decode_audio_frame(frame: bytes) -> dict:
+    version, codec, turn, sequence = AUDIO_HEADER.unpack_from(frame)
+    return {
+        "version": version,
+        "codec": CODEC_NAMES.get(codec, "unknown"),
+        "turn": turn,
+        "sequence": sequence,
+        "audio": frame[AUDIO_HEADER.size:],
+    }
+
+
+def negotiate_protocol(websocket: WebSocket) -> Optional[str]:
+    """The subprotocol to accept, or None for the legacy JSON protocol."""
+    offered = websocket.scope.get("subprotocols") or []
+    return PROTOCOL_V2 if PROTOCOL_V2 in offered else None
+
+
+class _ProtocolStats:
+    def __init__(self):
+        self.connections_opened = {"v1": 0, "v2": 0}
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.audio_bytes_sent = 0
+        self.max_queue_depth = 0
+        self.slow_client_disconnects = 0
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connections_opened": dict(self.connections_opened),
+                "frames_sent": self.frames_sent,
+                "bytes_sent": self.bytes_sent,
+                "audio_bytes_sent": self.audio_bytes_sent,
+                "max_queue_depth": self.max_queue_depth,
+                "slow_client_disconnects": self.slow_client_disconnects,
+            }
+
+
+_stats = _ProtocolStats()
+
+
+def protocol_stats() -> dict:
+    return _stats.snapshot()
+
+
+class RoleplayConnection:
+    """
+    Sends roleplay messages in the negotiated protocol. send() waits while
+    the queue is full and raises SlowClientError once it has waited
+    settings.ws_send_timeout seconds.
+    """
+
+    def __init__(self, websocket: WebSocket, subprotocol: Optional[str] = None):
+        self.websocket = websocket
+        self.binary = subprotocol == PROTOCOL_V2
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=settings.ws_send_queue_size)
+        self._writer: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+        with _stats._lock:
+            _stats.connections_opened["v2" if self.binary else "v1"] += 1
+
+    def start(self):
+        self._writer = asyncio.create_task(self._drain())
+
+    async def send(self, message: dict, audio: Optional[bytes] = None, codec: Optional[str] = None):
+        """
+        Queue a message, with its audio if any. In v2, audio_chunk messages
+        are sent as the binary frame alone; other messages get a JSON frame
+        describing the audio, then the binary frame. codec defaults to the
+        TTS backend's format.
+        """
+        codec = codec or audio_format()
+        if self.binary:
+            frames = []
+            if message.get("type") != "audio_chunk" or not audio:
+                body = {k: v for k, v in message.items() if v is not None}
+                if audio:
+                    body["audio"] = {"codec": codec, "size": len(audio), "sequence": message.get("sequence") or 0}
+                frames.append(json.dumps(body, separators=(",", ":")))
+            if audio:
+                frames.append(encode_audio_frame(audio, message.get("turn") or 0, message.get("sequence") or 0, codec))
+        else:
+            body = dict(message)
+            if audio is not None:
+                body["audio_b64"] = base64.b64encode(audio).decode("utf-8")
+                if codec != "mp3":  # v1 clients assume MP3 unless told otherwise
+                    body["audio_format"] = codec
+            frames = [json.dumps(body)]
+
+        for frame in frames:
+            await self._put(frame)
+
+    async def _put(self, frame):
+        if self._error is not None:
+            raise self._error
+        try:
+            await asyncio.wait_for(self._queue.put(frame), settings.ws_send_timeout)
+        except asyncio.TimeoutError:
+            if self._error is not None:   # the writer died while we waited
+                raise self._error
+            with _stats._lock:
+                _stats.slow_client_disconnects += 1
+            self._error = SlowClientError(f"send queue full for {settings.ws_send_timeout}s")
+            raise self._error
+        depth = self._queue.qsize()
+        if depth > _stats.max_queue_depth:
+            with _stats._lock:
+                _stats.max_queue_depth = max(_stats.max_queue_depth, depth)
+
+    async def _drain(self):
+        while True:
+            frame = await self._queue.get()
+            try:
+                if isinstance(frame, bytes):
+                    await self.websocket.send_bytes(frame)
+                else:
+                    await self.websocket.send_text(frame)
+            except Exception as e:
+                self._error = e
+                return
+            finally:
+                self._queue.task_done()
+            with _stats._lock:
+                _stats.frames_sent += 1
+                _stats.bytes_sent += len(frame)
+                if isinstance(frame, bytes):
+                    _stats.audio_bytes_sent += len(frame) - AUDIO_HEADER.size
+
+    async def aclose(self, timeout: float = 5.0):
+        """Flush what is queued (up to timeout), then stop the writer."""
+        if self._writer is None:
+            return
+        if self._error is None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._writer.cancel()
+        try:
+            await self._writer
+        except (asyncio.CancelledError, Exception):
+            pass
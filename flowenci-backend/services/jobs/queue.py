@@ -0,0 +1,224 @@
+"""
+Durable job queue backed by SQLite.
+The API process only enqueues; worker processes claim jobs under a lease
+(visibility timeout), so a job whose worker dies is picked up again once the
+lease runs out. Failed jobs are retried with exponential backoff.
+"""
+import json
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from config import get_settings
+from utils.cache import resolve_data_path
+
+settings = get_settings()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedupe_key TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',   -- queued | running | done | dead
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_expires_at REAL,
+    worker_id TEXT,
+    last_error TEXT,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_active_dedupe ON jobs (dedupe_key)
+    WHERE dedupe_key IS NOT NULL AND status IN ('queued', 'running');
+"""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+
+    @property
+    def is_final_attempt(self) -> bool:
+        return self.attempts >= self.max_attempts
+
+    @property
+    def is_exhausted(self) -> bool:
+        """Reclaimed after its worker died on the last allowed attempt."""
+        return self.attempts > self.max_attempts
+
+
+class JobQueue:
+    def __init__(self, path: str, visibility_timeout: float = 600, max_attempts: int = 3, retry_backoff: float = 10):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per call keeps the queue safe to share
+        # between threads and processes.
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, kind: str, payload: dict, dedupe_key: Optional[str] = None, delay: float = 0) -> str:
+        """Add a job. If an active job already has dedupe_key, return its id instead."""
+        now = time.time()
+        job_id = str(uuid.uuid4())
+        with self._connect() as conn:
+            try:
+                conn.execute(
+                    "INSERT INTO jobs (id, kind, payload, dedupe_key, max_attempts, available_at, enqueued_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, kind, json.dumps(payload), dedupe_key, self.max_attempts, now + delay, now),
+                )
+            except sqlite3.IntegrityError:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running')",
+                    (dedupe_key,),
+                ).fetchone()
+                if row is None:
+                    raise
+                return row["id"]
+        return job_id
+
+    def is_active(self, dedupe_key: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running')"
+                " AND (status = 'queued' OR lease_expires_at >= ?)",
+                (dedupe_key, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """
+        Lease the next ready job: a queued job whose backoff has elapsed, or a
+        running job whose lease expired because its worker died. A reclaimed
+        job that was already on its last attempt comes back exhausted so the
+        worker can give up on it cleanly.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE (status = 'queued' AND available_at <= ?)"
+                " OR (status = 'running' AND lease_expires_at < ?)"
+                " ORDER BY available_at LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker_id = ?,"
+                " lease_expires_at = ?, started_at = ? WHERE id = ?",
+                (worker_id, now + self.visibility_timeout, now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        return Job(
+            id=row["id"],
+            kind=row["kind"],
+            payload=json.loads(row["payload"]),
+            attempts=row["attempts"] + 1,
+            max_attempts=row["max_attempts"],
+        )
+
+    def extend_lease(self, job_id: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = 'running'",
+                (time.time() + self.visibility_timeout, job_id),
+            )
+
+    def complete(self, job_id: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', finished_at = ?, lease_expires_at = NULL WHERE id = ?",
+                (time.time(), job_id),
+            )
+
+    def fail(self, job: Job, error: str) -> bool:
+        """Record a failed attempt. Returns True if the job will be retried."""
+        now = time.time()
+        retry = not job.is_final_attempt
+        with self._connect() as conn:
+            if retry:
+                delay = self.retry_backoff * (2 ** (job.attempts - 1))
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', available_at = ?, lease_expires_at = NULL,"
+                    " last_error = ? WHERE id = ?",
+                    (now + delay, error[:2000], job.id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = 'dead', finished_at = ?, lease_expires_at = NULL,"
+                    " last_error = ? WHERE id = ?",
+                    (now, error[:2000], job.id),
+                )
+        return retry
+
+    def purge(self, older_than_seconds: float = 7 * 24 * 3600) -> int:
+        """Delete finished jobs older than the cutoff."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'dead') AND finished_at < ?",
+                (time.time() - older_than_seconds,),
+            )
+            return cur.rowcount
+
+    def metrics(self) -> dict:
+        now = time.time()
+        with self._connect() as conn:
+            counts = {
+                r["status"]: r["n"]
+                for r in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+            }
+            oldest = conn.execute(
+                "SELECT MIN(enqueued_at) AS t FROM jobs WHERE status = 'queued'"
+            ).fetchone()["t"]
+            recent = conn.execute(
+                "SELECT AVG(started_at - enqueued_at) AS wait, AVG(finished_at - started_at) AS run"
+                " FROM (SELECT * FROM jobs WHERE status = 'done' ORDER BY finished_at DESC LIMIT 100)"
+            ).fetchone()
+        return {
+            "depth": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "dead": counts.get("dead", 0),
+            "oldest_queued_age_s": round(now - oldest, 1) if oldest else 0,
+            "avg_queue_wait_s": round(recent["wait"], 2) if recent["wait"] is not None else None,
+            "avg_run_s": round(recent["run"], 2) if recent["run"] is not None else None,
+        }
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    return JobQueue(
+        str(resolve_data_path(settings.job_queue_path)),
+        visibility_timeout=settings.job_visibility_timeout,
+        max_attempts=settings.job_max_attempts,
+        retry_backoff=settings.job_retry_backoff,
+    )
@@ -0,0 +1,220 @@
+"""
+Job handlers run by the worker pool.
+A handler raises to have its job retried; give-up hooks run once a job has
+used all of its attempts.
+"""
+from datetime import datetime, timezone
+
+from config import get_settings
+from database import supabase as db
+from services.jobs.queue import Job, get_job_queue
+from services.progress import record_analysis, record_feedback_update
+
+settings = get_settings()
+
+# Columns each handler reads (record_analysis / record_feedback_update included)
+ANALYZE_RECORDING_COLUMNS = "id, user_id, question_id, s3_key, analysis_status, progress_counted, created_at"
+UPGRADE_RECORDING_COLUMNS = "id, user_id, question_id, transcript, duration_seconds, progress_counted"
+UPGRADE_FEEDBACK_COLUMNS = (
+    "degraded, filler_word_count, filler_words_detail, words_per_minute, total_word_count, pause_count, "
+    "star_breakdown, confidence_score, confidence_flags, readiness_score, coaching_tips"
+)
+
+
+def _question_flags(question_id):
+    """(use_star, question_text) for a recording's question."""
+    from repositories.rest import run_sync
+    from services.question_catalog import get_question_catalog
+
+    if not question_id:
+        return False, ""
+    question = run_sync(get_question_catalog()).get(question_id)
+    if not question:
+        return False, ""
+    return bool(question["use_star"]), question["text"] or ""
+
+
+def analyze_recording(job: Job):
+    """Run full AI analysis for a recording and save the feedback."""
+    recording_id = job.payload["recording_id"]
+    res_r = db.table("recordings").select(ANALYZE_RECORDING_COLUMNS).eq("id", recording_id).execute()
+    if not res_r.data:
+        return
+
+    recording = res_r.data[0]
+    if recording.get("analysis_status") == "done":
+        return
+
+    db.table("recordings").update({
+        "analysis_status": "processing",
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }).eq("id", recording_id).execute()
+
+    from services.storage import get_audio_file_path, delete_audio_file
+    from services.analysis.orchestrator import run_full_analysis
+
+    file_path = str(get_audio_file_path(recording["s3_key"]))
+
+    use_star, question_text = _question_flags(recording.get("question_id"))
+
+    result = run_full_analysis(
+        audio_path=file_path,
+        use_star=use_star,
+        question_text=question_text,
+    )
+    print(f"[Worker] Recording {recording_id} analyzed, stage timings (ms): {result['stage_timings']}"
+          + (f", degraded: {result['degraded']}" if result["degraded"] else ""))
+
+    feedback_dict = {
+        "recording_id": recording_id,
+        "filler_word_count": result["filler_word_count"],
+        "filler_words_detail": result["filler_words_detail"],
+        "words_per_minute": result["words_per_minute"],
+        "total_word_count": result["total_word_count"],
+        "pause_count": result["pause_count"],
+        "pace_timeline": result["pace_timeline"],
+        "star_score": result["star_score"],
+        "star_breakdown": result["star_breakdown"],
+        "pronunciation_issues": result["pronunciation_issues"],
+        "confidence_score": result["confidence_score"],
+        "confidence_flags": result["confidence_flags"],
+        "readiness_score": result["readiness_score"],
+        "coaching_tips": result["coaching_tips"],
+        "degraded": result["degraded"],
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    # feedbacks.recording_id is unique, so a retried job never saves twice;
+    # the row id comes from the column default.
+    db.table("feedbacks").upsert(feedback_dict, on_conflict="recording_id").execute()
+
+    db.table("recordings").update({
+        "transcript": result["transcript"],
+        "duration_seconds": result["duration_seconds"],
+        "transcription_status": "done",
+        "analysis_status": "done",
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }).eq("id", recording_id).execute()
+
+    delete_audio_file(recording["s3_key"])
+
+    # The aggregate can be rebuilt with scripts/backfill_progress.py, so a
+    # failure here doesn't fail (and re-run) the analysis.
+    try:
+        record_analysis({**recording, "duration_seconds": result["duration_seconds"]}, feedback_dict)
+    except Exception as e:
+        print(f"[Worker] Progress update for recording {recording_id} failed: {e}")
+
+    if result["degraded"]:
+        get_job_queue().enqueue(
+            "upgrade_analysis",
+            {"recording_id": recording_id},
+            dedupe_key=f"upgrade:{recording_id}",
+            delay=settings.analysis_upgrade_delay,
+        )
+
+
+def upgrade_analysis(job: Job):
+    """
+    Re-run the LLM stages that fell back to local results when the recording
+    was first analyzed, and replace them in the saved feedback.
+    """
+    from services.analysis.star_analyzer import WEAK_BELOW, analyze_star
+    from services.analysis.confidence_scorer import score_confidence
+    from services.coaching.tip_mapper import generate_coaching_tips
+
+    recording_id = job.payload["recording_id"]
+    res_fb = db.table("feedbacks").select(UPGRADE_FEEDBACK_COLUMNS).eq("recording_id", recording_id).execute()
+    if not res_fb.data or not res_fb.data[0].get("degraded"):
+        return
+    feedback = res_fb.data[0]
+    degraded = feedback["degraded"]
+
+    res_r = db.table("recordings").select(UPGRADE_RECORDING_COLUMNS).eq("id", recording_id).execute()
+    if not res_r.data:
+        return
+    recording = res_r.data[0]
+    transcript = recording.get("transcript") or ""
+    duration = recording.get("duration_seconds") or 0
+    use_star, _ = _question_flags(recording.get("question_id"))
+
+    update = {}
+    star_breakdown = feedback.get("star_breakdown") or {}
+    # Only the breakdown is stored; weak components are the missing ones
+    star_missing = [c for c, v in star_breakdown.items() if v < WEAK_BELOW]
+
+    # Errors propagate so the job is retried with backoff
+    if "star" in degraded:
+        star = analyze_star(transcript, use_star=use_star)
+        star_breakdown = star.get("breakdown", {})
+        star_missing = star.get("missing", [])
+        conf = score_confidence(
+            filler_count=feedback.get("filler_word_count") or 0,
+            duration_seconds=duration,
+            pause_count=feedback.get("pause_count") or 0,
+            wpm=feedback.get("words_per_minute") or 0,
+            star_score=star.get("star_score"),
+        )
+        update.update({
+            "star_score": star.get("star_score"),
+            "star_breakdown": star_breakdown,
+            "confidence_score": conf["confidence_score"],
+            "confidence_flags": conf["flags"],
+            "readiness_score": conf["readiness_score"],
+        })
+
+    # Tips depend on the STAR result, so redo them when either stage degraded
+    update["coaching_tips"] = generate_coaching_tips(
+        filler_count=feedback.get("filler_word_count") or 0,
+        filler_detail=feedback.get("filler_words_detail") or {},
+        wpm=feedback.get("words_per_minute") or 0,
+        pause_count=feedback.get("pause_count") or 0,
+        star_breakdown=star_breakdown,
+        star_missing=star_missing,
+        duration_seconds=duration,
+    )
+    update["degraded"] = []
+
+    db.table("feedbacks").update(update).eq("recording_id", recording_id).execute()
+    print(f"[Worker] Recording {recording_id} upgraded: {degraded}")
+    try:
+        record_feedback_update(recording, feedback, update)
+    except Exception as e:
+        print(f"[Worker] Progress update for recording {recording_id} failed: {e}")
+
+
+def mark_analysis_failed(job: Job):
+    db.table("recordings").update({
+        "analysis_status": "failed",
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }).eq("id", job.payload["recording_id"]).execute()
+
+
+def evaluate_session(job: Job):
+    """Generate end-of-session feedback for a roleplay session claimed by /end."""
+    from repositories.rest import run_sync
+    from services.interviewer.session_evaluator import evaluate_and_save_session
+
+    db_session_id = job.payload["db_session_id"]
+    # TurnsPending is retried with backoff; the last attempt grades what was written
+    if run_sync(evaluate_and_save_session(db_session_id, wait_for_turns=not job.is_final_attempt)):
+        print(f"[Worker] Session {db_session_id} evaluated")
+
+
+def mark_evaluation_failed(job: Job):
+    from repositories.rest import run_sync
+    from services.interviewer.session_evaluator import release_evaluation
+
+    # The client can POST /end again to retry
+    run_sync(release_evaluation(job.payload["db_session_id"], "failed"))
+
+
+HANDLERS = {
+    "analyze_recording": analyze_recording,
+    "upgrade_analysis": upgrade_analysis,
+    "evaluate_session": evaluate_session,
+}
+
+GIVE_UP_HOOKS = {
+    "analyze_recording": mark_analysis_failed,
+    "evaluate_session": mark_evaluation_failed,
+}
@@ -0,0 +1,109 @@
+"""
+Worker pool: threads that claim jobs from the queue and run their handlers.
+"""
+import os
+import socket
+import threading
+import time
+import traceback
+from typing import Callable, Dict, Optional
+
+from services.jobs.queue import Job, JobQueue
+
+
+class WorkerPool:
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, Callable[[Job], None]],
+        give_up_hooks: Optional[Dict[str, Callable[[Job], None]]] = None,
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.give_up_hooks = give_up_hooks or {}
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads = []
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self):
+        for i in range(self.concurrency):
+            t = threading.Thread(target=self._loop, args=(f"{self.worker_prefix}:{i}",), daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout)
+
+    def run_forever(self):
+        self.start()
+        try:
+            while not self._stop.is_set():
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print("[Worker] Stopping, waiting for running jobs...")
+            self.stop()
+
+    def _loop(self, worker_id: str):
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim(worker_id)
+            except Exception as e:
+                print(f"[Worker] Claim failed: {e}")
+                job = None
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            self.run_job(job)
+
+    def run_job(self, job: Job):
+        if job.is_exhausted:
+            self._give_up(job)
+            self.queue.fail(job, "lease expired on the final attempt")
+            return
+
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            job.attempts = job.max_attempts
+            self.queue.fail(job, f"no handler for job kind '{job.kind}'")
+            return
+
+        # Keep the lease alive while the handler runs, so the visibility
+        # timeout only has to cover a dead worker, not a slow job.
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, done), daemon=True)
+        heartbeat.start()
+        try:
+            handler(job)
+        except Exception as e:
+            traceback.print_exc()
+            retry = self.queue.fail(job, f"{type(e).__name__}: {e}")
+            print(f"[Worker] Job {job.id} ({job.kind}) attempt {job.attempts} failed; "
+                  f"{'will retry' if retry else 'giving up'}")
+            if not retry:
+                self._give_up(job)
+        else:
+            self.queue.complete(job.id)
+        finally:
+            done.set()
+
+    def _heartbeat(self, job: Job, done: threading.Event):
+        while not done.wait(self.queue.visibility_timeout / 3):
+            try:
+                self.queue.extend_lease(job.id)
+            except Exception as e:
+                print(f"[Worker] Lease extension for job {job.id} failed: {e}")
+
+    def _give_up(self, job: Job):
+        hook = self.give_up_hooks.get(job.kind)
+        if hook is None:
+            return
+        try:
+            hook(job)
+        except Exception as e:
+            print(f"[Worker] Give-up hook for job {job.id} failed: {e}")
@@ -0,0 +1,246 @@
+"""
+Process-wide OpenAI client registry.
+One sync and one async client share tuned connection pools for the life of
+the process, instead of a fresh client (and TLS handshake) per call.
+Created in the FastAPI lifespan; tests can install their own registry that
+points at a local fake server.
+"""
+import threading
+from typing import Optional
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
+from config import get_settings
+
+settings = get_settings()
+
+
+def operation_timeouts() -> dict:
+    """Read timeout (seconds) per kind of OpenAI call."""
+    return {
+        "transcription": settings.openai_timeout_transcription,
+        "star": settings.openai_timeout_analysis,
+        "coaching": settings.openai_timeout_analysis,
+        "interviewer": settings.openai_timeout_interviewer,
+        "summary": settings.openai_timeout_analysis,
+        "session_feedback": settings.openai_timeout_session_feedback,
+    }
+
+
+class _PoolStats:
+    """Counters for one transport; each has its own connection pool."""
+
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.waits = 0      # requests issued while every pooled connection was busy
+        self.errors = 0
+
+    def start(self):
+        with self.lock:
+            if self.in_flight >= self.max_connections:
+                self.waits += 1
+            self.in_flight += 1
+            self.requests += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def finish(self, failed: bool):
+        with self.lock:
+            self.in_flight -= 1
+            if failed:
+                self.errors += 1
+
+
+class _MeteredStream(httpx.SyncByteStream):
+    """Response body that keeps its request in flight until the body is closed."""
+
+    def __init__(self, inner: httpx.SyncByteStream, stats: _PoolStats):
+        self.inner = inner
+        self.stats = stats
+        self.failed = False
+        self.closed = False
+
+    def __iter__(self):
+        try:
+            yield from self.inner
+        except Exception:
+            self.failed = True
+            raise
+
+    def close(self):
+        try:
+            self.inner.close()
+        finally:
+            if not self.closed:
+                self.closed = True
+                self.stats.finish(self.failed)
+
+
+class _AsyncMeteredStream(httpx.AsyncByteStream):
+    def __init__(self, inner: httpx.AsyncByteStream, stats: _PoolStats):
+        self.inner = inner
+        self.stats = stats
+        self.failed = False
+        self.closed = False
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self.inner:
+                yield chunk
+        except Exception:
+            self.failed = True
+            raise
+
+    async def aclose(self):
+        try:
+            await self.inner.aclose()
+        finally:
+            if not self.closed:
+                self.closed = True
+                self.stats.finish(self.failed)
+
+
+# A request stays in flight until its response body is closed, not just until
+# the headers arrive: streamed completions hold the connection while they read.
+class _MeteredTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.HTTPTransport, stats: _PoolStats):
+        self.inner = inner
+        self.stats = stats
+
+    def handle_request(self, request):
+        self.stats.start()
+        try:
+            response = self.inner.handle_request(request)
+        except BaseException:
+            self.stats.finish(True)
+            raise
+        response.stream = _MeteredStream(response.stream, self.stats)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+class _AsyncMeteredTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncHTTPTransport, stats: _PoolStats):
+        self.inner = inner
+        self.stats = stats
+
+    async def handle_async_request(self, request):
+        self.stats.start()
+        try:
+            response = await self.inner.handle_async_request(request)
+        except BaseException:
+            self.stats.finish(True)
+            raise
+        response.stream = _AsyncMeteredStream(response.stream, self.stats)
+        return response
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+def _open_connections(transport) -> int:
+    pool = getattr(transport.inner, "_pool", None)
+    return len(getattr(pool, "connections", []) or [])
+
+
+class OpenAIClients:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        sync_transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        limits = httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry,
+        )
+        self.sync_stats = _PoolStats(settings.openai_max_connections)
+        self.async_stats = _PoolStats(settings.openai_max_connections)
+        self._sync_transport = _MeteredTransport(
+            sync_transport or httpx.HTTPTransport(limits=limits), self.sync_stats
+        )
+        self._async_transport = _AsyncMeteredTransport(
+            async_transport or httpx.AsyncHTTPTransport(limits=limits), self.async_stats
+        )
+        timeout = httpx.Timeout(settings.openai_timeout_interviewer, connect=settings.openai_connect_timeout)
+        common = {
+            "api_key": api_key or settings.openai_api_key,
+            "base_url": base_url or settings.openai_base_url or None,
+            "timeout": timeout,
+        }
+        self.sync = OpenAI(
+            **common,
+            http_client=httpx.Client(transport=self._sync_transport, timeout=timeout, follow_redirects=True),
+        )
+        self.aio = AsyncOpenAI(
+            **common,
+            http_client=httpx.AsyncClient(transport=self._async_transport, timeout=timeout, follow_redirects=True),
+        )
+
+    def timeout(self, operation: str) -> httpx.Timeout:
+        read = operation_timeouts().get(operation, settings.openai_timeout_interviewer)
+        return httpx.Timeout(read, connect=settings.openai_connect_timeout)
+
+    def sync_for(self, operation: str) -> OpenAI:
+        """Sync client with the operation's timeout; shares the pooled connections."""
+        return self.sync.with_options(timeout=self.timeout(operation))
+
+    def async_for(self, operation: str) -> AsyncOpenAI:
+        """Async client with the operation's timeout; shares the pooled connections."""
+        return self.aio.with_options(timeout=self.timeout(operation))
+
+    def metrics(self) -> dict:
+        def pool(transport, s: _PoolStats) -> dict:
+            return {
+                "max_connections": s.max_connections,
+                "open_connections": _open_connections(transport),
+                "in_flight": s.in_flight,
+                "peak_in_flight": s.peak_in_flight,
+                "requests": s.requests,
+                "pool_waits": s.waits,
+                "errors": s.errors,
+            }
+
+        return {
+            "sync": pool(self._sync_transport, self.sync_stats),
+            "async": pool(self._async_transport, self.async_stats),
+        }
+
+    async def aclose(self):
+        self.sync.close()
+        await self.aio.close()
+
+
+_registry: Optional[OpenAIClients] = None
+_registry_lock = threading.Lock()
+
+
+def init_openai_clients(clients: Optional[OpenAIClients] = None) -> OpenAIClients:
+    """Install the process-wide registry (a custom one in tests)."""
+    global _registry
+    _registry = clients or OpenAIClients()
+    return _registry
+
+
+def get_openai_clients() -> OpenAIClients:
+    """The process-wide registry; created on first use outside the API (scripts, workers)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = OpenAIClients()
+    return _registry
+
+
+async def close_openai_clients():
+    global _registry
+    if _registry is not None:
+        await _registry.aclose()
+        _registry = None
@@ -0,0 +1,249 @@
+"""
+Per-user progress aggregates (user_progress table).
+Folded forward one analyzed recording at a time by the analysis worker, so
+the dashboard reads a single row instead of a user's whole history. Writes
+use a version column (optimistic concurrency): two workers finishing
+recordings for the same user can't overwrite each other's update, and
+recordings.progress_counted keeps a retried job from counting one twice.
+scripts/backfill_progress.py rebuilds rows from recordings and feedbacks.
+"""
+import copy
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from postgrest.exceptions import APIError
+
+from database import supabase as db
+
+TREND_POINTS = 20       # attempts kept for the filler / readiness trends
+WEEKS_KEPT = 12
+MAX_WRITE_ATTEMPTS = 5
+
+# Fields of the latest feedback the dashboard shows (skill breakdown, next focus, last session)
+LATEST_FEEDBACK_FIELDS = (
+    "readiness_score", "confidence_score", "filler_word_count", "words_per_minute", "total_word_count",
+)
+
+
+def empty_progress(user_id: str) -> dict:
+    return {
+        "user_id": user_id,
+        "version": 0,
+        "total_recordings": 0,
+        "total_duration_seconds": 0.0,
+        "question_ids": [],
+        "feedback_count": 0,
+        "readiness_sum": 0.0,
+        "wpm_sum": 0.0,
+        "filler_sum": 0,
+        "first_recording_id": None,
+        "first_readiness": None,
+        "recent": [],
+        "weekly": {},
+        "current_streak": 0,
+        "longest_streak": 0,
+        "last_practice_date": None,
+        "latest_recording_id": None,
+        "latest_feedback": None,
+    }
+
+
+# Everything _write reads back; the row stays O(1) in the user's history
+PROGRESS_COLUMNS = ", ".join(empty_progress(""))
+
+
+def week_key(day: date) -> str:
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _practice_day(recording: dict) -> date:
+    created = recording.get("created_at")
+    if not created:
+        return datetime.now(timezone.utc).date()
+    return datetime.fromisoformat(str(created).replace("Z", "+00:00")).astimezone(timezone.utc).date()
+
+
+def _latest_snapshot(feedback: dict) -> dict:
+    snapshot = {field: feedback.get(field) or 0 for field in LATEST_FEEDBACK_FIELDS}
+    tips, flags = feedback.get("coaching_tips"), feedback.get("confidence_flags")
+    snapshot["coaching_tips"] = tips[:3] if isinstance(tips, list) else None
+    snapshot["confidence_flags"] = flags[:3] if isinstance(flags, list) else None
+    return snapshot
+
+
+def apply_recording(progress: dict, recording: dict, feedback: Optional[dict]) -> Optional[dict]:
+    """
+    The aggregate with one more analyzed recording folded in, or None if the
+    recording is already in the recent trend (a job retried right after its
+    write, before recordings.progress_counted was set).
+    """
+    recording_id = str(recording["id"])
+    if any(point["recording_id"] == recording_id for point in progress["recent"]):
+        return None
+
+    p = copy.deepcopy(progress)
+    p["total_recordings"] += 1
+    p["total_duration_seconds"] += recording.get("duration_seconds") or 0
+    question_id = recording.get("question_id")
+    if question_id and str(question_id) not in p["question_ids"]:
+        p["question_ids"].append(str(question_id))
+
+    point = {"recording_id": recording_id, "attempt": p["total_recordings"]}
+    if feedback:
+        readiness = feedback.get("readiness_score") or 0
+        p["feedback_count"] += 1
+        p["readiness_sum"] += readiness
+        p["wpm_sum"] += feedback.get("words_per_minute") or 0
+        p["filler_sum"] += feedback.get("filler_word_count") or 0
+        if p["first_recording_id"] is None:
+            p["first_recording_id"] = recording_id
+            p["first_readiness"] = readiness
+        p["latest_recording_id"] = recording_id
+        p["latest_feedback"] = _latest_snapshot(feedback)
+        point.update(filler_count=feedback.get("filler_word_count") or 0, score=readiness)
+    p["recent"] = (p["recent"] + [point])[-TREND_POINTS:]
+
+    day = _practice_day(recording)
+    bucket = p["weekly"].setdefault(week_key(day), {"recordings": 0, "minutes": 0.0})
+    bucket["recordings"] += 1
+    bucket["minutes"] = round(bucket["minutes"] + (recording.get("duration_seconds") or 0) / 60, 1)
+    p["weekly"] = dict(sorted(p["weekly"].items())[-WEEKS_KEPT:])
+
+    last = date.fromisoformat(p["last_practice_date"]) if p["last_practice_date"] else None
+    if last is None or day > last:
+        p["current_streak"] = p["current_streak"] + 1 if last == day - timedelta(days=1) else 1
+        p["last_practice_date"] = day.isoformat()
+        p["longest_streak"] = max(p["longest_streak"], p["current_streak"])
+    return p
+
+
+def apply_feedback_update(progress: dict, recording_id: str, old: dict, new: dict) -> dict:
+    """The aggregate after a counted recording's feedback was revised (degraded analysis upgraded)."""
+    p = copy.deepcopy(progress)
+    recording_id = str(recording_id)
+    old_readiness = old.get("readiness_score") or 0
+    readiness = new.get("readiness_score", old_readiness) or 0
+    p["readiness_sum"] += readiness - old_readiness
+    for point in p["recent"]:
+        if point["recording_id"] == recording_id and "score" in point:
+            point["score"] = readiness
+    if p["first_recording_id"] == recording_id:
+        p["first_readiness"] = readiness
+    if p["latest_recording_id"] == recording_id:
+        p["latest_feedback"] = _latest_snapshot({**old, **new})
+    return p
+
+
+def current_streak(progress: dict, today: Optional[date] = None) -> int:
+    """The stored streak, or 0 once a full day has passed without practice."""
+    if not progress.get("last_practice_date"):
+        return 0
+    today = today or datetime.now(timezone.utc).date()
+    last = date.fromisoformat(progress["last_practice_date"])
+    return progress["current_streak"] if today - last <= timedelta(days=1) else 0
+
+
+def _write(user_id: str, change) -> bool:
+    """
+    Read-modify-write the user's row with change(progress) -> progress | None,
+    retrying when another writer got there first. False if change() skipped it.
+    """
+    for _ in range(MAX_WRITE_ATTEMPTS):
+        rows = db.table("user_progress").select(PROGRESS_COLUMNS).eq("user_id", user_id).execute().data
+        current = rows[0] if rows else empty_progress(user_id)
+        updated = change(current)
+        if updated is None:
+            return False
+        updated["version"] = current["version"] + 1
+        updated["updated_at"] = datetime.now(timezone.utc).isoformat()
+        if not rows:
+            try:
+                db.table("user_progress").insert(updated).execute()
+                return True
+            except APIError as e:
+                if e.code != "23505":   # unique violation: created concurrently, retry as an update
+                    raise
+                continue
+        res = (
+            db.table("user_progress").update(updated)
+            .eq("user_id", user_id).eq("version", current["version"]).execute()
+        )
+        if res.data:
+            return True
+    raise RuntimeError(f"user_progress for {user_id} kept changing during the update")
+
+
+def mark_counted(recording_ids: List[str]):
+    for i in range(0, len(recording_ids), 200):
+        db.table("recordings").update({"progress_counted": True}).in_("id", recording_ids[i:i + 200]).execute()
+
+
+def record_analysis(recording: dict, feedback: dict) -> bool:
+    """
+    Fold a newly analyzed recording into its user's progress, unless
+    recordings.progress_counted says it already is (recording must include it).
+    """
+    if recording.get("progress_counted"):
+        return False
+    counted = _write(str(recording["user_id"]), lambda p: apply_recording(p, recording, feedback))
+    mark_counted([str(recording["id"])])
+    return counted
+
+
+def record_feedback_update(recording: dict, old: dict, new: dict) -> bool:
+    """
+    Apply a revised feedback to the user's progress. Skipped for a recording
+    that was never counted (record_analysis failed): a rebuild picks it up.
+    """
+    if not recording.get("progress_counted"):
+        return False
+    recording_id = str(recording["id"])
+    return _write(str(recording["user_id"]), lambda p: apply_feedback_update(p, recording_id, old, new))
+
+
+def rebuild(user_id: str, recordings: Iterable[dict], feedbacks: Dict[str, dict]) -> dict:
+    """The aggregate from scratch, from a user's analyzed recordings in chronological order."""
+    progress = empty_progress(user_id)
+    for recording in recordings:
+        progress = apply_recording(progress, recording, feedbacks.get(str(recording["id"]))) or progress
+    return progress
+
+
+def rebuild_and_save(
+    user_id: str, load: Callable[[], Tuple[Iterable[dict], Dict[str, dict]]], dry_run: bool = False
+) -> dict:
+    """
+    Replace the user's row with one rebuilt from load() -> (recordings in
+    chronological order, feedbacks by recording id). The write only goes
+    through if the row is still at the version read before load() ran, so a
+    recording a worker folds in meanwhile is never dropped: the rebuild starts
+    over and includes it.
+    """
+    for _ in range(MAX_WRITE_ATTEMPTS):
+        rows = db.table("user_progress").select("version").eq("user_id", user_id).execute().data
+        recordings, feedbacks = load()
+        recordings = list(recordings)
+        rebuilt = rebuild(user_id, recordings, feedbacks)
+        if dry_run:
+            return rebuilt
+        rebuilt["updated_at"] = datetime.now(timezone.utc).isoformat()
+        if not rows:
+            rebuilt["version"] = 1
+            try:
+                db.table("user_progress").insert(rebuilt).execute()
+                mark_counted([str(r["id"]) for r in recordings])
+                return rebuilt
+            except APIError as e:
+                if e.code != "23505":   # a worker created the row meanwhile
+                    raise
+                continue
+        rebuilt["version"] = rows[0]["version"] + 1
+        res = (
+            db.table("user_progress").update(rebuilt)
+            .eq("user_id", user_id).eq("version", rows[0]["version"]).execute()
+        )
+        if res.data:
+            mark_counted([str(r["id"]) for r in recordings])
+            return rebuilt
+    raise RuntimeError(f"user_progress for {user_id} kept changing during the rebuild")
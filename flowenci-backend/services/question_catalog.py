@@ -0,0 +1,193 @@
+"""
+In-process question catalog.
+The question bank is read-mostly, so each process keeps all of it in memory
+with indexes by category, difficulty and use_star, and serves the question
+routes, the upload lookup and the analysis worker from there. A catalog is
+an immutable snapshot; a refresh builds a new one and swaps it in.
+
+Freshness: the API polls questions_repo.version() every
+question_catalog_poll_interval seconds (run_catalog_refresher, started by
+main.py), and reloads when it changed; POST /questions/reload forces it in
+the process that handles it. Processes without the poller (the job worker)
+check the version on access once the interval has passed.
+"""
+import asyncio
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from config import get_settings
+from repositories.projection import Projection
+from repositories.questions import questions_repo
+
+settings = get_settings()
+
+# The fields the API returns for a question
+QUESTION_FIELDS = (
+    "id", "text", "category", "difficulty", "use_star", "guidance",
+    "target_duration_min", "target_duration_max", "tags",
+)
+CATALOG = Projection("questions.catalog", "questions", [*QUESTION_FIELDS, "is_active", "created_at"])
+
+
+class QuestionCatalog:
+    def __init__(self, rows: List[dict], version: Tuple[int, Optional[str]]):
+        self.version = version
+        rows = sorted(rows, key=lambda r: (str(r.get("created_at") or ""), str(r["id"])))
+        # API shape of every question, active or not (recordings may point at retired ones)
+        self._by_id: Dict[str, dict] = {}
+        self._active: List[dict] = []
+        self._active_ids = set()
+        self._by_category: Dict[str, List[dict]] = {}
+        self._by_difficulty: Dict[str, List[dict]] = {}
+        self._by_star: Dict[bool, List[dict]] = {}
+        self._search_text: Dict[str, str] = {}
+        for row in rows:
+            question = {field: row.get(field) for field in QUESTION_FIELDS}
+            question["id"] = str(row["id"])
+            self._by_id[question["id"]] = question
+            if not row.get("is_active"):
+                continue
+            self._active.append(question)
+            self._active_ids.add(question["id"])
+            self._search_text[question["id"]] = (question["text"] or "").lower()
+            if question["category"] is not None:
+                self._by_category.setdefault(question["category"], []).append(question)
+            if question["difficulty"] is not None:
+                self._by_difficulty.setdefault(question["difficulty"], []).append(question)
+            if question["use_star"] is not None:
+                self._by_star.setdefault(bool(question["use_star"]), []).append(question)
+        self.category_counts = [
+            {"category": category, "count": count}
+            for category, count in Counter(q["category"] for q in self._active if q["category"]).items()
+        ]
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    def get(self, question_id: str, active_only: bool = False) -> Optional[dict]:
+        question = self._by_id.get(str(question_id))
+        if question is None or (active_only and question["id"] not in self._active_ids):
+            return None
+        return question
+
+    def search(
+        self,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        use_star: Optional[bool] = None,
+        search: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[int, List[dict]]:
+        """(total matches, one page) of active questions; search is a case-insensitive substring of the text."""
+        filters = []
+        if category:
+            filters.append(("category", category, self._by_category.get(category, [])))
+        if difficulty:
+            filters.append(("difficulty", difficulty, self._by_difficulty.get(difficulty, [])))
+        if use_star is not None:
+            filters.append(("use_star", use_star, self._by_star.get(use_star, [])))
+
+        # Walk the smallest index and check the other filters on its entries
+        candidates = min((index for _, _, index in filters), key=len, default=self._active)
+        needle = search.lower() if search else None
+        matches = [
+            q for q in candidates
+            if all(q[field] == value for field, value, _ in filters)
+            and (needle is None or needle in self._search_text[q["id"]])
+        ]
+        return len(matches), matches[offset:offset + limit]
+
+
+class _CatalogStats:
+    def __init__(self):
+        self.loads = 0
+        self.checks = 0
+        self.failed_checks = 0
+        self._lock = threading.Lock()
+
+    def add(self, **counts):
+        with self._lock:
+            for name, n in counts.items():
+                setattr(self, name, getattr(self, name) + n)
+
+
+_stats = _CatalogStats()
+_catalog: Optional[QuestionCatalog] = None
+_checked_at = 0.0
+_polling = False
+
+
+async def load_catalog() -> QuestionCatalog:
+    """Read the whole question bank and make it the current catalog."""
+    global _catalog, _checked_at
+    # Version first: an edit landing between the two reads is picked up by the next check
+    version = await questions_repo.version()
+    rows = await questions_repo.list_all(CATALOG)
+    catalog = QuestionCatalog(rows, version)
+    _catalog, _checked_at = catalog, time.monotonic()
+    _stats.add(loads=1)
+    print(f"[Catalog] Loaded {len(catalog)} question(s) ({catalog.active_count} active), version {version}")
+    return catalog
+
+
+async def refresh_catalog() -> bool:
+    """Reload if the question bank changed since the current catalog was loaded. True if it reloaded."""
+    global _checked_at
+    version = await questions_repo.version()
+    _stats.add(checks=1)
+    if _catalog is not None and version == _catalog.version:
+        _checked_at = time.monotonic()
+        return False
+    await load_catalog()
+    return True
+
+
+async def get_question_catalog() -> QuestionCatalog:
+    """
+    The current catalog, loaded on first use. In processes without the poller
+    it is checked for changes inline once the poll interval has passed.
+    """
+    if _catalog is None:
+        return await load_catalog()
+    if not _polling and time.monotonic() - _checked_at > settings.question_catalog_poll_interval:
+        try:
+            await refresh_catalog()
+        except Exception as e:
+            # Serve the snapshot we have rather than fail the caller
+            _stats.add(failed_checks=1)
+            print(f"[Catalog] Version check failed: {e}")
+    return _catalog
+
+
+async def run_catalog_refresher(interval: float):
+    """Load the catalog, then check the question bank for changes every interval seconds."""
+    global _polling
+    _polling = True
+    while True:
+        try:
+            await (refresh_catalog() if _catalog is not None else load_catalog())
+        except Exception as e:
+            _stats.add(failed_checks=1)
+            print(f"[Catalog] Refresh failed: {e}")
+        await asyncio.sleep(interval)
+
+
+def catalog_stats() -> dict:
+    catalog = _catalog
+    return {
+        "loaded": catalog is not None,
+        "questions": len(catalog) if catalog is not None else 0,
+        "active": catalog.active_count if catalog is not None else 0,
+        "version": list(catalog.version) if catalog is not None else None,
+        "seconds_since_check": round(time.monotonic() - _checked_at, 1) if catalog is not None else None,
+        "loads": _stats.loads,
+        "checks": _stats.checks,
+        "failed_checks": _stats.failed_checks,
+    }
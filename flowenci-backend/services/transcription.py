@@ -1,10 +1,17 @@
 """
 Transcription using OpenAI Whisper API.
 Tuned for Indian English accents via prompt priming.
+Results are cached by audio content hash, so re-running an analysis (or a
+re-submitted clip) does not pay for transcription again.
 """
-from openai import OpenAI
+import hashlib
+import json
+import zlib
+from functools import lru_cache
 from pathlib import Path
 from config import get_settings
+from services.openai_clients import get_openai_clients
+from utils.cache import DiskCache, resolve_data_path
 
 settings = get_settings()
 
@@ -13,6 +20,26 @@ WHISPER_PROMPT = (
     "Common words: implemented, algorithm, experience, responsibilities, achievement, "
     "leadership, teamwork, project, deadline, challenge, solution, result, internship."
 )
+PROMPT_VERSION = hashlib.sha256(WHISPER_PROMPT.encode("utf-8")).hexdigest()[:12]
+
+
+@lru_cache()
+def get_transcription_cache() -> DiskCache:
+    # Transcription runs in the worker; shared counters let the API report them
+    return DiskCache(
+        resolve_data_path(settings.transcription_cache_path),
+        max_bytes=settings.transcription_cache_max_mb * 1024 * 1024,
+        shared_counters=True,
+    )
+
+
+def audio_cache_key(file_path: Path) -> str:
+    """Streaming SHA-256 of the audio bytes plus model and prompt version."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return f"{digest.hexdigest()}:{settings.openai_whisper_model}:{PROMPT_VERSION}"
 
 
 def transcribe_audio(file_path: str | Path) -> dict:
@@ -20,7 +47,13 @@ def transcribe_audio(file_path: str | Path) -> dict:
     if not file_path.exists():
         raise FileNotFoundError(f"Audio file not found: {file_path}")
 
-    client = OpenAI(api_key=settings.openai_api_key)
+    cache = get_transcription_cache()
+    key = audio_cache_key(file_path)
+    cached = cache.get(key)
+    if cached is not None:
+        return json.loads(zlib.decompress(cached))
+
+    client = get_openai_clients().sync_for("transcription")
 
     with open(file_path, "rb") as audio_file:
         response = client.audio.transcriptions.create(
@@ -37,9 +70,11 @@ def transcribe_audio(file_path: str | Path) -> dict:
         for w in response.words:
             words.append({"word": w.word, "start": w.start, "end": w.end})
 
-    return {
+    result = {
         "text": response.text.strip(),
         "language": getattr(response, "language", "en"),
         "duration": getattr(response, "duration", None),
         "words": words,
     }
+    cache.set(key, zlib.compress(json.dumps(result, separators=(",", ":")).encode("utf-8")))
+    return result
@@ -43,6 +43,7 @@ CREATE TABLE IF NOT EXISTS public.recordings (
     transcript TEXT,
     transcription_status TEXT DEFAULT 'pending', -- pending | done | failed
     analysis_status TEXT DEFAULT 'pending', -- pending | processing | done | failed
+    progress_counted BOOLEAN DEFAULT FALSE, -- folded into user_progress, so retries and upgrades stay idempotent
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -56,6 +57,7 @@ CREATE TABLE IF NOT EXISTS public.feedbacks (
     words_per_minute FLOAT,
     total_word_count INTEGER,
     pause_count INTEGER,
+    pace_timeline JSONB,
     star_score FLOAT,
     star_breakdown JSONB,
     pronunciation_issues JSONB,
@@ -63,6 +65,7 @@ CREATE TABLE IF NOT EXISTS public.feedbacks (
     confidence_flags JSONB,
     readiness_score FLOAT,
     coaching_tips JSONB,
+    degraded JSONB DEFAULT '[]', -- stages that used the local fallback and await an upgrade
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -76,6 +79,7 @@ CREATE TABLE IF NOT EXISTS public.interview_sessions (
     status TEXT DEFAULT 'active', -- active | completed | abandoned
     conversation_history JSONB DEFAULT '[]',
     session_feedback JSONB,
+    evaluation_status TEXT, -- evaluating | done | failed (null until /end is called)
     overall_score FLOAT,
     total_turns INTEGER DEFAULT 0,
     duration_seconds FLOAT,
@@ -83,6 +87,62 @@ CREATE TABLE IF NOT EXISTS public.interview_sessions (
     ended_at TIMESTAMP WITH TIME ZONE
 );
 
+-- 6. Interview Turns table (append-only; one row per message, seq from 0)
+CREATE TABLE IF NOT EXISTS public.interview_turns (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    session_id UUID REFERENCES public.interview_sessions(id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL, -- assistant | user
+    content TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE (session_id, seq)
+);
+
+-- 7. User Progress table (dashboard aggregates kept up to date by the analysis worker, see services/progress.py)
+CREATE TABLE IF NOT EXISTS public.user_progress (
+    user_id UUID PRIMARY KEY REFERENCES public.users(id) ON DELETE CASCADE,
+    version INTEGER NOT NULL DEFAULT 0, -- optimistic concurrency for read-modify-write updates
+    total_recordings INTEGER DEFAULT 0,
+    total_duration_seconds FLOAT DEFAULT 0,
+    question_ids JSONB DEFAULT '[]',
+    feedback_count INTEGER DEFAULT 0,
+    readiness_sum FLOAT DEFAULT 0,
+    wpm_sum FLOAT DEFAULT 0,
+    filler_sum INTEGER DEFAULT 0,
+    first_recording_id UUID,
+    first_readiness FLOAT,
+    recent JSONB DEFAULT '[]', -- last 20 attempts: recording_id, attempt, filler_count, score
+    weekly JSONB DEFAULT '{}', -- ISO week ("2026-W07") -> recordings, minutes; last 12 weeks
+    current_streak INTEGER DEFAULT 0,
+    longest_streak INTEGER DEFAULT 0,
+    last_practice_date DATE,
+    latest_recording_id UUID,
+    latest_feedback JSONB,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- 8. Keep questions.updated_at current on every edit: the API's question catalog
+--    polls (row count, latest updated_at) to notice changes (see services/question_catalog.py)
+CREATE OR REPLACE FUNCTION public.touch_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS questions_touch_updated_at ON public.questions;
+CREATE TRIGGER questions_touch_updated_at
+    BEFORE UPDATE ON public.questions
+    FOR EACH ROW EXECUTE FUNCTION public.touch_updated_at();
+
+-- Column additions for databases created from an earlier version of this script
+ALTER TABLE public.feedbacks ADD COLUMN IF NOT EXISTS pace_timeline JSONB;
+ALTER TABLE public.feedbacks ADD COLUMN IF NOT EXISTS degraded JSONB DEFAULT '[]';
+ALTER TABLE public.interview_sessions ADD COLUMN IF NOT EXISTS evaluation_status TEXT;
+-- Then run scripts/backfill_progress.py to set progress_counted for existing recordings
+ALTER TABLE public.recordings ADD COLUMN IF NOT EXISTS progress_counted BOOLEAN DEFAULT FALSE;
+ALTER TABLE public.user_progress DROP COLUMN IF EXISTS counted_ids;
+
 -- Enable RLS (Optional but recommended for production)
 -- ALTER TABLE public.users ENABLE ROW LEVEL SECURITY;
 -- ... add policies ...
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+from services.interviewer import opening
+from services.interviewer.session_manager import ActiveSession
+
+
+class DisconnectingSocket:
+    """Client that goes away after `after` seconds without sending anything."""
+
+    def __init__(self, after: float):
+        self.after = after
+
+    async def receive(self) -> dict:
+        await asyncio.sleep(self.after)
+        return {"type": "websocket.disconnect", "code": 1001}
+
+
+def test_disconnect_during_generation_cancels_opening(monkeypatch):
+    async def slow_generate(active):
+        await asyncio.sleep(30)   # GPT + TTS still running when the client leaves
+        return "Tell me about yourself.", b""
+
+    monkeypatch.setattr(opening, "_generate", slow_generate)
+    active = ActiveSession(
+        session_id="test-session", user_id="u1", company_key="google",
+        interview_type="behavioral", role="SDE", experience_level="student", max_turns=3,
+    )
+    cancelled_before = opening.opening_stats()["cancelled"]
+
+    async def scenario():
+        task = opening.start_opening(active)
+        with pytest.raises(WebSocketDisconnect):
+            await asyncio.wait_for(opening.take_opening_watching(active, DisconnectingSocket(0.05)), 5)
+        await asyncio.sleep(0)
+        return task
+
+    task = asyncio.run(scenario())
+    assert task.cancelled()
+    assert active.session_id not in opening._openings
+    assert opening.opening_stats()["cancelled"] == cancelled_before + 1
@@ -0,0 +1,257 @@
+"""
+Small caching primitives shared by the services.
+LRUCache:    in-process, bounded by entry count and/or bytes, optional TTL.
+DiskCache:   SQLite-backed bytes store with LRU eviction by total size.
+TieredCache: LRUCache in front of a DiskCache.
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+BASE_DIR = Path(__file__).parent.parent
+
+
+def resolve_data_path(path: str) -> Path:
+    """Resolve a settings path relative to the backend directory."""
+    p = Path(path)
+    return p if p.is_absolute() else BASE_DIR / p
+
+
+class LRUCache:
+    def __init__(
+        self,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        sizeof: Callable[[Any], int] = len,
+    ):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._data: OrderedDict = OrderedDict()   # key -> (value, size, stored_at)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, size, time.monotonic())
+            self.bytes += size
+            while (
+                (self.max_items is not None and len(self._data) > self.max_items)
+                or (self.max_bytes is not None and self.bytes > self.max_bytes)
+            ):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def _remove(self, key):
+        _, size, _ = self._data.pop(key)
+        self.bytes -= size
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        stats = {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+        if self.max_bytes is not None:
+            stats["bytes"] = self.bytes
+            stats["max_bytes"] = self.max_bytes
+        return stats
+
+
+class DiskCache:
+    """
+    shared_counters keeps hits and misses in the database instead of the
+    process, so stats() is the same from every process using the file (the
+    API reporting on a cache that only the worker reads from).
+    """
+
+    def __init__(self, path, max_bytes: int, ttl: Optional[float] = None, shared_counters: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.shared_counters = shared_counters
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed_at)")
+            if shared_counters:
+                conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            if self.shared_counters:
+                conn.execute(
+                    "INSERT INTO counters (name, value) VALUES (?, 1)"
+                    " ON CONFLICT (name) DO UPDATE SET value = value + 1",
+                    ("misses" if row is None else "hits",),
+                )
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return row[0] if row is not None else None
+
+    def set(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._evict(conn)
+
+    def contains(self, key: str) -> bool:
+        """Presence check that doesn't count as a lookup or refresh recency."""
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until the store fits again
+        excess = total - self.max_bytes
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            if self.shared_counters:
+                counters = dict(conn.execute("SELECT name, value FROM counters"))
+                hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+            else:
+                hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class TieredCache:
+    """
+    Memory tier in front of a disk tier. Disk hits are promoted to memory;
+    values are converted to and from bytes with dumps/loads.
+    """
+
+    def __init__(
+        self,
+        memory: LRUCache,
+        disk: DiskCache,
+        dumps: Callable[[Any], bytes] = lambda v: v,
+        loads: Callable[[bytes], Any] = lambda b: b,
+    ):
+        self.memory = memory
+        self.disk = disk
+        self.dumps = dumps
+        self.loads = loads
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        raw = self.disk.get(key)
+        if raw is None:
+            return None
+        value = self.loads(raw)
+        self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value):
+        self.memory.set(key, value)
+        self.disk.set(key, self.dumps(value))
+
+    def stats(self) -> dict:
+        memory = self.memory.stats()
+        disk = self.disk.stats()
+        lookups = memory["hits"] + memory["misses"]
+        hits = memory["hits"] + disk["hits"]
+        return {
+            "hits": hits,
+            "misses": lookups - hits,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory": memory,
+            "disk": disk,
+        }
@@ -1,17 +1,37 @@
 """
 JWT utilities: create tokens and authenticate requests.
+The user behind a token is cached per process for principal_cache_ttl
+seconds, so most requests authenticate without a users lookup. Profile
+changes invalidate the entry; other workers pick them up within the TTL.
 """
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from supabase import Client
 from config import get_settings
-from database import get_db
+from repositories.projection import Projection
+from repositories.users import users_repo
+from schemas.auth import UserResponse
+from utils.cache import LRUCache
 
 settings = get_settings()
 bearer_scheme = HTTPBearer(auto_error=False)
 
+# The user fields routes read from current_user (UserResponse plus is_active).
+# hashed_password in particular never enters the cache.
+PRINCIPAL = Projection("auth.principal", "users", ["is_active"], model=UserResponse)
+
+
+@lru_cache()
+def get_principal_cache() -> LRUCache:
+    return LRUCache(max_items=settings.principal_cache_max_items, ttl=settings.principal_cache_ttl)
+
+
+def invalidate_principal(user_id: str):
+    """Drop a cached user after a profile change or deactivation."""
+    get_principal_cache().delete(str(user_id))
+
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
@@ -20,9 +40,8 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: Client = Depends(get_db),
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,11 +58,16 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    res = db.table("users").select("*").eq("id", user_id).execute()
-    if not res.data:
-        raise credentials_exception
-        
-    user = res.data[0]
+    cache = get_principal_cache()
+    user = cache.get(user_id)
+    if user is None:
+        user = await users_repo.get(user_id, PRINCIPAL)
+        if not user:
+            raise credentials_exception
+        # Deactivated users are cached too, so repeated requests with their token stay cheap
+        cache.set(user_id, user)
+
     if not user.get("is_active", True):
         raise credentials_exception
-    return user
+    # Callers may modify their copy (update_profile does)
+    return dict(user)
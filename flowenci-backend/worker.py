@@ -0,0 +1,30 @@
+"""
+Analysis worker process.
+Claims jobs enqueued by the API and runs them.
+
+Usage: python worker.py [--concurrency N]
+"""
+import argparse
+
+from config import get_settings
+from services.jobs.queue import get_job_queue
+from services.jobs.tasks import HANDLERS, GIVE_UP_HOOKS
+from services.jobs.worker import WorkerPool
+
+settings = get_settings()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Flowenci background job workers.")
+    parser.add_argument("--concurrency", type=int, default=settings.worker_concurrency)
+    args = parser.parse_args()
+
+    queue = get_job_queue()
+    purged = queue.purge()
+    print(f"Starting {args.concurrency} worker(s) on {queue.path} (purged {purged} old jobs)")
+    pool = WorkerPool(queue, HANDLERS, GIVE_UP_HOOKS, concurrency=args.concurrency)
+    pool.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import { useState, useRef, useEffect } from 'react'
+import { useState, useRef, useEffect, useCallback } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { useAuth } from '../context/AuthContext'
 import { roleplayApi } from '../api/roleplay'
@@ -11,6 +11,11 @@ import clsx from 'clsx'
 const COMPANIES = ['Amazon', 'Google', 'Startup', 'Infosys', 'Generic']
 const INTERVIEW_TYPES = ['Behavioral', 'Technical', 'Mixed']
 
+// /end only queues the evaluation; the report is polled until it's ready
+const FEEDBACK_POLL_MS = 2000
+const FEEDBACK_TIMEOUT_MS = 120000
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms))
+
 // ─── Setup Screen ───────────────────────────────────────────────────────────
 function RoleplaySetup({ onStart, loading }) {
     const [company, setCompany] = useState('Generic')
@@ -82,6 +87,9 @@ function RoleplaySetup({ onStart, loading }) {
 function ActiveSession({ sessionInfo, onShowFeedback }) {
     const { token, user } = useAuth()
     const [textAnswer, setTextAnswer] = useState('')
+    const [evaluation, setEvaluation] = useState(null)   // null | 'evaluating' | 'failed'
+    const evaluationStarted = useRef(false)
+    const mounted = useRef(true)
     const scrollRef = useRef(null)
 
     const {
@@ -97,14 +105,42 @@ function ActiveSession({ sessionInfo, onShowFeedback }) {
         if (scrollRef.current) scrollRef.current.scrollTop = scrollRef.current.scrollHeight
     }, [messages])
 
-    const handleEnd = async () => {
-        endSession()
+    useEffect(() => {
+        mounted.current = true
+        return () => { mounted.current = false }
+    }, [])
+
+    // Queue the evaluation, then poll for the report until it is done or failed
+    const evaluate = useCallback(async () => {
+        if (evaluationStarted.current) return
+        evaluationStarted.current = true
+        setEvaluation('evaluating')
         try {
-            const fb = await roleplayApi.endSession(token, sessionInfo.db_session_id)
-            onShowFeedback(fb)
+            await roleplayApi.endSession(token, sessionInfo.db_session_id)
+            const deadline = Date.now() + FEEDBACK_TIMEOUT_MS
+            while (mounted.current && Date.now() < deadline) {
+                const fb = await roleplayApi.getFeedback(token, sessionInfo.db_session_id)
+                if (fb.evaluation_status === 'done') {
+                    if (mounted.current) onShowFeedback(fb)
+                    return
+                }
+                await sleep(FEEDBACK_POLL_MS)
+            }
+            if (mounted.current) setEvaluation('failed')
         } catch {
-            // Allow parent to handle fallback if needed
+            // 409 means the evaluation failed; POST /end again retries it
+            if (mounted.current) setEvaluation('failed')
         }
+    }, [token, sessionInfo, onShowFeedback])
+
+    const retryEvaluation = () => {
+        evaluationStarted.current = false
+        evaluate()
+    }
+
+    const handleEnd = () => {
+        endSession()
+        evaluate()
     }
 
     const handleSendText = () => {
@@ -121,12 +157,36 @@ function ActiveSession({ sessionInfo, onShowFeedback }) {
 
     // Auto-terminate when WS says ended
     useEffect(() => {
-        if (status === 'ended') {
-            roleplayApi.endSession(token, sessionInfo.db_session_id)
-                .then(fb => onShowFeedback(fb))
-                .catch(() => { })
-        }
-    }, [status, token, sessionInfo, onShowFeedback])
+        if (status === 'ended') evaluate()
+    }, [status, evaluate])
+
+    if (evaluation) {
+        return (
+            <div className="flex flex-col h-full items-center justify-center bg-[#0a0806] p-8">
+                <div className="card p-8 max-w-md w-full text-center space-y-4">
+                    <div className={clsx('w-16 h-16 rounded-2xl bg-[#a78bfa20] border border-[#a78bfa40] flex items-center justify-center mx-auto',
+                        evaluation === 'evaluating' && 'animate-pulse')}>
+                        <Bot size={32} className="text-[#a78bfa]" />
+                    </div>
+                    {evaluation === 'evaluating' ? (
+                        <>
+                            <h2 className="font-display text-2xl font-bold">Evaluating your interview…</h2>
+                            <p className="text-sm text-[#7a6e63]">Your interviewer is writing up feedback. This usually takes a few seconds.</p>
+                        </>
+                    ) : (
+                        <>
+                            <h2 className="font-display text-2xl font-bold">Feedback isn't ready</h2>
+                            <p className="text-sm text-[#7a6e63]">We couldn't finish evaluating this session.</p>
+                            <button onClick={retryEvaluation}
+                                className="w-full py-3 bg-[#a78bfa] hover:bg-[#9333ea] text-white font-bold rounded-xl transition-all">
+                                Try again
+                            </button>
+                        </>
+                    )}
+                </div>
+            </div>
+        )
+    }
 
     return (
         <div className="flex flex-col h-full bg-[#0a0806]">